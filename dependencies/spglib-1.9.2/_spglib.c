@@ -43,6 +43,10 @@
 #define PYUNICODE_FROMSTRING PyUnicode_FromString
 #endif
 
+/* The GIL is released around the calls to spglib, which does not use the */
+/* Python API, so that several structures can be analyzed concurrently */
+/* from threads. The input arrays are owned by the caller. */
+
 static PyObject * get_version(PyObject *self, PyObject *args);
 static PyObject * get_dataset(PyObject *self, PyObject *args);
 static PyObject * get_spacegroup_type(PyObject *self, PyObject *args);
@@ -216,12 +220,14 @@ static PyObject * get_dataset(PyObject *self, PyObject *args)
   const int num_atom = PyArray_DIMS(position)[0];
   const int* typat = (int*)PyArray_DATA(atom_type);
 
+  Py_BEGIN_ALLOW_THREADS
   dataset = spgat_get_dataset(lat,
 			      pos,
 			      typat,
 			      num_atom,
 			      symprec,
 			      angle_tolerance);
+  Py_END_ALLOW_THREADS
 
   array = PyList_New(15);
   n = 0;
@@ -444,7 +450,9 @@ static PyObject * standardize_cell(PyObject *self, PyObject *args)
   SPGCONST double (*pos)[3] = (double(*)[3])PyArray_DATA(position);
   int* typat = (int*)PyArray_DATA(atom_type);
 
-  int num_atom_std = spgat_standardize_cell(lat,
+  int num_atom_std;
+  Py_BEGIN_ALLOW_THREADS
+  num_atom_std = spgat_standardize_cell(lat,
 					    pos,
 					    typat,
 					    num_atom,
@@ -452,6 +460,7 @@ static PyObject * standardize_cell(PyObject *self, PyObject *args)
 					    no_idealize,
 					    symprec,
 					    angle_tolerance);
+  Py_END_ALLOW_THREADS
 
   return PyLong_FromLong((long) num_atom_std);
 }
@@ -477,12 +486,15 @@ static PyObject * refine_cell(PyObject *self, PyObject *args)
   SPGCONST double (*pos)[3] = (double(*)[3])PyArray_DATA(position);
   int* typat = (int*)PyArray_DATA(atom_type);
 
-  int num_atom_std = spgat_refine_cell(lat,
+  int num_atom_std;
+  Py_BEGIN_ALLOW_THREADS
+  num_atom_std = spgat_refine_cell(lat,
 				       pos,
 				       typat,
 				       num_atom,
 				       symprec,
 				       angle_tolerance);
+  Py_END_ALLOW_THREADS
 
   return PyLong_FromLong((long) num_atom_std);
 }
@@ -508,12 +520,15 @@ static PyObject * find_primitive(PyObject *self, PyObject *args)
   int num_atom = PyArray_DIMS(position)[0];
   int* types = (int*)PyArray_DATA(atom_type);
 
-  int num_atom_prim = spgat_find_primitive(lat,
+  int num_atom_prim;
+  Py_BEGIN_ALLOW_THREADS
+  num_atom_prim = spgat_find_primitive(lat,
 					   pos,
 					   types,
 					   num_atom,
 					   symprec,
 					   angle_tolerance);
+  Py_END_ALLOW_THREADS
 
   return PyLong_FromLong((long) num_atom_prim);
 }
@@ -546,7 +561,9 @@ static PyObject * get_symmetry(PyObject *self, PyObject *args)
   const int num_sym_from_array_size = PyArray_DIMS(rotation)[0];
 
   /* num_sym has to be larger than num_sym_from_array_size. */
-  const int num_sym = spgat_get_symmetry(rot,
+  int num_sym;
+  Py_BEGIN_ALLOW_THREADS
+  num_sym = spgat_get_symmetry(rot,
 					 trans,
 					 num_sym_from_array_size,
 					 lat,
@@ -555,6 +572,8 @@ static PyObject * get_symmetry(PyObject *self, PyObject *args)
 					 num_atom,
 					 symprec,
 					 angle_tolerance);
+  Py_END_ALLOW_THREADS
+
   return PyLong_FromLong((long) num_sym);
 }
 
@@ -594,7 +613,9 @@ static PyObject * get_symmetry_with_collinear_spin(PyObject *self,
   const int num_sym_from_array_size = PyArray_DIMS(rotation)[0];
 
   /* num_sym has to be larger than num_sym_from_array_size. */
-  const int num_sym =
+  int num_sym;
+  Py_BEGIN_ALLOW_THREADS
+  num_sym =
     spgat_get_symmetry_with_collinear_spin(rot,
 					   trans,
 					   equiv_atoms,
@@ -606,6 +627,8 @@ static PyObject * get_symmetry_with_collinear_spin(PyObject *self,
 					   num_atom,
 					   symprec,
 					   angle_tolerance);
+  Py_END_ALLOW_THREADS
+
   return PyLong_FromLong((long) num_sym);
 }
 
@@ -661,7 +684,9 @@ static PyObject * get_ir_reciprocal_mesh(PyObject *self, PyObject *args)
   int *map_int = (int*)PyArray_DATA(map);
 
   /* num_sym has to be larger than num_sym_from_array_size. */
-  const int num_ir = spg_get_ir_reciprocal_mesh(grid_address,
+  int num_ir;
+  Py_BEGIN_ALLOW_THREADS
+  num_ir = spg_get_ir_reciprocal_mesh(grid_address,
 						map_int,
 						mesh_int,
 						is_shift_int,
@@ -671,6 +696,7 @@ static PyObject * get_ir_reciprocal_mesh(PyObject *self, PyObject *args)
 						types,
 						num_atom,
 						symprec);
+  Py_END_ALLOW_THREADS
 
   return PyLong_FromLong((long) num_ir);
 }
@@ -704,7 +730,9 @@ static PyObject * get_stabilized_reciprocal_mesh(PyObject *self, PyObject *args)
   SPGCONST double (*q)[3] = (double(*)[3])PyArray_DATA(qpoints);
   const int num_q = PyArray_DIMS(qpoints)[0];
 
-  const int num_ir = spg_get_stabilized_reciprocal_mesh(grid_address,
+  int num_ir;
+  Py_BEGIN_ALLOW_THREADS
+  num_ir = spg_get_stabilized_reciprocal_mesh(grid_address,
 							map_int,
 							mesh_int,
 							is_shift_int,
@@ -713,6 +741,7 @@ static PyObject * get_stabilized_reciprocal_mesh(PyObject *self, PyObject *args)
 							rot,
 							num_q,
 							q);
+  Py_END_ALLOW_THREADS
 
   return PyLong_FromLong((long) num_ir);
 }
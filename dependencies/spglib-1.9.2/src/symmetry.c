@@ -47,7 +47,13 @@
 #define PI 3.14159265358979323846
 /* Tolerance of angle between lattice vectors in degrees */
 /* Negative value invokes converter from symprec. */
-static double angle_tolerance = -1.0;
+/* Thread local since it is set by each call of the spgat_* functions, */
+/* which can run concurrently when called from the Python extension. */
+#if defined(_MSC_VER)
+static __declspec(thread) double angle_tolerance = -1.0;
+#else
+static __thread double angle_tolerance = -1.0;
+#endif
 
 static int relative_axes[][3] = {
   { 1, 0, 0},
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+
+"""
+Benchmark of batch_write_vasp_input with MPVaspInputSet, serially and with a
+pool of threads, using the POTCARs of the test files. Each structure is
+written with a new input set, as is done when the input set depends on the
+structure.
+"""
+
+from __future__ import division, print_function
+
+import os
+import shutil
+import tempfile
+import timeit
+
+from pymatgen.alchemy.materials import TransformedStructure
+from pymatgen.alchemy.transmuters import batch_write_vasp_input
+from pymatgen.io.vasp.sets import MPVaspInputSet
+from pymatgen.util.testing import PymatgenTest
+
+NSTRUCTURES = 200
+NTHREADS = 4
+
+os.environ["VASP_PSP_DIR"] = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "test_files"))
+
+structure = PymatgenTest.get_structure("LiFePO4")
+tstructs = [TransformedStructure(structure.copy(), [])
+            for i in range(NSTRUCTURES)]
+
+
+def write(nthreads):
+    output_dir = tempfile.mkdtemp()
+    try:
+        batch_write_vasp_input(tstructs, MPVaspInputSet(), output_dir,
+                               nthreads=nthreads)
+    finally:
+        shutil.rmtree(output_dir)
+
+
+def new_input_sets():
+    for i in range(NSTRUCTURES):
+        MPVaspInputSet().get_potcar(structure)
+
+
+def serial():
+    write(1)
+
+
+def threaded():
+    write(NTHREADS)
+
+
+if __name__ == "__main__":
+    print("{} structures, {} threads".format(NSTRUCTURES, NTHREADS))
+    for name in ["new_input_sets", "serial", "threaded"]:
+        t = timeit.timeit("{}()".format(name),
+                          setup="from __main__ import {}".format(name),
+                          number=1)
+        print("{}: {:.3f} s".format(name, t))
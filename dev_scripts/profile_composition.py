@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+
+"""
+Benchmark of Composition construction, reduction and hashing on a dataset of
+100k entries, similar to what is done when grouping entries or building phase
+diagrams.
+"""
+
+from __future__ import division, print_function
+
+import random
+import timeit
+from collections import defaultdict
+
+from pymatgen.core.composition import Composition
+
+NENTRIES = 100000
+
+random.seed(42)
+ELEMENTS = ["Li", "Na", "Mg", "Fe", "Mn", "Co", "Ni", "Ti", "P", "S", "O",
+            "F", "Cl", "N"]
+
+# Entries from a limited number of chemical systems, with many duplicated
+# formulas (e.g., different polymorphs or calculations of the same formula).
+formulas = []
+for i in range(NENTRIES):
+    els = random.sample(ELEMENTS, random.randint(1, 4))
+    formulas.append("".join("{}{}".format(el, random.randint(1, 6))
+                            for el in els))
+comps = [Composition(f) for f in formulas]
+
+
+def construct():
+    [Composition(f) for f in formulas]
+
+
+def reduce_and_group():
+    groups = defaultdict(list)
+    for c in comps:
+        groups[c.reduced_formula].append(c)
+
+
+def hash_group():
+    groups = defaultdict(list)
+    for c in comps:
+        groups[c].append(c)
+    return len(groups)
+
+
+def key_group():
+    groups = defaultdict(list)
+    for c in comps:
+        groups[c.grouping_key].append(c)
+    return len(groups)
+
+
+if __name__ == "__main__":
+    print("{} compositions, {} distinct".format(len(comps), hash_group()))
+    for name in ["construct", "reduce_and_group", "hash_group", "key_group"]:
+        t = timeit.timeit("{}()".format(name),
+                          setup="from __main__ import {}".format(name),
+                          number=1)
+        print("{}: {:.3f} s".format(name, t))
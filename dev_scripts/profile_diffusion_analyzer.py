@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+
+"""
+Benchmark of the smoothed="max" MSD computation in DiffusionAnalyzer, with
+FFTs and with the direct computation for each time lag, on a synthetic random
+walk trajectory.
+"""
+
+from __future__ import division, print_function
+
+import timeit
+
+import numpy as np
+
+from pymatgen.core.lattice import Lattice
+from pymatgen.core.structure import Structure
+from pymatgen.analysis.diffusion_analyzer import DiffusionAnalyzer
+
+NSTEPS = 20000
+NLI = 64
+NFRAMEWORK = 64
+
+np.random.seed(42)
+structure = Structure(Lattice.cubic(16),
+                      ["Li"] * NLI + ["O"] * NFRAMEWORK,
+                      np.random.rand(NLI + NFRAMEWORK, 3))
+# Random walks for Li ions and small vibrations for the framework ions.
+disp = np.cumsum(np.random.randn(NLI + NFRAMEWORK, NSTEPS, 3) * 0.02, axis=1)
+disp[NLI:] = np.random.randn(NFRAMEWORK, NSTEPS, 3) * 0.1
+
+
+def run(use_fft):
+    return DiffusionAnalyzer(structure, disp, "Li", 1000, 2, 1,
+                             smoothed="max", use_fft=use_fft)
+
+
+if __name__ == "__main__":
+    print("{} ions, {} steps".format(NLI + NFRAMEWORK, NSTEPS))
+    for use_fft in [True, False]:
+        t = timeit.timeit("run({})".format(use_fft),
+                          setup="from __main__ import run", number=1)
+        print("use_fft={}: {:.3f} s".format(use_fft, t))
+    d_fft, d_direct = run(True), run(False)
+    print("Diffusivities: {} (fft), {} (direct)".format(d_fft.diffusivity,
+                                                         d_direct.diffusivity))
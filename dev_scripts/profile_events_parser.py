@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+
+"""
+Benchmark of EventsParser on a multi-MB ABINIT log file, similar to what is
+done when the status of a long-running task is checked by the scheduler.
+The log is obtained by concatenating the log of the MgB2 NSCF run, which
+contains two warnings.
+"""
+
+from __future__ import division, print_function
+
+import os
+import tempfile
+import timeit
+
+import yaml
+
+from pymatgen.io.abinit import events
+
+NCOPIES = 100
+
+with open(os.path.join(os.path.dirname(__file__), "..", "test_files", "abinit",
+                       "mgb2_nscf.log"), "rb") as f:
+    data = f.read()
+# Remove the final summary so that the run is not completed.
+chunk = data[:data.index(b"--- !FinalSummary")]
+
+fd, logfile = tempfile.mkstemp(suffix=".log")
+with os.fdopen(fd, "wb") as f:
+    f.write(chunk * NCOPIES)
+
+parser = events.EventsParser()
+
+
+def parse_full():
+    # A new parser always parses the full file.
+    return events.EventsParser().parse(logfile)
+
+
+def parse_append():
+    # The parser analyzes only the new content.
+    with open(logfile, "ab") as f:
+        f.write(chunk)
+    return parser.parse(logfile)
+
+
+def load_python():
+    for doc in docs:
+        yaml.load(doc, Loader=yaml.Loader)
+
+
+def load_c():
+    for doc in docs:
+        yaml.load(doc, Loader=events._EventLoader)
+
+
+with open(logfile, "rb") as f:
+    docs = [doc.text for doc, _, _ in events._iter_yaml_docs(f)
+            if doc.tag == "!WARNING"]
+
+
+if __name__ == "__main__":
+    print("{:.1f} MB, {} events".format(os.path.getsize(logfile) / 1024 ** 2,
+                                        len(parse_full())))
+    parser.parse(logfile)
+    for name in ["parse_full", "parse_append", "load_python", "load_c"]:
+        t = timeit.timeit("{}()".format(name),
+                          setup="from __main__ import {}".format(name),
+                          number=1)
+        print("{}: {:.3f} s".format(name, t))
+    os.remove(logfile)
@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+
+"""
+Benchmark of "import pymatgen" in a new interpreter, with the lazy aliases and
+element data left unloaded, and with all of them loaded, which is what
+"import pymatgen" used to do. The time of starting the interpreter is
+included in both.
+"""
+
+from __future__ import division, print_function
+
+import os
+import subprocess
+import sys
+import timeit
+
+NREPEATS = 5
+
+root_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+lazy_script = "import pymatgen"
+
+eager_script = """
+import pymatgen
+for name in pymatgen._lazy_aliases:
+    getattr(pymatgen, name)
+[el.Z for el in pymatgen.Element]
+"""
+
+
+def run(script):
+    subprocess.check_call([sys.executable, "-c", script], cwd=root_dir)
+
+
+def lazy():
+    run(lazy_script)
+
+
+def eager():
+    run(eager_script)
+
+
+if __name__ == "__main__":
+    print("best of {} imports".format(NREPEATS))
+    for name in ["lazy", "eager"]:
+        t = min(timeit.repeat("{}()".format(name),
+                              setup="from __main__ import {}".format(name),
+                              repeat=NREPEATS, number=1))
+        print("{}: {:.3f} s".format(name, t))
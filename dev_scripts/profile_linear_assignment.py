@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+
+"""
+Benchmark of LinearAssignment against linear_assignment_batch on many small
+random cost matrices, square and rectangular, with and without a mask shared
+by all the problems.
+"""
+
+from __future__ import division, print_function
+
+import timeit
+
+import numpy as np
+
+from pymatgen.optimization.linear_assignment import LinearAssignment, \
+    linear_assignment_batch
+
+NPROBLEMS = 100000
+SIZE = 8
+
+np.random.seed(0)
+square = np.random.rand(NPROBLEMS, SIZE, SIZE)
+rectangular = np.random.rand(NPROBLEMS, SIZE - 2, SIZE)
+mask = np.random.rand(SIZE, SIZE) < 0.2
+
+
+def loop_square():
+    return [LinearAssignment(c).solution for c in square]
+
+
+def batch_square():
+    return linear_assignment_batch(square)
+
+
+def loop_rectangular():
+    return [LinearAssignment(c).solution for c in rectangular]
+
+
+def batch_rectangular():
+    return linear_assignment_batch(rectangular)
+
+
+def loop_masked():
+    solutions = []
+    for c in square:
+        c = c.copy()
+        c[mask] = 1e20
+        solutions.append(LinearAssignment(c).solution)
+    return solutions
+
+
+def batch_masked():
+    return linear_assignment_batch(square, mask)
+
+
+if __name__ == "__main__":
+    print("{} problems of size {}".format(NPROBLEMS, SIZE))
+    for name in ["loop_square", "batch_square", "loop_rectangular",
+                 "batch_rectangular", "loop_masked", "batch_masked"]:
+        t = timeit.timeit("{}()".format(name),
+                          setup="from __main__ import {}".format(name),
+                          number=1)
+        print("{}: {:.3f} s".format(name, t))
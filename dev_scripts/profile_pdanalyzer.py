@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+
+"""
+Benchmark of the e_above_hull of many candidate entries, computed one entry at
+a time and with the batch API of PDAnalyzer.
+"""
+
+from __future__ import division, print_function
+
+import os
+import random
+import timeit
+
+from pymatgen.core.composition import Composition
+from pymatgen.phasediagram.entries import PDEntryIO, PDEntry
+from pymatgen.phasediagram.pdmaker import PhaseDiagram
+from pymatgen.phasediagram.pdanalyzer import PDAnalyzer
+
+NENTRIES = 5000
+
+module_dir = os.path.dirname(os.path.abspath(__file__))
+elements, entries = PDEntryIO.from_csv(os.path.join(
+    module_dir, "..", "pymatgen", "phasediagram", "tests",
+    "pdentries_test.csv"))
+pd = PhaseDiagram(entries)
+
+random.seed(42)
+candidates = []
+for i in range(NENTRIES):
+    comp = Composition({el: random.randint(0, 8) for el in pd.elements})
+    if comp.num_atoms == 0:
+        continue
+    hull_e = PDAnalyzer(pd).get_hull_energy(comp) / comp.num_atoms
+    candidates.append(PDEntry(comp, (hull_e + random.random()) *
+                              comp.num_atoms))
+
+
+def one_at_a_time():
+    analyzer = PDAnalyzer(pd)
+    return [analyzer.get_e_above_hull(e) for e in candidates]
+
+
+def batch():
+    return PDAnalyzer(pd).get_e_above_hull_many(candidates)
+
+
+if __name__ == "__main__":
+    print("{} candidate entries, {} facets".format(len(candidates),
+                                                   len(pd.facets)))
+    for name in ["one_at_a_time", "batch"]:
+        t = timeit.timeit("{}()".format(name),
+                          setup="from __main__ import {}".format(name),
+                          number=1)
+        print("{}: {:.3f} s".format(name, t))
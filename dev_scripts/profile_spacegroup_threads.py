@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+
+"""
+Benchmark of SpacegroupAnalyzer.analyze_many with threads against a serial
+loop, on a dataset of randomly perturbed supercells (from 8 to 128 atoms).
+The speedup is bounded by the number of cpus and by the part of the
+analysis done in Python, which still holds the GIL.
+"""
+
+from __future__ import division, print_function
+
+import multiprocessing
+import random
+import timeit
+
+from pymatgen.symmetry.analyzer import SpacegroupAnalyzer
+from pymatgen.util.testing import PymatgenTest
+
+NSTRUCTURES = 400
+NTHREADS = multiprocessing.cpu_count()
+
+random.seed(42)
+structures = []
+for i in range(NSTRUCTURES):
+    s = PymatgenTest.get_structure(random.choice(["Li2O", "CsCl", "Si",
+                                                  "LiFePO4"]))
+    s.make_supercell([random.randint(1, 2) for _ in range(3)])
+    s.perturb(0.001)
+    structures.append(s)
+
+
+def serial():
+    [SpacegroupAnalyzer(s, 0.01) for s in structures]
+
+
+def threaded():
+    SpacegroupAnalyzer.analyze_many(structures, symprec=0.01,
+                                    nthreads=NTHREADS)
+
+
+if __name__ == "__main__":
+    print("{} structures, {} threads".format(len(structures), NTHREADS))
+    for name in ["serial", "threaded"]:
+        t = timeit.timeit("{}()".format(name),
+                          setup="from __main__ import {}".format(name),
+                          number=1)
+        print("{}: {:.3f} s".format(name, t))
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+
+"""
+Benchmark of RemoveExistingFilter and RemoveDuplicatesFilter, with and
+without spacegroup checks. The reference structures are the TiO2 polymorphs
+of the test files in which Ti is replaced by other elements, and the tested
+structures are the same polymorphs with other substitutions, half of which
+exist in the references.
+"""
+
+from __future__ import division, print_function
+
+import json
+import os
+import timeit
+
+from monty.json import MontyDecoder
+
+from pymatgen.alchemy.filters import RemoveDuplicatesFilter, \
+    RemoveExistingFilter
+
+with open(os.path.join(os.path.dirname(__file__), "..", "test_files",
+                       "TiO2_entries.json")) as f:
+    polymorphs = [e.structure for e in json.load(f, cls=MontyDecoder)]
+
+
+def substitute(elements):
+    structures = []
+    for el in elements:
+        for s in polymorphs:
+            s = s.copy()
+            s.replace_species({"Ti": el})
+            structures.append(s)
+    return structures
+
+
+existing = substitute(["Ti", "Zr", "Hf", "Si", "Ge", "Sn", "Pb", "Mn", "Ru",
+                       "Ir"])
+candidates = substitute(["Ti", "Zr", "Hf", "Sn", "Ce", "Te", "V", "Cr", "Mo"])
+
+
+def remove_existing():
+    fil = RemoveExistingFilter(existing)
+    return [fil.test(s) for s in candidates]
+
+
+def remove_existing_symprec():
+    fil = RemoveExistingFilter(existing, symprec=1e-3)
+    return [fil.test(s) for s in candidates]
+
+
+def remove_duplicates():
+    fil = RemoveDuplicatesFilter()
+    return [fil.test(s) for s in existing + candidates]
+
+
+def remove_duplicates_symprec():
+    fil = RemoveDuplicatesFilter(symprec=1e-3)
+    return [fil.test(s) for s in existing + candidates]
+
+
+if __name__ == "__main__":
+    print("{} existing structures, {} candidates".format(len(existing),
+                                                        len(candidates)))
+    for name in ["remove_existing", "remove_existing_symprec",
+                 "remove_duplicates", "remove_duplicates_symprec"]:
+        t = timeit.timeit("{}()".format(name),
+                          setup="from __main__ import {}".format(name),
+                          number=1)
+        print("{}: {:.3f} s".format(name, t))
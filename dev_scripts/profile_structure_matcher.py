@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+
+"""
+Benchmark of StructureMatcher on large supercells, for which many candidate
+lattices and translations have to be tested. The structures are random
+orderings of Si and Ge in a 3x3x3 supercell of cubic Si (216 atoms), similar
+to what is done when the duplicates of enumerated orderings are removed: an
+ordering is compared with other orderings (no match, all the candidates are
+tested) and with a perturbed and translated copy of itself (match).
+"""
+
+from __future__ import division, print_function
+
+import random
+import timeit
+
+import numpy as np
+
+from pymatgen.analysis.structure_matcher import StructureMatcher
+from pymatgen.core.lattice import Lattice
+from pymatgen.core.structure import Structure
+
+NORDERINGS = 5
+
+random.seed(42)
+np.random.seed(42)
+
+si = Structure(Lattice.cubic(5.43), ["Si"] * 8,
+               [[0, 0, 0], [0.5, 0.5, 0], [0.5, 0, 0.5], [0, 0.5, 0.5],
+                [0.25, 0.25, 0.25], [0.75, 0.75, 0.25], [0.75, 0.25, 0.75],
+                [0.25, 0.75, 0.75]])
+si.make_supercell([3, 3, 3])
+
+orderings = []
+for i in range(NORDERINGS):
+    s = si.copy()
+    for j in random.sample(range(len(s)), len(s) // 4):
+        s.replace(j, "Ge")
+    orderings.append(s)
+
+copy = orderings[0].copy()
+copy.perturb(0.05)
+copy.translate_sites(list(range(len(copy))), [0.3, 0.1, 0.7])
+
+matcher = StructureMatcher(primitive_cell=False)
+
+
+def no_match():
+    assert not any(matcher.fit(orderings[0], s) for s in orderings[1:])
+
+
+def match():
+    assert matcher.fit(orderings[0], copy)
+
+
+def rms_dist():
+    assert matcher.get_rms_dist(orderings[0], copy) is not None
+
+
+if __name__ == "__main__":
+    print("{} sites".format(len(si)))
+    for name in ["no_match", "match", "rms_dist"]:
+        t = timeit.timeit("{}()".format(name),
+                          setup="from __main__ import {}".format(name),
+                          number=1)
+        print("{}: {:.3f} s".format(name, t))
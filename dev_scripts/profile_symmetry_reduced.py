@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+
+"""
+Benchmark of the per-site analyses of structure_analyzer on all the sites of
+a high-symmetry cell, with and without symmetry reduction. The structure is
+a body-centered supercell of cubic SrTiO3 with 160 sites, which keeps the
+full Pm-3m symmetry, so that only 3 sites are computed with the symmetry
+reduction. The time of the symmetry analysis is included.
+"""
+
+from __future__ import division, print_function
+
+import timeit
+
+from pymatgen import Lattice, Structure
+from pymatgen.analysis.structure_analyzer import VoronoiCoordFinder, \
+    OrderParameters
+
+SYMPREC = 0.01
+
+structure = Structure(Lattice.cubic(3.905), ["Sr", "Ti", "O", "O", "O"],
+                      [[0, 0, 0], [0.5, 0.5, 0.5], [0.5, 0.5, 0],
+                       [0.5, 0, 0.5], [0, 0.5, 0.5]])
+structure.make_supercell([[-2, 2, 2], [2, -2, 2], [2, 2, -2]])
+finder = VoronoiCoordFinder(structure)
+ops = OrderParameters(["cn", "q2", "q4", "q6"], [[], [], [], []], 3.0)
+
+
+def coordination_numbers():
+    return finder.get_all_coordination_numbers()
+
+
+def coordination_numbers_symmetry():
+    return finder.get_all_coordination_numbers(symprec=SYMPREC)
+
+
+def voronoi_polyhedra():
+    return finder.get_all_voronoi_polyhedra()
+
+
+def voronoi_polyhedra_symmetry():
+    return finder.get_all_voronoi_polyhedra(symprec=SYMPREC)
+
+
+def order_parameters():
+    return ops.get_all_order_parameters(structure)
+
+
+def order_parameters_symmetry():
+    return ops.get_all_order_parameters(structure, symprec=SYMPREC)
+
+
+if __name__ == "__main__":
+    print("{} sites".format(len(structure)))
+    for name in ["coordination_numbers", "coordination_numbers_symmetry",
+                 "voronoi_polyhedra", "voronoi_polyhedra_symmetry",
+                 "order_parameters", "order_parameters_symmetry"]:
+        t = timeit.timeit("{}()".format(name),
+                          setup="from __main__ import {}".format(name),
+                          number=1)
+        print("{}: {:.3f} s".format(name, t))
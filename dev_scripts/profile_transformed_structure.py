@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+
+"""
+Benchmark of one-to-many transformations on TransformedStructures, similar to
+what StandardTransmuter does with extend_collection. The structure is a
+LiFePO4 supercell which first goes through a few substitutions, so that each
+alternative ordering has a history of several structures, and then a partial
+removal of Li is applied to it. The time of the Ewald ordering itself is
+included.
+"""
+
+from __future__ import division, print_function
+
+import timeit
+
+from pymatgen.alchemy.materials import TransformedStructure
+from pymatgen.transformations.standard_transformations import \
+    SubstitutionTransformation, PartialRemoveSpecieTransformation
+from pymatgen.util.testing import PymatgenTest
+
+NALTERNATIVES = 200
+
+structure = PymatgenTest.get_structure("LiFePO4")
+structure.add_oxidation_state_by_element({"Li": 1, "Fe": 2, "P": 5, "O": -2})
+structure.make_supercell([2, 1, 1])
+substitutions = [SubstitutionTransformation({"Fe2+": sp})
+                 for sp in ["Mn2+", "Co2+", "Ni2+", "Fe2+"]]
+removal = PartialRemoveSpecieTransformation(
+    "Li+", 0.5, algo=PartialRemoveSpecieTransformation.ALGO_FAST)
+
+
+def branch():
+    ts = TransformedStructure(structure, substitutions)
+    return ts.append_transformation(removal,
+                                    return_alternatives=NALTERNATIVES)
+
+
+def branch_as_dict():
+    return [ts.as_dict() for ts in branch()]
+
+
+if __name__ == "__main__":
+    print("{} sites, {} alternatives".format(len(structure),
+                                             len(branch()) + 1))
+    for name in ["branch", "branch_as_dict"]:
+        t = timeit.timeit("{}()".format(name),
+                          setup="from __main__ import {}".format(name),
+                          number=1)
+        print("{}: {:.3f} s".format(name, t))
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+
+"""
+Benchmark of StandardTransmuter with a pool of processes, on a sequence of
+one-to-many transformations: orderings of Fe/Mn in LiFePO4, followed by a
+partial removal of Li. The transformed structures carry a history of a few
+substitutions, which is not sent to the workers. The same steps are also run
+with iter_pipeline, which processes the structures chunk by chunk.
+"""
+
+from __future__ import division, print_function
+
+import multiprocessing
+import timeit
+
+from pymatgen.alchemy.materials import TransformedStructure
+from pymatgen.alchemy.transmuters import StandardTransmuter
+from pymatgen.transformations.standard_transformations import \
+    SubstitutionTransformation, PartialRemoveSpecieTransformation, \
+    OrderDisorderedStructureTransformation
+from pymatgen.util.testing import PymatgenTest
+
+NSTRUCTURES = 10
+NCORES = max(2, multiprocessing.cpu_count())
+
+structure = PymatgenTest.get_structure("LiFePO4")
+structure.add_oxidation_state_by_element({"Li": 1, "Fe": 2, "P": 5, "O": -2})
+cycle = ["Fe2+", "Mn2+", "Co2+", "Ni2+", "Fe2+"]
+history = [SubstitutionTransformation({sp1: sp2})
+           for sp1, sp2 in zip(cycle[:-1], cycle[1:])]
+steps = [SubstitutionTransformation({"Fe2+": {"Fe2+": 0.5, "Mn2+": 0.5}}),
+         OrderDisorderedStructureTransformation(),
+         PartialRemoveSpecieTransformation("Li+", 0.5)]
+
+
+def get_transformed_structures():
+    return [TransformedStructure(structure.copy(), history)
+            for i in range(NSTRUCTURES)]
+
+
+def serial():
+    tsc = StandardTransmuter(get_transformed_structures())
+    for t in steps:
+        tsc.append_transformation(t, extend_collection=10)
+    return len(tsc)
+
+
+def parallel():
+    with StandardTransmuter(get_transformed_structures(),
+                            ncores=NCORES) as tsc:
+        for t in steps:
+            tsc.append_transformation(t, extend_collection=10)
+    return len(tsc)
+
+
+def pipeline():
+    with StandardTransmuter(get_transformed_structures(),
+                            ncores=NCORES) as tsc:
+        return sum(1 for ts in tsc.iter_pipeline(steps, extend_collection=10,
+                                                 chunk_size=2))
+
+
+if __name__ == "__main__":
+    print("{} structures, {} processes".format(serial(), NCORES))
+    for name in ["serial", "parallel", "pipeline"]:
+        t = timeit.timeit("{}()".format(name),
+                          setup="from __main__ import {}".format(name),
+                          number=1)
+        print("{}: {:.3f} s".format(name, t))
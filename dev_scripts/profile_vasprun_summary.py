@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+
+"""
+Benchmark of the summary parse mode of Vasprun against the full parse, on the
+relaxation and the DOS run of the test files. The summary mode is what the
+drones use to build ComputedEntries.
+"""
+
+from __future__ import division, print_function
+
+import os
+import timeit
+import warnings
+
+from pymatgen.io.vasp.outputs import Vasprun
+
+warnings.simplefilter("ignore")
+
+test_dir = os.path.join(os.path.dirname(__file__), "..", "test_files")
+FILES = ["vasprun.xml.unconverged", "vasprun.xml.uniform", "vasprun.xml.dfpt"]
+NREPEATS = 5
+
+
+def full_parse():
+    for fname in FILES:
+        Vasprun(os.path.join(test_dir, fname), parse_potcar_file=False)
+
+
+def full_parse_no_dos():
+    for fname in FILES:
+        Vasprun(os.path.join(test_dir, fname), parse_potcar_file=False,
+                parse_dos=False, parse_eigen=False)
+
+
+def summary_parse():
+    for fname in FILES:
+        Vasprun(os.path.join(test_dir, fname), parse_potcar_file=False,
+                summary_only=True)
+
+
+if __name__ == "__main__":
+    print("{:.1f} MB in {} files".format(
+        sum(os.path.getsize(os.path.join(test_dir, f))
+            for f in FILES) / 1024 ** 2, len(FILES)))
+    for name in ["full_parse", "full_parse_no_dos", "summary_parse"]:
+        t = timeit.timeit("{}()".format(name),
+                          setup="from __main__ import {}".format(name),
+                          number=NREPEATS)
+        print("{}: {:.3f} s".format(name, t / NREPEATS))
@@ -1,5 +1,9 @@
 from __future__ import unicode_literals
 
+import sys
+import types
+from importlib import import_module
+
 __author__ = "Pymatgen Development Team"
 __email__ ="pymatgen@googlegroups.com"
 __maintainer__ = "Shyue Ping Ong"
@@ -12,8 +16,51 @@ __version__ = "3.5.2"
 # Allows from pymatgen import <class> for quick usage.
 
 from .core import *
-from .serializers.json_coders import pmg_dump, pmg_load
-from .electronic_structure.core import Spin, Orbital
-from .io.smart import read_structure, write_structure, read_mol, write_mol
-from .matproj.rest import MPRester
 from monty.json import MontyEncoder, MontyDecoder, MSONable
+
+# The following aliases are only imported on first access, so that a plain
+# "import pymatgen" does not pay for importing e.g., the io modules or requests
+# (for the MPRester).
+_lazy_aliases = {
+    "pmg_dump": "pymatgen.serializers.json_coders",
+    "pmg_load": "pymatgen.serializers.json_coders",
+    "Spin": "pymatgen.electronic_structure.core",
+    "Orbital": "pymatgen.electronic_structure.core",
+    "read_structure": "pymatgen.io.smart",
+    "write_structure": "pymatgen.io.smart",
+    "read_mol": "pymatgen.io.smart",
+    "write_mol": "pymatgen.io.smart",
+    "MPRester": "pymatgen.matproj.rest",
+}
+
+
+class _LazyAliasModule(types.ModuleType):
+    """
+    Module type of the pymatgen package, which imports the lazy aliases on
+    first access.
+    """
+
+    def __getattr__(self, name):
+        if name not in _lazy_aliases:
+            raise AttributeError("module {} has no attribute {}".format(
+                self.__name__, name))
+        value = getattr(import_module(_lazy_aliases[name]), name)
+        setattr(self, name, value)
+        return value
+
+    def __dir__(self):
+        return sorted(set(self.__dict__.keys()) | set(_lazy_aliases.keys()))
+
+
+__all__ = [str(k) for k in list(globals().keys()) + list(_lazy_aliases.keys())
+           if not k.startswith("_") and
+           k not in ("sys", "types", "import_module", "unicode_literals")]
+
+# Module __getattr__ is not supported by all the supported Python versions,
+# so the package module is replaced by an instance of _LazyAliasModule. A
+# reference to the original module is kept, otherwise its globals would be
+# cleared when it is garbage collected.
+_lazy_module = _LazyAliasModule(__name__, __doc__)
+_lazy_module.__dict__.update(sys.modules[__name__].__dict__)
+_lazy_module._original_module = sys.modules[__name__]
+sys.modules[__name__] = _lazy_module
@@ -17,11 +17,13 @@ __email__ = "wrichards@mit.edu"
 __date__ = "Sep 25, 2012"
 
 import abc
+import math
 
 import six
 from six.moves import map
 
 from pymatgen.core.periodic_table import get_el_sp
+from pymatgen.core.structure import Structure
 from monty.json import MSONable
 from pymatgen.analysis.structure_matcher import StructureMatcher,\
     ElementComparator
@@ -29,6 +31,7 @@ from pymatgen.symmetry.analyzer import SpacegroupAnalyzer
 
 from collections import defaultdict
 
+
 class AbstractStructureFilter(six.with_metaclass(abc.ABCMeta, MSONable)):
     """
     AbstractStructureFilter that defines an API to perform testing of
@@ -159,6 +162,143 @@ class SpecieProximityFilter(AbstractStructureFilter):
         return cls(**d["init_args"])
 
 
+class StructureIndex(MSONable):
+    """
+    Index of structures by fingerprint, used to find the structures that can
+    match a given structure without calling StructureMatcher.fit on all of
+    them. The fingerprint of a structure is computed once, when it is added
+    to the index. It is made of:
+
+    - the hash of the composition given by the comparator of the matcher.
+    - the spacegroup number, if symprec is not None.
+    - a bin of the volume per site, if the matcher does not scale the
+      volumes. The bins are wider than the largest volume ratio allowed by
+      the length and angle tolerances of the matcher, and the neighbouring
+      bins are also searched.
+
+    Only the structures with the same fingerprint as a structure are
+    compared with it. The index can be saved with as_dict (which includes
+    the fingerprints) so that a large set of reference structures is only
+    analyzed once.
+    """
+
+    def __init__(self, structures=None, structure_matcher=StructureMatcher(
+                 comparator=ElementComparator()), symprec=None,
+                 fingerprints=None):
+        """
+        Args:
+            structures: List of structures to index.
+            structure_matcher: StructureMatcher (or its dict) used to compare
+                the structures.
+            symprec: The precision in the symmetry finder algorithm if None (
+                default value), the spacegroup is not part of the
+                fingerprint. A recommended value is 1e-5.
+            fingerprints: Fingerprints of the structures, as returned by
+                get_fingerprint. Used by from_dict; computed if None.
+        """
+        if isinstance(structure_matcher, dict):
+            structure_matcher = StructureMatcher.from_dict(structure_matcher)
+        self.structure_matcher = structure_matcher
+        self.symprec = symprec
+        self.structures = []
+        self._fingerprints = []
+        self._index = defaultdict(list)
+        if structure_matcher._scale:
+            self._vol_bin_width = None
+        else:
+            # The lengths of two matching lattices differ by less than ltol
+            # and their angles by less than angle_tol. The volume per site of
+            # reduced cells then differs by less than the bin width.
+            self._vol_bin_width = 3 * (-math.log(1 - structure_matcher.ltol) +
+                                       math.radians(
+                                           structure_matcher.angle_tol))
+        structures = structures or []
+        if fingerprints is None:
+            fingerprints = [None] * len(structures)
+        for s, fp in zip(structures, fingerprints):
+            self.add(s, fp)
+
+    def __len__(self):
+        return len(self.structures)
+
+    def get_fingerprint(self, structure):
+        """
+        Returns the fingerprint of a structure, as a tuple of the composition
+        hash, the spacegroup number and the volume bin (None if not used).
+        """
+        h = self.structure_matcher._comparator.get_hash(structure.composition)
+        sg = None
+        if self.symprec is not None:
+            sg = SpacegroupAnalyzer(
+                structure, symprec=self.symprec).get_spacegroup_number()
+        vol_bin = None
+        if self._vol_bin_width is not None:
+            vol_bin = int(math.floor(
+                math.log(structure.volume / len(structure)) /
+                self._vol_bin_width))
+        return h, sg, vol_bin
+
+    def add(self, structure, fingerprint=None):
+        """
+        Adds a structure to the index.
+
+        Args:
+            structure: Structure to add.
+            fingerprint: Fingerprint of the structure, if already known.
+
+        Returns:
+            The fingerprint of the structure.
+        """
+        if fingerprint is None:
+            fingerprint = self.get_fingerprint(structure)
+        self._index[tuple(fingerprint)].append(structure)
+        self.structures.append(structure)
+        self._fingerprints.append(tuple(fingerprint))
+        return fingerprint
+
+    def get_candidates(self, structure, fingerprint=None):
+        """
+        Returns the structures of the index with the same fingerprint as
+        structure, i.e. the structures that can match it.
+        """
+        h, sg, vol_bin = fingerprint or self.get_fingerprint(structure)
+        if vol_bin is None:
+            return list(self._index.get((h, sg, None), []))
+        candidates = []
+        for b in (vol_bin - 1, vol_bin, vol_bin + 1):
+            candidates.extend(self._index.get((h, sg, b), []))
+        return candidates
+
+    def find_match(self, structure, fingerprint=None):
+        """
+        Returns the first structure of the index that matches structure
+        according to the structure matcher, or None if there is none.
+        """
+        for s in self.get_candidates(structure, fingerprint):
+            if self.structure_matcher.fit(s, structure):
+                return s
+        return None
+
+    def as_dict(self):
+        return {"@module": self.__class__.__module__,
+                "@class": self.__class__.__name__,
+                "structures": [s.as_dict() for s in self.structures],
+                "structure_matcher": self.structure_matcher.as_dict(),
+                "symprec": self.symprec,
+                "fingerprints": [[sg, vol_bin] for _, sg, vol_bin
+                                 in self._fingerprints]}
+
+    @classmethod
+    def from_dict(cls, d):
+        matcher = StructureMatcher.from_dict(d["structure_matcher"])
+        structures = [Structure.from_dict(sd) for sd in d["structures"]]
+        # The composition hashes are cheap and are not serialized.
+        fingerprints = [
+            (matcher._comparator.get_hash(s.composition), sg, vol_bin)
+            for s, (sg, vol_bin) in zip(structures, d["fingerprints"])]
+        return cls(structures, matcher, d["symprec"], fingerprints)
+
+
 class RemoveDuplicatesFilter(AbstractStructureFilter):
     """
     This filter removes exact duplicate structures from the transmuter.
@@ -178,29 +318,29 @@ class RemoveDuplicatesFilter(AbstractStructureFilter):
                 structure matcher is used. A recommended value is 1e-5.
         """
         self.symprec = symprec
-        self.structure_list = defaultdict(list)
         if isinstance(structure_matcher, dict):
             self.structure_matcher = StructureMatcher.from_dict(structure_matcher)
         else:
             self.structure_matcher = structure_matcher
+        self.structure_index = StructureIndex(
+            structure_matcher=self.structure_matcher, symprec=symprec)
 
-    def test(self, structure):
-        h = self.structure_matcher._comparator.get_hash(structure.composition)
-        if not self.structure_list[h]:
-            self.structure_list[h].append(structure)
-            return True
-
-        def get_sg(s):
-            finder = SpacegroupAnalyzer(s, symprec=self.symprec)
-            return finder.get_spacegroup_number()
-
-        for s in self.structure_list[h]:
-            if self.symprec is None or \
-                    get_sg(s) == get_sg(structure):
-                if self.structure_matcher.fit(s, structure):
-                    return False
+    @property
+    def structure_list(self):
+        """
+        The structures that passed the filter, grouped by composition hash.
+        """
+        structure_list = defaultdict(list)
+        for s, fp in zip(self.structure_index.structures,
+                         self.structure_index._fingerprints):
+            structure_list[fp[0]].append(s)
+        return structure_list
 
-        self.structure_list[h].append(structure)
+    def test(self, structure):
+        fp = self.structure_index.get_fingerprint(structure)
+        if self.structure_index.find_match(structure, fp) is not None:
+            return False
+        self.structure_index.add(structure, fp)
         return True
 
 
@@ -216,35 +356,32 @@ class RemoveExistingFilter(AbstractStructureFilter):
         and symmetry (if symprec is given).
 
         Args:
-            existing_structures: List of existing structures to compare with
+            existing_structures: List of existing structures to compare with,
+                or a StructureIndex of them (e.g. loaded with from_dict, so
+                that their fingerprints are not computed again). In the
+                latter case, the matcher and symprec of the index are used.
             structure_matcher: Provides a structure matcher to be used for
                 structure comparison.
             symprec: The precision in the symmetry finder algorithm if None (
                 default value), no symmetry check is performed and only the
                 structure matcher is used. A recommended value is 1e-5.
         """
-        self.symprec = symprec
-        self.structure_list = []
-        self.existing_structures = existing_structures
-        if isinstance(structure_matcher, dict):
-            self.structure_matcher = StructureMatcher.from_dict(structure_matcher)
+        if isinstance(existing_structures, StructureIndex):
+            self.structure_index = existing_structures
         else:
-            self.structure_matcher = structure_matcher
+            if isinstance(structure_matcher, dict):
+                structure_matcher = StructureMatcher.from_dict(
+                    structure_matcher)
+            self.structure_index = StructureIndex(
+                existing_structures, structure_matcher, symprec)
+        self.symprec = self.structure_index.symprec
+        self.structure_matcher = self.structure_index.structure_matcher
+        self.existing_structures = self.structure_index.structures
+        self.structure_list = []
 
     def test(self, structure):
-
-        def get_sg(s):
-            finder = SpacegroupAnalyzer(s, symprec=self.symprec)
-            return finder.get_spacegroup_number()
-
-        for s in self.existing_structures:
-            if self.structure_matcher._comparator.get_hash(structure.composition) ==\
-                    self.structure_matcher._comparator.get_hash(s.composition):
-                if self.symprec is None or \
-                        get_sg(s) == get_sg(structure):
-                    if self.structure_matcher.fit(s, structure):
-                        return False
-
+        if self.structure_index.find_match(structure) is not None:
+            return False
         self.structure_list.append(structure)
         return True
 
@@ -44,6 +44,14 @@ class TransformedStructure(MSONable):
 
     Each transformed structure is made up of a sequence of structures with
     associated transformation history.
+
+    The input structures in the history are references to the Structure
+    objects (they are only converted to dicts by as_dict), and the
+    alternatives returned by one-to-many transformations share the entries
+    of the history with their parent. Structures that have been transformed
+    should therefore not be modified in place. The structure passed to the
+    constructor is copied when the first transformation is recorded, so that
+    the caller can still modify it.
     """
 
     def __init__(self, structure, transformations=None, history=None,
@@ -62,6 +70,8 @@ class TransformedStructure(MSONable):
         self.history = history or []
         self.other_parameters = other_parameters or {}
         self._undone = []
+        # final_structure is still the object of the caller.
+        self._caller_structure = True
 
         transformations = transformations or []
         for t in transformations:
@@ -82,8 +92,11 @@ class TransformedStructure(MSONable):
         h = self.history.pop()
         self._undone.append((h, self.final_structure))
         s = h["input_structure"]
-        if isinstance(s, dict):
-            s = Structure.from_dict(s)
+        if isinstance(s, Structure):
+            # The entry can be shared with other TransformedStructures.
+            s = s.copy()
+        else:
+            s = Structure.from_dict(s if isinstance(s, dict) else s.as_dict())
         self.final_structure = s
 
     def redo_next_change(self):
@@ -123,14 +136,32 @@ class TransformedStructure(MSONable):
                 to do a redo, the redo list should not be cleared to allow
                 multiple redos.
         """
+        if return_alternatives and transformation.is_one_to_many:
+            output = transformation.apply_transformation(
+                self.final_structure, return_ranked_list=return_alternatives)
+        else:
+            output = transformation.apply_transformation(self.final_structure)
+        return self._append_output(transformation, output,
+                                   return_alternatives, clear_redo)
+
+    def _append_output(self, transformation, output, return_alternatives,
+                       clear_redo):
+        """
+        Appends the output of transformation.apply_transformation on
+        final_structure (a structure, or a ranked list if return_alternatives
+        is set for a one-to-many transformation). Allows transmuters to apply
+        the transformations in other processes.
+        """
         if clear_redo:
             self._undone = []
 
-        if return_alternatives and transformation.is_one_to_many:
-            ranked_list = transformation.apply_transformation(
-                self.final_structure, return_ranked_list=return_alternatives)
+        input_structure = self.final_structure
+        if self._caller_structure:
+            input_structure = input_structure.copy()
+            self._caller_structure = False
 
-            input_structure = self.final_structure.as_dict()
+        if return_alternatives and transformation.is_one_to_many:
+            ranked_list = output
             alts = []
             for x in ranked_list[1:]:
                 s = x.pop("structure")
@@ -138,28 +169,38 @@ class TransformedStructure(MSONable):
                 hdict = actual_transformation.as_dict()
                 hdict["input_structure"] = input_structure
                 hdict["output_parameters"] = x
-                self.final_structure = s
-                d = self.as_dict()
-                d['history'].append(hdict)
-                d['final_structure'] = s.as_dict()
-                alts.append(TransformedStructure.from_dict(d))
+                # The alternatives share the previous history entries.
+                alts.append(TransformedStructure(
+                    self._get_output_structure(s),
+                    history=self.history + [hdict],
+                    other_parameters=deepcopy(self.other_parameters)))
 
             x = ranked_list[0]
             s = x.pop("structure")
             actual_transformation = x.pop("transformation", transformation)
             hdict = actual_transformation.as_dict()
-            hdict["input_structure"] = self.final_structure.as_dict()
+            hdict["input_structure"] = input_structure
             hdict["output_parameters"] = x
             self.history.append(hdict)
-            self.final_structure = s
+            self.final_structure = self._get_output_structure(s)
             return alts
         else:
-            s = transformation.apply_transformation(self.final_structure)
+            s = output
             hdict = transformation.as_dict()
-            hdict["input_structure"] = self.final_structure.as_dict()
+            hdict["input_structure"] = input_structure
             hdict["output_parameters"] = {}
             self.history.append(hdict)
-            self.final_structure = s
+            self.final_structure = self._get_output_structure(s)
+
+    def _get_output_structure(self, structure):
+        """
+        Returns the structure to use as final_structure after a
+        transformation, copied if the transformation returned its input
+        (which is now referenced by the history).
+        """
+        if structure is self.final_structure:
+            return structure.copy()
+        return structure
 
     def append_filter(self, structure_filter):
         """
@@ -171,7 +212,8 @@ class TransformedStructure(MSONable):
                 to retain.
         """
         hdict = structure_filter.as_dict()
-        hdict["input_structure"] = self.final_structure.as_dict()
+        # final_structure is not replaced by a filter, so a copy is stored.
+        hdict["input_structure"] = self.final_structure.copy()
         self.history.append(hdict)
 
     def extend_transformations(self, transformations,
@@ -231,8 +273,8 @@ class TransformedStructure(MSONable):
                   "\nHistory",
                   "------------"]
         for h in self.history:
-            h.pop('input_structure', None)
-            output.append(str(h))
+            output.append(str({k: v for k, v in h.items()
+                               if k != 'input_structure'}))
         output.append("\nOther parameters")
         output.append("------------")
         output.append(str(self.other_parameters))
@@ -257,8 +299,12 @@ class TransformedStructure(MSONable):
         Copy of all structures in the TransformedStructure. A
         structure is stored after every single transformation.
         """
-        hstructs = [Structure.from_dict(s['input_structure'])
-                    for s in self.history if 'input_structure' in s]
+        hstructs = []
+        for h in self.history:
+            if 'input_structure' in h:
+                s = h['input_structure']
+                hstructs.append(Structure.from_dict(s) if isinstance(s, dict)
+                                else s.copy())
         return hstructs + [self.final_structure]
 
     @staticmethod
@@ -329,12 +375,28 @@ class TransformedStructure(MSONable):
         d = self.final_structure.as_dict()
         d["@module"] = self.__class__.__module__
         d["@class"] = self.__class__.__name__
-        d["history"] = deepcopy(self.history)
+        d["history"] = self._get_history_dicts()
         d["version"] = __version__
         d["last_modified"] = str(datetime.datetime.utcnow())
         d["other_parameters"] = deepcopy(self.other_parameters)
         return d
 
+    def _get_history_dicts(self):
+        """
+        Returns a deep copy of the history in which the input structures are
+        converted to dicts.
+        """
+        history = []
+        for h in self.history:
+            s = h.get("input_structure")
+            h = deepcopy({k: v for k, v in h.items()
+                          if k != "input_structure"})
+            if s is not None:
+                h["input_structure"] = deepcopy(s) \
+                    if isinstance(s, dict) else s.as_dict()
+            history.append(h)
+        return history
+
     @classmethod
     def from_dict(cls, d):
         """
@@ -350,7 +412,7 @@ class TransformedStructure(MSONable):
             warn('Data in TransformedStructure.other_parameters discarded '
                  'during type conversion to SNL')
         hist = []
-        for h in self.history:
+        for h in self._get_history_dicts():
             snl_metadata = h.pop('_snl', {})
             hist.append({'name' : snl_metadata.pop('name', 'pymatgen'),
                          'url' : snl_metadata.pop('url',
@@ -372,7 +434,7 @@ class TransformedStructure(MSONable):
         """
         hist = []
         for h in snl.history:
-            d = h.description
+            d = dict(h.description)
             d['_snl'] = {'url' : h.url, 'name' : h.name}
             hist.append(d)
         return cls(snl.structure, history=hist)
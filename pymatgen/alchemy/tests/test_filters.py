@@ -5,7 +5,8 @@
 from __future__ import unicode_literals
 
 from pymatgen.alchemy.filters import ContainsSpecieFilter, \
-    SpecieProximityFilter, RemoveDuplicatesFilter, RemoveExistingFilter
+    SpecieProximityFilter, RemoveDuplicatesFilter, RemoveExistingFilter, \
+    StructureIndex
 from pymatgen.core.lattice import Lattice
 from pymatgen.core.structure import Structure
 from pymatgen.core.periodic_table import Specie
@@ -126,6 +127,31 @@ class RemoveExistingFilterTest(unittest.TestCase):
             self._sm.fit(self._struct_list[-1],
                          transmuter.transformed_structures[-1].final_structure))
 
+    def test_structure_index(self):
+        index = StructureIndex(self._exisiting_structures, symprec=1e-3)
+        self.assertEqual(len(index), len(self._exisiting_structures))
+        s = self._struct_list[0].copy()
+        s.make_supercell([1, 1, 2])
+        self.assertIs(index.find_match(s), self._struct_list[0])
+        self.assertIsNone(index.find_match(self._struct_list[-1]))
+        # Only the structures with the same spacegroup are candidates.
+        self.assertLess(len(index.get_candidates(s)), len(index))
+
+        # The fingerprints are saved with the index.
+        index = StructureIndex.from_dict(
+            json.loads(json.dumps(index.as_dict())))
+        self.assertIs(index.find_match(s), index.structures[0])
+        fil = RemoveExistingFilter(index)
+        self.assertFalse(fil.test(s))
+        self.assertTrue(fil.test(self._struct_list[-1]))
+
+        # Volume bins are used when the matcher does not scale the volumes.
+        sm = StructureMatcher(scale=False)
+        index = StructureIndex(self._exisiting_structures, sm)
+        self.assertIs(index.find_match(s), self._struct_list[0])
+        s.scale_lattice(s.volume * 20)
+        self.assertEqual(index.get_candidates(s), [])
+
 if __name__ == "__main__":
     #import sys;sys.argv = ['', 'Test.testName']
     unittest.main()
@@ -21,7 +21,7 @@ import os
 import json
 import warnings
 
-from pymatgen.core.structure import Structure
+from pymatgen.core.structure import Structure, IStructure
 from pymatgen.transformations.standard_transformations import \
     SubstitutionTransformation, PartialRemoveSpecieTransformation, \
     SupercellTransformation
@@ -91,6 +91,38 @@ class TransformedStructureTest(unittest.TestCase):
                 algo=PartialRemoveSpecieTransformation.ALGO_COMPLETE), 5)
         self.assertEqual(len(alt), 2)
 
+        # The alternatives share the history entries instead of copies.
+        self.assertEqual(len(alt[0].history), len(ts.history))
+        self.assertIs(alt[0].history[0], ts.history[0])
+        self.assertIs(alt[0].history[-1]["input_structure"],
+                      ts.history[-1]["input_structure"])
+        d = json.loads(json.dumps(alt[0].as_dict()))
+        self.assertEqual(d["history"][-1]["input_structure"]["@class"],
+                         "Structure")
+        self.assertEqual(TransformedStructure.from_dict(d).structures,
+                         alt[0].structures)
+        alt[0].undo_last_change()
+        alt[0].final_structure.replace(0, "Ge")
+        self.assertEqual(ts.structures[1].formula, "Si4")
+
+    def test_caller_structure(self):
+        # Modifying the input structure does not change the history.
+        s = self.structure.copy()
+        ts = TransformedStructure(s, [SubstitutionTransformation(
+            {"Li": "Na"})])
+        s.replace_species({"Fe": "Mn"})
+        self.assertEqual(ts.structures[0].composition.reduced_formula,
+                         "LiFePO4")
+
+        # IStructures are serialized as well.
+        ts = TransformedStructure(IStructure.from_sites(self.structure),
+                                  [SupercellTransformation()])
+        d = json.loads(json.dumps(ts.as_dict()))
+        self.assertEqual(d["history"][0]["input_structure"]["@class"],
+                         "IStructure")
+        ts.undo_last_change()
+        self.assertIsInstance(ts.final_structure, Structure)
+
     def test_append_filter(self):
         f3 = ContainsSpecieFilter(['O2-'], strict_compare=True, AND=False)
         self.trans.append_filter(f3)
@@ -18,13 +18,17 @@ __date__ = "Mar 5, 2012"
 
 import unittest2 as unittest
 import os
-from pymatgen.alchemy.transmuters import CifTransmuter, PoscarTransmuter
+import shutil
+import tempfile
+from pymatgen.alchemy.transmuters import CifTransmuter, PoscarTransmuter, \
+    StandardTransmuter
 from pymatgen.alchemy.filters import ContainsSpecieFilter
 from pymatgen.transformations.standard_transformations import \
     SubstitutionTransformation, RemoveSpeciesTransformation, \
     OrderDisorderedStructureTransformation
 from pymatgen.transformations.advanced_transformations import \
     SuperTransformation
+from pymatgen.io.vasp.sets import MPVaspInputSet
 
 test_dir = os.path.join(os.path.dirname(__file__), "..", "..", "..",
                         'test_files')
@@ -104,6 +108,79 @@ class PoscarTransmuterTest(unittest.TestCase):
                          .as_dict()['other_parameters']['tags'],
                          ["world", "universe"])
 
+    def test_ncores(self):
+        steps = [RemoveSpeciesTransformation('O'),
+                 SubstitutionTransformation({"Fe": {"Fe2+": 0.25,
+                                                    "Mn3+": .75},
+                                             "P": "P5+"}),
+                 OrderDisorderedStructureTransformation()]
+        serial = PoscarTransmuter.from_filenames(
+            [os.path.join(test_dir, "POSCAR")])
+        tsc = StandardTransmuter(PoscarTransmuter.from_filenames(
+            [os.path.join(test_dir, "POSCAR")]).transformed_structures,
+            ncores=2)
+        with tsc:
+            for t in steps:
+                serial.append_transformation(t, extend_collection=50)
+                tsc.append_transformation(t, extend_collection=50)
+            # The pool is reused by the next transformations.
+            pool = tsc._pool
+            self.assertIsNotNone(pool)
+            tsc.append_transformation(
+                SubstitutionTransformation({"Mn3+": "Mn4+"}))
+            self.assertIs(tsc._pool, pool)
+        self.assertIsNone(tsc._pool)
+        self.assertEqual(len(tsc), 4)
+        self.assertEqual(len(tsc[0]), 5)
+        self.assertEqual([ts.final_structure for ts in serial],
+                         [ts.structures[-2] for ts in tsc])
+        # The history is updated in the main process.
+        self.assertIs(tsc[0].history[-2]["input_structure"],
+                      tsc[1].history[-2]["input_structure"])
+
+    def test_write_vasp_input(self):
+        if "VASP_PSP_DIR" not in os.environ:
+            os.environ["VASP_PSP_DIR"] = os.path.abspath(test_dir)
+        tsc = PoscarTransmuter.from_filenames(
+            [os.path.join(test_dir, "POSCAR")] * 5)
+        tsc.add_tags(["a", "b"])
+        output_dir = tempfile.mkdtemp()
+        try:
+            tsc.write_vasp_input(MPVaspInputSet(), output_dir,
+                                 subfolder=lambda x: x.other_parameters[
+                                     "tags"][0],
+                                 nthreads=2)
+            dirs = sorted(os.listdir(os.path.join(output_dir, "a")))
+            self.assertEqual(dirs, ["Fe4P4O16_{}".format(i)
+                                    for i in range(5)])
+            for d in dirs:
+                self.assertEqual(
+                    sorted(os.listdir(os.path.join(output_dir, "a", d))),
+                    ["INCAR", "KPOINTS", "POSCAR", "POTCAR",
+                     "transformations.json"])
+        finally:
+            shutil.rmtree(output_dir)
+
+    def test_iter_pipeline(self):
+        tsc = PoscarTransmuter.from_filenames(
+            [os.path.join(test_dir, "POSCAR")] * 3)
+        steps = [RemoveSpeciesTransformation('O'),
+                 SubstitutionTransformation({"Fe": {"Fe2+": 0.25,
+                                                    "Mn3+": .75},
+                                             "P": "P5+"}),
+                 OrderDisorderedStructureTransformation(),
+                 ContainsSpecieFilter(['Mn3+'])]
+        it = tsc.iter_pipeline(steps, extend_collection=50, chunk_size=2)
+        self.assertEqual(len(list(it)), 12)
+        # The list of the transmuter is not replaced.
+        self.assertEqual(len(tsc), 3)
+        self.assertEqual(len(tsc[0]), 5)
+
+        tstructs = (ts for ts in PoscarTransmuter.from_filenames(
+            [os.path.join(test_dir, "POSCAR")]))
+        it = tsc.iter_pipeline(steps[:1], transformed_structures=tstructs)
+        self.assertEqual(len(next(it).final_structure), 8)
+
 if __name__ == "__main__":
     #import sys;sys.argv = ['', 'Test.testName']
     unittest.main()
@@ -14,7 +14,7 @@ It also includes the helper function, batch_write_vasp_input to generate an
 entire directory of vasp input files for running.
 """
 
-from six.moves import filter, map
+from six.moves import filter
 
 __author__ = "Shyue Ping Ong, Will Richards"
 __copyright__ = "Copyright 2012, The Materials Project"
@@ -26,8 +26,10 @@ __date__ = "Mar 4, 2012"
 import os
 import re
 import warnings
+import itertools
 
 from multiprocessing import Pool
+from multiprocessing.pool import ThreadPool
 from pymatgen.alchemy.materials import TransformedStructure
 
 
@@ -39,6 +41,12 @@ class StandardTransmuter(object):
     .. attribute: transformed_structures
 
         List of all transformed structures.
+
+    If ncores is set, the transformations are applied by a pool of processes
+    that is created on first use and reused until close() is called (the
+    transmuter can also be used as a context manager). Only the final
+    structures are sent to the workers, and only the output structures are
+    sent back.
     """
 
     def __init__(self, transformed_structures, transformations=None,
@@ -61,6 +69,7 @@ class StandardTransmuter(object):
                 serial.
         """
 
+        self._pool = None
         self.transformed_structures = transformed_structures
         self.ncores = ncores
         if transformations is not None:
@@ -87,6 +96,27 @@ class StandardTransmuter(object):
     def __getattr__(self, name):
         return [getattr(x, name) for x in self.transformed_structures]
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = Pool(self.ncores)
+        return self._pool
+
+    def close(self):
+        """
+        Terminates the pool of processes used to apply the transformations,
+        if any. A new one is created if a transformation is applied later.
+        """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
     def undo_last_change(self):
         """
         Undo the last transformation in the TransformedStructure.
@@ -132,25 +162,42 @@ class StandardTransmuter(object):
             each boolean describes whether the transformation altered the
             structure
         """
+        self.transformed_structures = self._transform(
+            self.transformed_structures, transformation, extend_collection,
+            clear_redo)
+
+    def _transform(self, transformed_structures, transformation,
+                   extend_collection, clear_redo=True):
+        """
+        Applies a transformation to a list of TransformedStructures and
+        returns the list of the TransformedStructures with the new ones
+        created by one-to-many transformations.
+        """
         if self.ncores and transformation.use_multiprocessing:
-            p = Pool(self.ncores)
-            #need to condense arguments into single tuple to use map
-            z = map(
-                lambda x: (x, transformation, extend_collection, clear_redo),
-                self.transformed_structures)
-            new_tstructs = p.map(_apply_transformation, z, 1)
-            self.transformed_structures = []
-            for ts in new_tstructs:
-                self.transformed_structures.extend(ts)
+            # Only the structures are sent to the workers, the histories are
+            # updated here.
+            z = [(ts.final_structure, transformation, extend_collection)
+                 for ts in transformed_structures]
+            chunksize = max(1, len(z) // (4 * self.ncores))
+            outputs = self._get_pool().imap(_apply_transformation, z,
+                                            chunksize)
+            new_tstructs = []
+            for ts, output in zip(transformed_structures, outputs):
+                new = ts._append_output(transformation, output,
+                                        extend_collection, clear_redo)
+                new_tstructs.append(ts)
+                if new:
+                    new_tstructs.extend(new)
+            return new_tstructs
         else:
             new_structures = []
-            for x in self.transformed_structures:
+            for x in transformed_structures:
                 new = x.append_transformation(transformation,
                                               extend_collection,
                                               clear_redo=clear_redo)
                 if new is not None:
                     new_structures.extend(new)
-            self.transformed_structures.extend(new_structures)
+            return list(transformed_structures) + new_structures
 
     def extend_transformations(self, transformations):
         """
@@ -170,18 +217,50 @@ class StandardTransmuter(object):
         Args:
             structure_filter: StructureFilter to apply.
         """
+        self.transformed_structures = _filter(self.transformed_structures,
+                                              structure_filter)
 
-        def test_transformed_structure(ts):
-            return structure_filter.test(ts.final_structure)
+    def iter_pipeline(self, steps, extend_collection=False,
+                      transformed_structures=None, chunk_size=100):
+        """
+        Generator that applies a sequence of transformations and filters to
+        the TransformedStructures lazily, chunk by chunk, and yields the
+        TransformedStructures that pass all the filters. Only one chunk (and
+        the structures created from it) is in memory at a time, e.g.
+        batch_write_vasp_input(transmuter.iter_pipeline(steps), ...) writes
+        the inputs while the next structures are transformed.
 
-        self.transformed_structures = list(filter(test_transformed_structure,
-                                                  self.transformed_structures))
-        for ts in self.transformed_structures:
-            ts.append_filter(structure_filter)
+        Args:
+            steps: Sequence of transformations and filters (objects with a
+                test method, e.g. AbstractStructureFilter), applied in order.
+            extend_collection: Whether to use more than one output structure
+                from one-to-many transformations. extend_collection can be a
+                number, which determines the maximum branching for each
+                transformation.
+            transformed_structures: Iterable of TransformedStructures (e.g. a
+                generator) to use instead of the ones of the transmuter,
+                which are modified in place but not replaced by the outputs.
+            chunk_size (int): Number of input TransformedStructures processed
+                together.
+        """
+        if transformed_structures is None:
+            transformed_structures = self.transformed_structures
+        it = iter(transformed_structures)
+        while True:
+            chunk = list(itertools.islice(it, chunk_size))
+            if not chunk:
+                return
+            for step in steps:
+                if hasattr(step, "test"):
+                    chunk = _filter(chunk, step)
+                else:
+                    chunk = self._transform(chunk, step, extend_collection)
+            for ts in chunk:
+                yield ts
 
     def write_vasp_input(self, vasp_input_set, output_dir,
                          create_directory=True, subfolder=None,
-                         include_cif=False):
+                         include_cif=False, nthreads=1):
         """
         Batch write vasp input for a sequence of transformed structures to
         output_dir, following the format output_dir/{formula}_{number}.
@@ -197,10 +276,11 @@ class StandardTransmuter(object):
                 lambda x: x.other_parameters["tags"][0] to use the first tag.
             include_cif (bool): Whether to output a CIF as well. CIF files
                 are generally better supported in visualization programs.
+            nthreads (int): Number of threads writing the directories.
         """
         batch_write_vasp_input(self.transformed_structures, vasp_input_set,
                                output_dir, create_directory, subfolder,
-                               include_cif)
+                               include_cif, nthreads)
 
     def set_parameter(self, key, value):
         """
@@ -376,7 +456,7 @@ class PoscarTransmuter(StandardTransmuter):
 
 def batch_write_vasp_input(transformed_structures, vasp_input_set, output_dir,
                            create_directory=True, subfolder=None,
-                           include_cif=False):
+                           include_cif=False, nthreads=1):
     """
     Batch write vasp input for a sequence of transformed structures to
     output_dir, following the format output_dir/{group}/{formula}_{number}.
@@ -395,8 +475,13 @@ def batch_write_vasp_input(transformed_structures, vasp_input_set, output_dir,
         include_cif (bool): Boolean indication whether to output a CIF as
             well. CIF files are generally better supported in visualization
             programs.
+        nthreads (int): Number of threads writing the directories. Most of
+            the time is spent in file I/O, which releases the GIL. The
+            structures are taken in chunks, so transformed_structures can be
+            a generator, e.g. StandardTransmuter.iter_pipeline.
     """
-    for i, s in enumerate(transformed_structures):
+    def write(inputs):
+        i, s = inputs
         formula = re.sub("\s+", "", s.final_structure.formula)
         if subfolder is not None:
             subdir = subfolder(s)
@@ -412,6 +497,37 @@ def batch_write_vasp_input(transformed_structures, vasp_input_set, output_dir,
             writer = CifWriter(s.final_structure)
             writer.write_file(os.path.join(dirname, "{}.cif".format(formula)))
 
+    it = enumerate(transformed_structures)
+    if nthreads <= 1:
+        for inputs in it:
+            write(inputs)
+        return
+    pool = ThreadPool(nthreads)
+    try:
+        while True:
+            chunk = list(itertools.islice(it, 4 * nthreads))
+            if not chunk:
+                break
+            pool.map(write, chunk)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def _filter(transformed_structures, structure_filter):
+    """
+    Returns the TransformedStructures that pass structure_filter, with the
+    filter appended to their history.
+    """
+    def test_transformed_structure(ts):
+        return structure_filter.test(ts.final_structure)
+
+    transformed_structures = list(filter(test_transformed_structure,
+                                         transformed_structures))
+    for ts in transformed_structures:
+        ts.append_filter(structure_filter)
+    return transformed_structures
+
 
 def _apply_transformation(inputs):
     """
@@ -419,18 +535,16 @@ def _apply_transformation(inputs):
     in the class so that it can be pickled.
 
     Args:
-        inputs: Tuple containing the transformed structure, the transformation
-            to be applied, a boolean indicating whether to extend the
-            collection, and a boolean indicating whether to clear the redo
+        inputs: Tuple containing the structure, the transformation to be
+            applied and a boolean indicating whether to extend the collection.
 
     Returns:
-        List of output structures (the modified initial structure, plus
-        any new structures created by a one-to-many transformation)
+        Output of the transformation (a structure, or a ranked list of
+        structures for one-to-many transformations if extend_collection is
+        set), to be appended with TransformedStructure._append_output.
     """
-    ts, transformation, extend_collection, clear_redo = inputs
-    new = ts.append_transformation(transformation, extend_collection,
-                                   clear_redo=clear_redo)
-    o = [ts]
-    if new:
-        o.extend(new)
-    return o
+    structure, transformation, extend_collection = inputs
+    if extend_collection and transformation.is_one_to_many:
+        return transformation.apply_transformation(
+            structure, return_ranked_list=extend_collection)
+    return transformation.apply_transformation(structure)
@@ -18,8 +18,11 @@ __date__ = "Feb 20, 2016"
 
 
 import itertools
+import json
 import logging
+import os
 import time
+from multiprocessing import Pool
 
 from numpy.linalg import svd
 from numpy.linalg import norm
@@ -45,6 +48,21 @@ from pymatgen.analysis.chemenv.coordination_environments.structure_environments
 from pymatgen.analysis.chemenv.coordination_environments.voronoi import DetailedVoronoiContainer
 
 debug = False
+
+# LocalGeometryFinder used by the worker processes of compute_structure_environments_detailed_voronoi. It is set once
+# per worker by the Pool initializer so that the finder is only pickled once for each process, not for each site.
+_worker_lgf = None
+_worker_max_cn = None
+
+
+def _init_site_environments_worker(lgf, max_cn):
+    global _worker_lgf, _worker_max_cn
+    _worker_lgf = lgf
+    _worker_max_cn = max_cn
+
+
+def _site_environments_worker(isite):
+    return isite, _worker_lgf.compute_site_environments(isite, max_cn=_worker_max_cn)
 DIST_TOLERANCES = [0.02, 0.05, 0.1, 0.2, 0.3]
 
 
@@ -388,12 +406,19 @@ class LocalGeometryFinder(object):
                                                         source_structure_valence_fallback=False,
                                                         no_valence_exclude_atoms_fallback=None,
                                                         maximum_distance_factor=None,
-                                                        minimum_angle_factor=None, max_cn=None):
+                                                        minimum_angle_factor=None, max_cn=None, nproc=None,
+                                                        checkpoint_file=None, checkpoint_interval=10):
         """
         Computes and returns the StructureEnvironments object containing all the information about the coordination
         environments in the structure
         :param excluded_atoms: Atoms for which the coordination geometries does not have to be identified
         :param only_atoms: If not set to None, atoms for which the coordination geometries have to be identified
+        :param nproc: Number of processes over which the Voronoi analysis and the computation of the environments of
+        the different sites are distributed. If None or 1, everything is done in the current process
+        :param checkpoint_file: If not None, path of a json file in which the environments computed so far are saved.
+        If the file exists when the method is called (e.g. after an interrupted run) and corresponds to the same
+        structure, the sites it contains are not computed again
+        :param checkpoint_interval: Number of sites computed between two successive writes of the checkpoint file
         :return: The StructureEnvironments object containing all the information about the coordination
         environments in the structure
         """
@@ -414,24 +439,15 @@ class LocalGeometryFinder(object):
         if (self.structure_refinement == self.STRUCTURE_REFINEMENT_SYMMETRIZED and
                     len(self.symmetrized_structure.equivalent_sites) > 0):
             logging.info('Symmetrizing and refining structure')
-            indices = []
-            ind_eqsites_found = []
+            # The symmetrized structure has the same sites as self.structure, so that the groups of equivalent
+            # sites are directly given by the site indices
             self.equivalent_sites = self.symmetrized_structure.equivalent_sites
-            self.struct_sites_to_irreducible_site_list_map = [-1] * len(self.structure)
-            self.sites_map = [-1] * len(self.structure)
-            eqsite_found = [-1] * len(self.symmetrized_structure.equivalent_sites)
-            for isite, site in enumerate(self.structure):
-                for ieqsites, eqsites in enumerate(self.symmetrized_structure.equivalent_sites):
-                    if site in eqsites:
-                        self.struct_sites_to_irreducible_site_list_map[isite] = ieqsites
-                        if ieqsites not in ind_eqsites_found:
-                            indices.append(isite)
-                            ind_eqsites_found.append(ieqsites)
-                            myieqsite = isite
-                            eqsite_found[ieqsites] = myieqsite
-                        else:
-                            myieqsite = eqsite_found[ieqsites]
-                self.sites_map[isite] = myieqsite
+            equivalent_indices = self.symmetrized_structure.equivalent_indices
+            self.struct_sites_to_irreducible_site_list_map = [int(ieqsites) for ieqsites in
+                                                              self.symmetrized_structure.site_orbits]
+            self.sites_map = [equivalent_indices[ieqsites][0]
+                              for ieqsites in self.struct_sites_to_irreducible_site_list_map]
+            indices = sorted(eqindices[0] for eqindices in equivalent_indices)
         else:
             self.equivalent_sites = [[site] for site in self.structure]
             self.struct_sites_to_irreducible_site_list_map = list(range(len(self.structure)))
@@ -485,58 +501,149 @@ class LocalGeometryFinder(object):
         self.detailed_voronoi = DetailedVoronoiContainer(self.structure, isites=sites_indices,
                                                          valences=self.valences,
                                                          maximum_distance_factor=maximum_distance_factor,
-                                                         minimum_angle_factor=minimum_angle_factor)
+                                                         minimum_angle_factor=minimum_angle_factor,
+                                                         nproc=nproc)
         logging.info('DetailedVoronoiContainer has been set up')
 
-        ce_list = []
-        skipped = []
-        logging.info('Computing structure environments')
-        tse1 = time.clock()
+        ce_list = [None] * len(self.structure)
+        done_isites = set()
+        # Parameters the environments depend on. A checkpoint file written with other parameters is ignored.
+        self._checkpoint_parameters = {'sites_indices': [int(isite) for isite in sites_indices],
+                                       'valences': (self.valences if self.valences == 'undefined'
+                                                    else [float(val) for val in self.valences]),
+                                       'max_cn': max_cn,
+                                       'maximum_distance_factor': maximum_distance_factor,
+                                       'minimum_angle_factor': minimum_angle_factor,
+                                       'centering_type': self.centering_type,
+                                       'include_central_site_in_centroid': self.include_central_site_in_centroid,
+                                       'bva_distance_scale_factor': self.bva_distance_scale_factor}
+        if checkpoint_file is not None:
+            done_isites = self._load_checkpoint(checkpoint_file, ce_list)
+            if len(done_isites) > 0:
+                logging.info('Resuming from checkpoint file "{}" ({:d} sites already '
+                             'computed)'.format(checkpoint_file, len(done_isites)))
+        todo_isites = [isite for isite in sites_indices if isite not in done_isites]
         for isite in range(len(self.structure)):
             if isite not in sites_indices:
                 logging.info(' ... in site #{:d} ({}) : skipped'.format(isite, self.structure[isite].species_string))
-                skipped.append(isite)
-                ce_list.append(None)
-                continue
-            logging.info(' ... in site #{:d} ({})'.format(isite, self.structure[isite].species_string))
-            t1 = time.clock()
-            coords = self.detailed_voronoi.unique_coordinations(isite)
-
-            ce_dict = {}
-            for cn in coords:
-                if max_cn is not None and cn > max_cn:
-                    continue
-                ce_dict[cn] = []
-                for i_nlist, nlist_tuple in enumerate(coords[cn]):
-                    neighb_list = nlist_tuple[0]
-                    ce = ChemicalEnvironments()
-                    mycoords = [st.coords for st in neighb_list]
-                    self.setup_local_geometry(isite, coords=mycoords)
-                    cncgsm = self.get_coordination_symmetry_measures()
-                    for cg in cncgsm:
-
-                        other_csms = {'csm_wocs_ctwocc': cncgsm[cg]['csm_wocs_ctwocc'],
-                                      'csm_wocs_ctwcc': cncgsm[cg]['csm_wocs_ctwcc'],
-                                      'csm_wocs_csc': cncgsm[cg]['csm_wocs_csc'],
-                                      'csm_wcs_ctwocc': cncgsm[cg]['csm_wcs_ctwocc'],
-                                      'csm_wcs_ctwcc': cncgsm[cg]['csm_wcs_ctwcc'],
-                                      'csm_wcs_csc': cncgsm[cg]['csm_wcs_csc'],}
-                        ce.add_coord_geom(cg, cncgsm[cg]['csm'], algo=cncgsm[cg]['algo'],
-                                          permutation=cncgsm[cg]['indices'],
-                                          local2perfect_map=cncgsm[cg]['local2perfect_map'],
-                                          perfect2local_map=cncgsm[cg]['perfect2local_map'],
-                                          detailed_voronoi_index={'cn': cn, 'index': i_nlist},
-                                          other_symmetry_measures=other_csms
-                                          )
-                    ce_dict[cn].append(ce)
-            t2 = time.clock()
-            logging.info('    ... computed in {:.2f} seconds'.format(t2-t1))
-            ce_list.append(ce_dict)
+
+        logging.info('Computing structure environments')
+        tse1 = time.clock()
+        if nproc is not None and nproc > 1:
+            pool = Pool(nproc, initializer=_init_site_environments_worker, initargs=(self, max_cn))
+            try:
+                site_results = pool.imap_unordered(_site_environments_worker, todo_isites)
+                self._collect_site_environments(site_results, ce_list, checkpoint_file, checkpoint_interval)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            site_results = ((isite, self.compute_site_environments(isite, max_cn=max_cn)) for isite in todo_isites)
+            self._collect_site_environments(site_results, ce_list, checkpoint_file, checkpoint_interval)
         tse2 = time.clock()
         logging.info('Structure environments computed in {:.2f} seconds'.format(tse2-tse1))
         return StructureEnvironments(self.detailed_voronoi, self.valences, self.sites_map, self.equivalent_sites,
                                      ce_list, self.structure)
 
+    def compute_site_environments(self, isite, max_cn=None):
+        """
+        Computes the chemical environments of one site for all the unique coordinations found by the detailed
+        voronoi analysis. The detailed voronoi container has to be set up beforehand (this is done in the
+        compute_structure_environments_detailed_voronoi method).
+        :param isite: Index of the site in the structure
+        :param max_cn: Maximum coordination number for which the environments are computed
+        :return: Dictionary with the coordination numbers as keys and the lists of ChemicalEnvironments as values
+        """
+        logging.info(' ... in site #{:d} ({})'.format(isite, self.structure[isite].species_string))
+        t1 = time.clock()
+        coords = self.detailed_voronoi.unique_coordinations(isite)
+
+        ce_dict = {}
+        for cn in coords:
+            if max_cn is not None and cn > max_cn:
+                continue
+            ce_dict[cn] = []
+            for i_nlist, nlist_tuple in enumerate(coords[cn]):
+                neighb_list = nlist_tuple[0]
+                ce = ChemicalEnvironments()
+                mycoords = [st.coords for st in neighb_list]
+                self.setup_local_geometry(isite, coords=mycoords)
+                cncgsm = self.get_coordination_symmetry_measures()
+                for cg in cncgsm:
+
+                    other_csms = {'csm_wocs_ctwocc': cncgsm[cg]['csm_wocs_ctwocc'],
+                                  'csm_wocs_ctwcc': cncgsm[cg]['csm_wocs_ctwcc'],
+                                  'csm_wocs_csc': cncgsm[cg]['csm_wocs_csc'],
+                                  'csm_wcs_ctwocc': cncgsm[cg]['csm_wcs_ctwocc'],
+                                  'csm_wcs_ctwcc': cncgsm[cg]['csm_wcs_ctwcc'],
+                                  'csm_wcs_csc': cncgsm[cg]['csm_wcs_csc'],}
+                    ce.add_coord_geom(cg, cncgsm[cg]['csm'], algo=cncgsm[cg]['algo'],
+                                      permutation=cncgsm[cg]['indices'],
+                                      local2perfect_map=cncgsm[cg]['local2perfect_map'],
+                                      perfect2local_map=cncgsm[cg]['perfect2local_map'],
+                                      detailed_voronoi_index={'cn': cn, 'index': i_nlist},
+                                      other_symmetry_measures=other_csms
+                                      )
+                ce_dict[cn].append(ce)
+        t2 = time.clock()
+        logging.info('    ... computed in {:.2f} seconds'.format(t2-t1))
+        return ce_dict
+
+    def _collect_site_environments(self, site_results, ce_list, checkpoint_file, checkpoint_interval):
+        """
+        Stores the (isite, ce_dict) results in ce_list as they come and writes the checkpoint file every
+        checkpoint_interval sites (and once at the end) if a checkpoint file is given.
+        """
+        ndone = 0
+        for isite, ce_dict in site_results:
+            ce_list[isite] = ce_dict
+            ndone += 1
+            if checkpoint_file is not None and ndone % checkpoint_interval == 0:
+                self._write_checkpoint(checkpoint_file, ce_list)
+        if checkpoint_file is not None and ndone > 0:
+            self._write_checkpoint(checkpoint_file, ce_list)
+
+    def _write_checkpoint(self, checkpoint_file, ce_list):
+        """
+        Writes the chemical environments computed so far to the checkpoint file. The file is first written to a
+        temporary file and then moved so that an interrupted run never leaves a corrupted checkpoint behind.
+        """
+        computed = {str(isite): {str(cn): [ce.as_dict() for ce in ce_dict[cn]] for cn in ce_dict}
+                    for isite, ce_dict in enumerate(ce_list) if ce_dict is not None}
+        tmp_file = '{}.tmp'.format(checkpoint_file)
+        with open(tmp_file, 'w') as f:
+            json.dump({'structure': self.structure.as_dict(), 'parameters': self._checkpoint_parameters,
+                       'ce_list': computed}, f)
+        if os.path.exists(checkpoint_file):
+            os.remove(checkpoint_file)
+        os.rename(tmp_file, checkpoint_file)
+
+    def _load_checkpoint(self, checkpoint_file, ce_list):
+        """
+        Fills ce_list with the chemical environments found in the checkpoint file, if it exists and corresponds to
+        the current structure and parameters (sites, valences, max_cn, distance and angle factors, ...).
+        :return: Set of the indices of the sites that have been loaded from the checkpoint file
+        """
+        if not os.path.exists(checkpoint_file):
+            return set()
+        with open(checkpoint_file, 'r') as f:
+            dd = json.load(f)
+        if Structure.from_dict(dd['structure']) != self.structure:
+            logging.warning('Checkpoint file "{}" corresponds to another structure, '
+                            'it is ignored'.format(checkpoint_file))
+            return set()
+        # Compare the json representations (tuples become lists, ...)
+        if dd.get('parameters') != json.loads(json.dumps(self._checkpoint_parameters)):
+            logging.warning('Checkpoint file "{}" has been computed with other parameters, '
+                            'it is ignored'.format(checkpoint_file))
+            return set()
+        done_isites = set()
+        for isite, ce_dict in dd['ce_list'].items():
+            ce_list[int(isite)] = {int(cn): [ChemicalEnvironments.from_dict(ced) for ced in ce_dict[cn]]
+                                   for cn in ce_dict}
+            done_isites.add(int(isite))
+        return done_isites
+
     def setup_local_geometry(self, isite, coords):
         """
         Sets up the AbstractGeometry for the local geometry of site with index isite.
@@ -69,6 +69,78 @@ class ReadWriteChemenvTest(unittest.TestCase):
         self.assertEqual(light_se._neighbors, light_se2._neighbors)
         self.assertEqual(light_se, light_se2)
 
+    def test_parallel_and_checkpoint(self):
+        f = open("{}/{}".format(json_files_dir, 'test_T--4_FePO4_icsd_4266.json'), 'r')
+        dd = json.load(f)
+        f.close()
+
+        atom_indices = dd['atom_indices']
+
+        struct = Structure.from_dict(dd['structure'])
+        self.lgf.setup_structure(struct)
+        se = self.lgf.compute_structure_environments_detailed_voronoi(only_indices=atom_indices,
+                                                                      maximum_distance_factor=2.25)
+        se_parallel = self.lgf.compute_structure_environments_detailed_voronoi(only_indices=atom_indices,
+                                                                               maximum_distance_factor=2.25,
+                                                                               nproc=2)
+        self.assertSameEnvironments(se, se_parallel)
+
+        checkpoint_file = 'tmp_dir/se_checkpoint.json'
+        se_checkpoint = self.lgf.compute_structure_environments_detailed_voronoi(only_indices=atom_indices,
+                                                                                 maximum_distance_factor=2.25,
+                                                                                 checkpoint_file=checkpoint_file,
+                                                                                 checkpoint_interval=1)
+        self.assertSameEnvironments(se, se_checkpoint)
+        self.assertTrue(os.path.exists(checkpoint_file))
+
+        # Resuming from the checkpoint file: the sites already computed are not computed again
+        computed_isites = []
+        compute_site_environments = self.lgf.compute_site_environments
+
+        def counting_compute_site_environments(isite, max_cn=None):
+            computed_isites.append(isite)
+            return compute_site_environments(isite, max_cn=max_cn)
+
+        self.lgf.compute_site_environments = counting_compute_site_environments
+        try:
+            se_resumed = self.lgf.compute_structure_environments_detailed_voronoi(only_indices=atom_indices,
+                                                                                  maximum_distance_factor=2.25,
+                                                                                  checkpoint_file=checkpoint_file)
+        finally:
+            del self.lgf.compute_site_environments
+        self.assertEqual(computed_isites, [])
+        self.assertEqual(se_checkpoint, se_resumed)
+
+        # The checkpoint file is ignored when the parameters are different
+        self.lgf.compute_site_environments = counting_compute_site_environments
+        try:
+            se_other = self.lgf.compute_structure_environments_detailed_voronoi(only_indices=atom_indices,
+                                                                                maximum_distance_factor=2.0,
+                                                                                checkpoint_file=checkpoint_file)
+        finally:
+            del self.lgf.compute_site_environments
+        self.assertEqual(sorted(computed_isites), sorted(atom_indices))
+        se = self.lgf.compute_structure_environments_detailed_voronoi(only_indices=atom_indices,
+                                                                      maximum_distance_factor=2.0)
+        self.assertSameEnvironments(se, se_other)
+
+    def assertSameEnvironments(self, se1, se2):
+        # The search of the best permutations involves some randomness: the algorithm leading to a given
+        # symmetry measure may differ from one run to the other, but not the symmetry measures themselves
+        self.assertEqual(se1.voronoi, se2.voronoi)
+        self.assertEqual(len(se1.ce_list), len(se2.ce_list))
+        for ce_dict1, ce_dict2 in zip(se1.ce_list, se2.ce_list):
+            if ce_dict1 is None:
+                self.assertIsNone(ce_dict2)
+                continue
+            self.assertEqual(sorted(ce_dict1.keys()), sorted(ce_dict2.keys()))
+            for cn in ce_dict1:
+                for ce1, ce2 in zip(ce_dict1[cn], ce_dict2[cn]):
+                    self.assertEqual(sorted(ce1.coord_geoms.keys()), sorted(ce2.coord_geoms.keys()))
+                    for mp_symbol in ce1.coord_geoms:
+                        self.assertAlmostEqual(ce1[mp_symbol]['symmetry_measure'],
+                                               ce2[mp_symbol]['symmetry_measure'])
+
     @classmethod
     def tearDownClass(cls):
         #Remove the directory in which the temporary files have been created
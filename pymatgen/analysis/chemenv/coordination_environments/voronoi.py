@@ -22,6 +22,7 @@ from operator import attrgetter
 import logging
 import numpy as np
 import time
+from multiprocessing import Pool
 from pyhull.voronoi import VoronoiTess
 from pymatgen.core.structure import Structure
 from pymatgen.core.sites import PeriodicSite
@@ -55,6 +56,53 @@ def from_bson_voronoi_list(bson_nb_voro_list, structure):
     return voronoi_list
 
 
+def _get_site_voronoi(args):
+    """
+    Computes the Voronoi polyhedron of one site. Defined at the module level so that it can be sent to the worker
+    processes of a multiprocessing Pool.
+    :param args: Tuple (isite, site, site_neighbors) where site_neighbors is the list of (PeriodicSite, distance,
+    index) tuples of the neighbors of the site, as returned by Structure.get_all_neighbors with include_index=True
+    :return: List of (PeriodicSite, dict) tuples for the neighbors sharing a facet with the site
+    :raise RuntimeError: If an infinite vertex is found in the voronoi construction
+    """
+    isite, site, site_neighbors = args
+    neighbors1 = [(site, 0.0, isite)]
+    neighbors1.extend(site_neighbors)
+    neighbors1 = sorted(neighbors1, key=lambda s: s[1])
+    distances = [i[1] for i in neighbors1]
+    neighbors = [i[0] for i in neighbors1]
+    indices = [i[2] for i in neighbors1]
+    qvoronoi_input = [s.coords for s in neighbors]
+    voro = VoronoiTess(qvoronoi_input)
+    all_vertices = voro.vertices
+
+    results = []
+    maxangle = 0.0
+    mindist = 10000.0
+    for nn, vind in list(voro.ridges.items()):
+        if 0 in nn:
+            if 0 in vind:
+                raise RuntimeError("This structure is pathological,"
+                                   " infinite vertex in the voronoi "
+                                   "construction")
+
+            facets = [all_vertices[i] for i in vind]
+            try:
+                sa = solid_angle(site.coords, facets)
+            except ValueError:
+                sa = my_solid_angle(site.coords, facets)
+            maxangle = max([sa, maxangle])
+            mindist = min([mindist, distances[nn[1]]])
+            results.append((neighbors[nn[1]],
+                            {'angle': sa,
+                             'distance': distances[nn[1]],
+                             'index': indices[nn[1]]}))
+    for (nn, dd) in results:
+        dd['weighted_angle'] = dd['angle'] / maxangle
+        dd['weighted_distance'] = dd['distance'] / mindist
+    return results
+
+
 class DetailedVoronoiContainer(MSONable):
     """
     Class used to store the full Voronoi of a given structure.
@@ -67,7 +115,7 @@ class DetailedVoronoiContainer(MSONable):
                  voronoi_cutoff=default_voronoi_cutoff, isites=None,
                  weighted_distance_tolerance=1e-5, weighted_angle_tolerance=1e-3,
                  additional_conditions=None, valences=None,
-                 maximum_distance_factor=None, minimum_angle_factor=None):
+                 maximum_distance_factor=None, minimum_angle_factor=None, nproc=None):
         """
         Constructor for the VoronoiContainer object. Either a structure is given, in which case the Voronoi is
         computed, or the different components of the VoronoiContainer are given (used in the from_dict method)
@@ -76,6 +124,7 @@ class DetailedVoronoiContainer(MSONable):
         :param neighbors_list: list of neighbors for each site
         :param voronoi_cutoff: cutoff used for the voronoi
         :param isites: indices of sites for which the Voronoi has to be computed
+        :param nproc: number of processes used to compute the Voronoi of the different sites
         :raise: RuntimeError if the Voronoi cannot be constructed
         """
         self.weighted_distance_tolerance = weighted_distance_tolerance
@@ -96,7 +145,7 @@ class DetailedVoronoiContainer(MSONable):
         if voronoi_list is not None:
             self.voronoi_list = voronoi_list
         else:
-            self.setup_voronoi_list(indices=indices, voronoi_cutoff=voronoi_cutoff)
+            self.setup_voronoi_list(indices=indices, voronoi_cutoff=voronoi_cutoff, nproc=nproc)
         logging.info('Setting neighbors distances and angles')
         t1 = time.clock()
         self.setup_neighbors_distances_and_angles(indices=indices)
@@ -112,11 +161,13 @@ class DetailedVoronoiContainer(MSONable):
         t2 = time.clock()
         logging.info('Unique coordinations set up in {:.2f} seconds'.format(t2-t1))
 
-    def setup_voronoi_list(self, indices, voronoi_cutoff):
+    def setup_voronoi_list(self, indices, voronoi_cutoff, nproc=None):
         """
         Set up of the voronoi list of neighbours by calling qhull
         :param indices: indices of the sites for which the Voronoi is needed
         :param voronoi_cutoff: Voronoi cutoff for the search of neighbours
+        :param nproc: Number of processes over which the sites are distributed. If None or 1, the sites are
+        processed serially in the current process
         :raise RuntimeError: If an infinite vertex is found in the voronoi construction
         """
         self.voronoi_list = [None] * len(self.structure)
@@ -125,46 +176,21 @@ class DetailedVoronoiContainer(MSONable):
         t1 = time.clock()
         logging.info('Setting up Voronoi list :')
 
-        for jj, isite in enumerate(indices):
-            logging.info('  - Voronoi analysis for site #{:d} ({:d}/{:d})'.format(isite, jj+1, len(indices)))
-            site = self.structure[isite]
-            neighbors1 = [(site, 0.0, isite)]
-            neighbors1.extend(struct_neighbors[isite])
-            distances = [i[1] for i in sorted(neighbors1, key=lambda s: s[1])]
-            neighbors = [i[0] for i in sorted(neighbors1, key=lambda s: s[1])]
-            qvoronoi_input = [s.coords for s in neighbors]
-            voro = VoronoiTess(qvoronoi_input)
-            all_vertices = voro.vertices
-
-            results = []
-            maxangle = 0.0
-            mindist = 10000.0
-            for nn, vind in list(voro.ridges.items()):
-                if 0 in nn:
-                    if 0 in vind:
-                        raise RuntimeError("This structure is pathological,"
-                                           " infinite vertex in the voronoi "
-                                           "construction")
-
-                    facets = [all_vertices[i] for i in vind]
-                    try:
-                        sa = solid_angle(site.coords, facets)
-                    except ValueError:
-                        sa = my_solid_angle(site.coords, facets)
-                    maxangle = max([sa, maxangle])
-                    mindist = min([mindist, distances[nn[1]]])
-                    for iii, sss in enumerate(self.structure):
-                        if neighbors[nn[1]].is_periodic_image(sss):
-                            myindex = iii
-                            break
-                    results.append((neighbors[nn[1]],
-                                    {'angle': sa,
-                                     'distance': distances[nn[1]],
-                                     'index': myindex}))
-            for (nn, dd) in results:
-                dd['weighted_angle'] = dd['angle'] / maxangle
-                dd['weighted_distance'] = dd['distance'] / mindist
-            self.voronoi_list[isite] = results
+        if nproc is not None and nproc > 1:
+            args = [(isite, self.structure[isite], struct_neighbors[isite]) for isite in indices]
+            pool = Pool(nproc)
+            try:
+                all_results = pool.map(_get_site_voronoi, args, chunksize=max(1, len(args) // (4 * nproc)))
+            finally:
+                pool.close()
+                pool.join()
+            for isite, results in zip(indices, all_results):
+                self.voronoi_list[isite] = results
+        else:
+            for jj, isite in enumerate(indices):
+                logging.info('  - Voronoi analysis for site #{:d} ({:d}/{:d})'.format(isite, jj+1, len(indices)))
+                self.voronoi_list[isite] = _get_site_voronoi((isite, self.structure[isite],
+                                                              struct_neighbors[isite]))
         t2 = time.clock()
         logging.info('Voronoi list set up in {:.2f} seconds'.format(t2-t1))
 
@@ -36,6 +36,7 @@ from monty.json import MSONable
 
 from pymatgen.analysis.structure_matcher import StructureMatcher, OrderDisorderElementComparator
 from pymatgen.core import Structure, get_el_sp
+from pymatgen.core.trajectory import Trajectory
 from pymatgen.io.vasp.outputs import Vasprun
 from pymatgen.util.coord_utils import pbc_diff
 
@@ -109,7 +110,7 @@ class DiffusionAnalyzer(MSONable):
 
     def __init__(self, structure, displacements, specie, temperature,
                  time_step, step_skip, smoothed="max", min_obs=30,
-                 avg_nsteps=1000):
+                 avg_nsteps=1000, use_fft=True):
         """
         This constructor is meant to be used with pre-processed data.
         Other convenient constructors are provided as class methods (see
@@ -160,6 +161,12 @@ class DiffusionAnalyzer(MSONable):
             avg_nsteps (int): Used with smoothed="constant". Determines the
                 number of time steps to average over to get the msd for each
                 timestep. Default of 1000 is usually pretty good.
+            use_fft (bool): Used with smoothed="max". Whether to compute the
+                mean square displacements for all time lags at once using
+                FFTs (Wiener-Khinchin theorem), which scales as
+                O(nsteps log nsteps) per ion instead of O(nsteps) per ion and
+                time lag, with bounded memory. Gives the same results as the
+                direct computation (use_fft=False) up to rounding errors.
         """
         self.structure = structure
         self.disp = displacements
@@ -212,29 +219,37 @@ class DiffusionAnalyzer(MSONable):
             dt = timesteps * self.time_step * self.step_skip
 
             #calculate the smoothed msd values
-            msd = np.zeros_like(dt, dtype=np.double)
-            sq_disp_ions = np.zeros((len(dc), len(dt)), dtype=np.double)
-            msd_components = np.zeros(dt.shape + (3,))
-
             lengths = np.array(self.structure.lattice.abc)[None, None, :]
 
-            for i, n in enumerate(timesteps):
-                if not smoothed:
-                    dx = dc[:, i:i + 1, :]
-                    dcomponents = df[:, i:i + 1, :] * lengths
-                elif smoothed == "constant":
-                    dx = dc[:, i:i + avg_nsteps, :] - dc[:, 0:avg_nsteps, :]
-                    dcomponents = (df[:, i:i + avg_nsteps, :]
-                                   - df[:, 0:avg_nsteps, :]) * lengths
-                else:
-                    dx = dc[:, n:, :] - dc[:, :-n, :]
-                    dcomponents = (df[:, n:, :] - df[:, :-n, :]) * lengths
-                sq_disp = dx ** 2
-                sq_disp_ions[:, i] = np.average(np.sum(sq_disp, axis=2), axis=1)
-                msd[i] = np.average(sq_disp_ions[:, i][indices])
-
-                msd_components[i] = np.average(dcomponents[indices] ** 2,
-                                               axis=(0, 1))
+            if smoothed == "max" and use_fft:
+                sq_disp_ions = np.sum(get_sq_disp_fft(dc, timesteps), axis=2)
+                msd = np.average(sq_disp_ions[indices], axis=0)
+                msd_components = np.average(
+                    get_sq_disp_fft(df[indices] * lengths, timesteps), axis=0)
+            else:
+                msd = np.zeros_like(dt, dtype=np.double)
+                sq_disp_ions = np.zeros((len(dc), len(dt)), dtype=np.double)
+                msd_components = np.zeros(dt.shape + (3,))
+
+                for i, n in enumerate(timesteps):
+                    if not smoothed:
+                        dx = dc[:, i:i + 1, :]
+                        dcomponents = df[:, i:i + 1, :] * lengths
+                    elif smoothed == "constant":
+                        dx = dc[:, i:i + avg_nsteps, :] - \
+                            dc[:, 0:avg_nsteps, :]
+                        dcomponents = (df[:, i:i + avg_nsteps, :]
+                                       - df[:, 0:avg_nsteps, :]) * lengths
+                    else:
+                        dx = dc[:, n:, :] - dc[:, :-n, :]
+                        dcomponents = (df[:, n:, :] - df[:, :-n, :]) * lengths
+                    sq_disp = dx ** 2
+                    sq_disp_ions[:, i] = np.average(np.sum(sq_disp, axis=2),
+                                                    axis=1)
+                    msd[i] = np.average(sq_disp_ions[:, i][indices])
+
+                    msd_components[i] = np.average(dcomponents[indices] ** 2,
+                                                   axis=(0, 1))
 
             def weighted_lstsq(a, b):
                 if smoothed == "max":
@@ -507,20 +522,41 @@ class DiffusionAnalyzer(MSONable):
                 initial strcture from which the current set of displacements
                 are computed.
         """
-        p = []
-        for i, s in enumerate(structures):
-            if i == 0:
-                structure = s
-            p.append(np.array(s.frac_coords)[:, None])
-
-        if initial_structure is not None:
-            p.insert(0, np.array(initial_structure.frac_coords)[:, None])
-        else:
-            p.insert(0, p[0])
-        p = np.concatenate(p, axis=1)
-        dp = p[:, 1:] - p[:, :-1]
-        dp = dp - np.round(dp)
-        f_disp = np.cumsum(dp, axis=1)
+        return cls.from_trajectory(
+            Trajectory.from_structures(structures), specie, temperature,
+            time_step, step_skip, smoothed=smoothed, min_obs=min_obs,
+            avg_nsteps=avg_nsteps, initial_disp=initial_disp,
+            initial_structure=initial_structure)
+
+    @classmethod
+    def from_trajectory(cls, trajectory, specie, temperature, time_step,
+                        step_skip, smoothed="max", min_obs=30,
+                        avg_nsteps=1000, initial_disp=None,
+                        initial_structure=None):
+        """
+        Convenient constructor that takes in a Trajectory to perform
+        diffusion analysis. The displacements are computed directly from the
+        fractional coordinates array of the trajectory, without creating a
+        Structure for each frame.
+
+        Args:
+            trajectory (Trajectory): Trajectory of the run, e.g. from
+                Xdatcar.trajectory, Vasprun.get_trajectory() or
+                LammpsRun.get_trajectory().
+            specie (Element/Specie): Specie to calculate diffusivity for as a
+                String. E.g., "Li".
+            temperature (float): Temperature of the diffusion run in Kelvin.
+            time_step (int): Time step between measurements.
+            step_skip (int): Sampling frequency of the displacements (
+                time_step is multiplied by this number to get the real time
+                between measurements)
+
+            For the other parameters, see from_structures.
+        """
+        structure = trajectory[0]
+        f_disp = trajectory.get_frac_displacements(
+            None if initial_structure is None
+            else initial_structure.frac_coords)
         if initial_disp is not None:
             f_disp += structure.lattice.get_fractional_coords(initial_disp)[:,
                                                               None, :]
@@ -584,31 +620,8 @@ class DiffusionAnalyzer(MSONable):
                 are computed.
         """
 
-        def get_structures(vaspruns):
-            for i, vr in enumerate(vaspruns):
-                if i == 0:
-                    step_skip = vr.ionic_step_skip or 1
-                    final_structure = vr.initial_structure
-                    temperature = vr.parameters['TEEND']
-                    time_step = vr.parameters['POTIM']
-                    yield step_skip, temperature, time_step
-                #check that the runs are continuous
-                fdist = pbc_diff(vr.initial_structure.frac_coords,
-                                 final_structure.frac_coords)
-                if np.any(fdist > 0.001):
-                    raise ValueError('initial and final structures do not '
-                                     'match.')
-                final_structure = vr.final_structure
-
-                assert (vr.ionic_step_skip or 1) == step_skip
-                for s in vr.ionic_steps:
-                    yield s['structure']
-
-        s = get_structures(vaspruns)
-        step_skip, temperature, time_step = next(s)
-
-        return cls.from_structures(structures=s, specie=specie,
-            temperature=temperature, time_step=time_step, step_skip=step_skip,
+        return cls._from_segments(
+            (_get_vasprun_segment(vr) for vr in vaspruns), specie=specie,
             smoothed=smoothed, min_obs=min_obs, avg_nsteps=avg_nsteps,
             initial_disp=initial_disp, initial_structure=initial_structure)
 
@@ -675,26 +688,96 @@ class DiffusionAnalyzer(MSONable):
         if ncores is not None and len(filepaths) > 1:
             import multiprocessing
             p = multiprocessing.Pool(ncores)
-            vaspruns = p.imap(_get_vasprun,
-                             [(fp, step_skip) for fp in filepaths])
-            analyzer = cls.from_vaspruns(vaspruns, min_obs=min_obs,
-                smoothed=smoothed, specie=specie, initial_disp=initial_disp,
-                initial_structure=initial_structure, avg_nsteps=avg_nsteps)
-            p.close()
-            p.join()
-            return analyzer
+            try:
+                # The workers only send back the coordinates arrays.
+                segments = p.imap(_get_vasprun_segment_from_file,
+                                  [(fp, step_skip, 0) for fp in filepaths])
+                return cls._from_segments(
+                    segments, specie=specie, smoothed=smoothed,
+                    min_obs=min_obs, avg_nsteps=avg_nsteps,
+                    initial_disp=initial_disp,
+                    initial_structure=initial_structure)
+            finally:
+                p.close()
+                p.join()
         else:
-            def vr(filepaths):
+            def segments(filepaths):
                 offset = 0
                 for p in filepaths:
-                    v = Vasprun(p, ionic_step_offset=offset,
-                                ionic_step_skip=step_skip)
-                    yield v
+                    segment = _get_vasprun_segment_from_file(
+                        (p, step_skip, offset))
+                    yield segment
                     # Recompute offset.
-                    offset = (-(v.nionic_steps - offset)) % step_skip
-            return cls.from_vaspruns(vr(filepaths), min_obs=min_obs,
-                smoothed=smoothed, specie=specie, initial_disp=initial_disp,
-                initial_structure=initial_structure, avg_nsteps=avg_nsteps)
+                    offset = (-(segment["nionic_steps"] - offset)) % \
+                        step_skip
+            return cls._from_segments(
+                segments(filepaths), specie=specie, smoothed=smoothed,
+                min_obs=min_obs, avg_nsteps=avg_nsteps,
+                initial_disp=initial_disp,
+                initial_structure=initial_structure)
+
+    @classmethod
+    def _from_segments(cls, segments, specie, smoothed="max", min_obs=30,
+                       avg_nsteps=1000, initial_disp=None,
+                       initial_structure=None):
+        """
+        Performs the diffusion analysis from consecutive segments of a run
+        (see _get_vasprun_segment). The displacements are unwrapped
+        incrementally, so that only one segment is held in memory at a time
+        in addition to the displacements.
+        """
+        disp_segments = []
+        structure = None
+        final_frac_coords = None
+        for segment in segments:
+            frac_coords = np.transpose(segment["frac_coords"], (1, 0, 2))
+            if final_frac_coords is None:
+                step_skip = segment["step_skip"]
+                temperature = segment["temperature"]
+                time_step = segment["time_step"]
+            else:
+                #check that the runs are continuous
+                fdist = pbc_diff(segment["initial_frac_coords"],
+                                 final_frac_coords)
+                if np.any(fdist > 0.001):
+                    raise ValueError('initial and final structures do not '
+                                     'match.')
+                assert segment["step_skip"] == step_skip
+            final_frac_coords = segment["final_frac_coords"]
+            if frac_coords.shape[1] == 0:
+                continue
+
+            if structure is None:
+                # First ionic step of the run, leading empty segments are
+                # skipped.
+                structure = Structure(segment["lattice"], segment["species"],
+                                      frac_coords[:, 0])
+                if initial_structure is not None:
+                    prev_coords = np.array(initial_structure.frac_coords)
+                else:
+                    prev_coords = frac_coords[:, 0]
+                prev_disp = np.zeros(prev_coords.shape)
+
+            dp = np.concatenate([prev_coords[:, None], frac_coords], axis=1)
+            dp = dp[:, 1:] - dp[:, :-1]
+            dp = dp - np.round(dp)
+            f_disp = np.cumsum(dp, axis=1) + prev_disp[:, None]
+            disp_segments.append(f_disp)
+            prev_coords = frac_coords[:, -1]
+            prev_disp = f_disp[:, -1]
+
+        if structure is None:
+            raise ValueError("No ionic steps in the runs.")
+
+        f_disp = np.concatenate(disp_segments, axis=1)
+        if initial_disp is not None:
+            f_disp += structure.lattice.get_fractional_coords(initial_disp)[:,
+                                                              None, :]
+        disp = structure.lattice.get_cartesian_coords(f_disp)
+
+        return cls(structure, disp, specie, temperature,
+                   time_step, step_skip=step_skip, smoothed=smoothed,
+                   min_obs=min_obs, avg_nsteps=avg_nsteps)
 
     def as_dict(self):
         return {
@@ -751,12 +834,80 @@ def get_conversion_factor(structure, species, temperature):
         / (const.R * temperature)
 
 
-def _get_vasprun(args):
+def get_sq_disp_fft(x, lags, max_size=2 ** 22):
+    """
+    Computes the square displacements averaged over all time origins for a
+    set of time lags, using the FFT based algorithm of Kneller et al. (nMOLDYN,
+    Comput. Phys. Commun. 1995, 91, 191-214). For each time lag n, this gives
+    the same result as np.average((x[:, n:] - x[:, :-n]) ** 2, axis=1), but
+    all time lags are obtained in O(nsteps log nsteps) operations per ion.
+
+    Args:
+        x (np.ndarray): Positions or displacements as a nions x nsteps x dim
+            array.
+        lags ([int]): Time lags (in number of steps) to return.
+        max_size (int): Maximum number of elements of the intermediate arrays.
+            Ions are processed in chunks to limit memory usage.
+
+    Returns:
+        nions x len(lags) x dim array of the time averaged square
+        displacements.
+    """
+    lags = np.asarray(lags, dtype=int)
+    nions, nsteps, dim = x.shape
+    # Number of time origins for each lag.
+    norigins = (nsteps - lags)[None, :, None]
+    nfft = 2 * nsteps
+    chunk_size = max(1, max_size // (nfft * dim))
+    sq_disp = np.zeros((nions, len(lags), dim))
+    for start in range(0, nions, chunk_size):
+        # Removing the average position does not change the displacements,
+        # but improves the numerical accuracy of the autocorrelation.
+        r = x[start:start + chunk_size]
+        r = r - np.average(r, axis=1)[:, None, :]
+        # Sum over time origins of r(t) ** 2 + r(t + n) ** 2.
+        cum_sq = np.cumsum(r ** 2, axis=1)
+        total_sq = cum_sq[:, -1:, :]
+        cum_sq = np.concatenate([np.zeros_like(total_sq), cum_sq], axis=1)
+        s1 = cum_sq[:, nsteps - lags] + total_sq - cum_sq[:, lags]
+        # Sum over time origins of r(t) * r(t + n), from the inverse
+        # transform of the power spectrum.
+        f = np.fft.rfft(r, n=nfft, axis=1)
+        s2 = np.fft.irfft(f * f.conjugate(), n=nfft, axis=1)[:, lags]
+        sq_disp[start:start + chunk_size] = (s1 - 2 * s2) / norigins
+    return sq_disp
+
+
+def _get_vasprun_segment(vasprun):
+    """
+    Extracts the data needed for diffusion analysis from a Vasprun as a
+    dict of numpy arrays and numbers, so that the Vasprun can be discarded.
+    """
+    structures = [step["structure"] for step in vasprun.ionic_steps]
+    initial = vasprun.initial_structure
+    return {
+        "frac_coords": np.array([s.frac_coords for s in structures]).reshape(
+            (len(structures), len(initial), 3)),
+        "initial_frac_coords": initial.frac_coords,
+        "final_frac_coords": vasprun.final_structure.frac_coords,
+        "lattice": (structures[0] if structures else initial).lattice.matrix,
+        "species": initial.species,
+        "step_skip": vasprun.ionic_step_skip or 1,
+        "temperature": vasprun.parameters['TEEND'],
+        "time_step": vasprun.parameters['POTIM'],
+        "nionic_steps": vasprun.nionic_steps}
+
+
+def _get_vasprun_segment_from_file(args):
     """
-    Internal method to support multiprocessing.
+    Internal method to support multiprocessing. Parses a vasprun.xml file and
+    returns the data needed for diffusion analysis (see
+    _get_vasprun_segment), instead of the full Vasprun.
     """
-    return Vasprun(args[0], ionic_step_skip=args[1],
-                   parse_dos=False, parse_eigen=False)
+    filepath, step_skip, offset = args
+    return _get_vasprun_segment(Vasprun(
+        filepath, ionic_step_skip=step_skip, ionic_step_offset=offset,
+        parse_dos=False, parse_eigen=False, parse_potcar_file=False))
 
 
 def fit_arrhenius(temps, diffusivities):
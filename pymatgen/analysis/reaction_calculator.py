@@ -495,14 +495,18 @@ class ComputedReaction(Reaction):
         self._reactant_entries = reactant_entries
         self._product_entries = product_entries
         self._all_entries = reactant_entries + product_entries
-        reactant_comp = set([e.composition
-                             .get_reduced_composition_and_factor()[0]
-                             for e in reactant_entries])
-        product_comp = set([e.composition
-                            .get_reduced_composition_and_factor()[0]
-                            for e in product_entries])
-        super(ComputedReaction, self).__init__(list(reactant_comp),
-                                               list(product_comp))
+        # Distinct reduced compositions, keyed by their reduced formula (the
+        # hash of the compositions only depends on the elements).
+        reactant_comp = {e.composition.reduced_formula:
+                         e.composition.reduced_composition
+                         for e in reactant_entries}
+        product_comp = {e.composition.reduced_formula:
+                        e.composition.reduced_composition
+                        for e in product_entries}
+        # Sorted so that the order of the compositions in the reaction does
+        # not depend on the order of the entries.
+        super(ComputedReaction, self).__init__(
+            sorted(reactant_comp.values()), sorted(product_comp.values()))
 
     @property
     def all_entries(self):
@@ -26,6 +26,7 @@ from warnings import warn
 from scipy.spatial import Voronoi
 from pymatgen import PeriodicSite
 from pymatgen import Element, Specie, Composition
+from pymatgen.symmetry.analyzer import SpacegroupAnalyzer
 from pymatgen.util.num_utils import abs_cap
 
 
@@ -129,6 +130,73 @@ class VoronoiCoordFinder(object):
                 coordinated_sites.append(site)
         return coordinated_sites
 
+    def get_all_voronoi_polyhedra(self, symprec=None):
+        """
+        Gives the weighted polyhedra around all the sites of the structure.
+
+        Args:
+            symprec (float): If not None, the polyhedra are only computed for
+                one site of each group of symmetrically equivalent sites,
+                determined by SpacegroupAnalyzer with this tolerance. The
+                polyhedra of the other sites are obtained by applying the
+                symmetry operations to the neighbors, which are then mapped
+                onto the sites of the structure and their periodic images.
+
+        Returns:
+            A list of dicts of sites sharing a common Voronoi facet with
+            each site and their solid angle weights (see
+            get_voronoi_polyhedra).
+        """
+        structure = self._structure
+        lattice = structure.lattice
+        # Same fractional coordinates as the sites of get_sites_in_sphere.
+        site_fcoords = np.mod(structure.frac_coords, 1)
+
+        def transform(polyhedra, op):
+            if not polyhedra:
+                return {}
+            neighbors = list(polyhedra.keys())
+            fcoords = lattice.get_fractional_coords(
+                op.operate_multi([nn.coords for nn in neighbors]))
+            # Closest site of the structure and image of this site.
+            indices = np.argmin(
+                lattice.get_all_distances(fcoords, site_fcoords), axis=1)
+            fcoords = site_fcoords[indices] + np.round(
+                fcoords - site_fcoords[indices])
+            return {PeriodicSite(structure[i].species_and_occu, f, lattice,
+                                 properties=structure[i].properties):
+                    polyhedra[nn]
+                    for nn, i, f in zip(neighbors, indices, fcoords)}
+
+        return _map_equivalent_sites(self._structure,
+                                     self.get_voronoi_polyhedra, symprec,
+                                     transform)
+
+    def get_all_coordination_numbers(self, symprec=None):
+        """
+        Returns the coordination numbers of all the sites of the structure.
+
+        Args:
+            symprec (float): If not None, the coordination numbers are only
+                computed for one site of each group of symmetrically
+                equivalent sites, determined by SpacegroupAnalyzer with this
+                tolerance.
+        """
+        return _map_equivalent_sites(self._structure,
+                                     self.get_coordination_number, symprec)
+
+
+def _map_equivalent_sites(structure, func, symprec, transform=None):
+    """
+    Evaluates func for all the site indices of structure. If symprec is not
+    None, see SymmetrizedStructure.map_equivalent_sites.
+    """
+    if symprec is None:
+        return [func(i) for i in range(len(structure))]
+    symm_structure = SpacegroupAnalyzer(
+        structure, symprec).get_symmetrized_structure()
+    return symm_structure.map_equivalent_sites(func, transform)
+
 
 def average_coordination_number(structures, freq=10):
     """
@@ -1286,6 +1354,42 @@ class OrderParameters(object):
                              " order-parameter calculation out-of-bounds!")
         return self._paras[index]
 
+    def get_all_order_parameters(self, structure, tol=0.0, target_spec=None,
+                                 symprec=None):
+        """
+        Compute all order parameters of all the sites of a structure.
+
+        Args:
+            structure (Structure):
+                input structure.
+            tol (float):
+                threshold of weight to determine if a particular pair is
+                considered neighbors (see get_order_parameters).
+            target_spec (Specie):
+                target specie to be considered when calculating the order
+                parameters (see get_order_parameters).
+            symprec (float):
+                if not None, the order parameters are only computed for one
+                site of each group of symmetrically equivalent sites,
+                determined by SpacegroupAnalyzer with this tolerance.  The
+                order parameters are invariant under rotations, so that the
+                other sites of the group get the same values.  The exception
+                is the "bcc" order parameter, which depends on the order of
+                the neighbors in environments that are not bcc-like: if
+                "bcc" is one of the types, all the sites are computed.
+
+        Returns:
+            list of lists of floats representing the order parameters of
+            each site.
+        """
+        if "bcc" in self._types:
+            symprec = None
+        return _map_equivalent_sites(
+            structure,
+            lambda n: self.get_order_parameters(
+                structure, n, tol=tol, target_spec=target_spec),
+            symprec, lambda ops, symmop: list(ops))
+
     def get_order_parameters(self, structure, n, indeces_neighs=[], \
                              tol=0.0, target_spec=None):
 
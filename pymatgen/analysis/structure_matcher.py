@@ -23,7 +23,8 @@ from pymatgen.core.composition import Composition
 
 from pymatgen.core.periodic_table import get_el_sp
 from pymatgen.optimization.linear_assignment import LinearAssignment
-from pymatgen.util.coord_utils_cython import pbc_shortest_vectors, is_coord_subset_pbc, det3x3
+from pymatgen.util.coord_utils_cython import pbc_shortest_vectors, is_coord_subset_pbc, det3x3, \
+    find_subset_translations
 from pymatgen.util.coord_utils import lattice_points_in_supercell
 
 __author__ = "William Davidson Richards, Stephen Dacek, Shyue Ping Ong"
@@ -486,6 +487,36 @@ class StructureMatcher(MSONable):
 
         return new_d2 ** 0.5 * normalization, f_translation, s
 
+    @staticmethod
+    def _nn_dists_match(s1, s2, avg_lattice, frac_tol):
+        """
+        Cheap test used to reject a lattice before testing all the
+        translations. If the sites of s2 can be matched one to one to the
+        sites of s1 within frac_tol, the sorted distances from each site to
+        its nearest neighbor in the same set differ by at most twice the
+        largest cartesian displacement allowed by frac_tol. Used with the
+        sites of the species that can only be matched to each other.
+
+        Args:
+            s1, s2: numpy arrays of fractional coordinates with len(s1) ==
+                len(s2)
+            avg_lattice: Lattice on which to calculate distances
+            frac_tol: fractional tolerance in each direction
+
+        Returns:
+            False if no one to one matching within frac_tol can exist.
+        """
+        if len(s1) < 2:
+            return True
+        nn_dists = []
+        for fc in (s1, s2):
+            fc = fc - np.floor(fc)
+            d2 = pbc_shortest_vectors(avg_lattice, fc, fc, return_d2=True)[1]
+            np.fill_diagonal(d2, np.inf)
+            nn_dists.append(np.sort(np.min(d2, axis=1)) ** 0.5)
+        tol = 2 * np.dot(frac_tol, avg_lattice.abc) + 1e-8
+        return np.all(np.abs(nn_dists[0] - nn_dists[1]) <= tol)
+
     def _get_mask(self, struct1, struct2, fu, s1_supercell):
         """
         Returns mask for matching struct2 to struct1. If struct1 has sites
@@ -495,20 +526,18 @@ class StructureMatcher(MSONable):
         Returns:
         mask, struct1 translation indices, struct2 translation index
         """
-        mask = np.zeros((len(struct2), len(struct1), fu), dtype=np.bool)
-
-        inner = []
-        for sp2, i in itertools.groupby(enumerate(struct2.species_and_occu),
-                                        key=lambda x: x[1]):
-            i = list(i)
-            inner.append((sp2, slice(i[0][0], i[-1][0]+1)))
+        def unique_species(species):
+            # the comparator is only called for each pair of unique species,
+            # even if the sites are not sorted by species
+            uniq = {}
+            inds = [uniq.setdefault(sp, len(uniq)) for sp in species]
+            return sorted(uniq, key=uniq.get), np.array(inds, dtype=np.int_)
 
-        for sp1, j in itertools.groupby(enumerate(struct1.species_and_occu),
-                                        key=lambda x: x[1]):
-            j = list(j)
-            j = slice(j[0][0], j[-1][0]+1)
-            for sp2, i in inner:
-                mask[i, j, :] = not self._comparator.are_equal(sp1, sp2)
+        sp1s, inds1 = unique_species(struct1.species_and_occu)
+        sp2s, inds2 = unique_species(struct2.species_and_occu)
+        neq = np.array([[not self._comparator.are_equal(sp1, sp2)
+                         for sp1 in sp1s] for sp2 in sp2s], dtype=np.bool)
+        mask = np.repeat(neq[inds2][:, inds1][:, :, None], fu, axis=2)
 
         if s1_supercell:
             mask = mask.reshape((len(struct2), -1))
@@ -668,6 +697,16 @@ class StructureMatcher(MSONable):
         if LinearAssignment(mask).min_cost > 0:
             return None
 
+        # The translations are rejected at the first site of struct2 without
+        # a match, so the sites with the fewest allowed matches come first.
+        order = np.argsort(-np.sum(mask, axis=-1), kind="mergesort")
+        ordered_mask = mask[order]
+        # sites of the most restrictive species, used to reject lattices
+        s2_group = np.where(np.all(mask == mask[s2_t_ind], axis=-1))[0]
+        s1_group = np.where(mask[s2_t_ind] == 0)[0]
+        test_nn = mask.shape[0] == mask.shape[1] and \
+            len(s1_group) == len(s2_group) > 1
+
         best_match = None
         # loop over all lattices
         for s1fc, s2fc, avg_l, sc_m in \
@@ -676,23 +715,33 @@ class StructureMatcher(MSONable):
             normalization = (len(s1fc) / avg_l.volume) ** (1/3)
             inv_abc = np.array(avg_l.reciprocal_lattice.abc)
             frac_tol = inv_abc * self.stol / (np.pi * normalization)
-            # loop over all translations
-            for s1i in s1_t_inds:
-                t = s1fc[s1i] - s2fc[s2_t_ind]
+            if test_nn and not self._nn_dists_match(
+                    s1fc[s1_group], s2fc[s2_group], avg_l, frac_tol):
+                continue
+            # test all the translations at once
+            translations = s1fc[s1_t_inds] - s2fc[s2_t_ind]
+            t_inds = find_subset_translations(s2fc[order], s1fc, translations,
+                                              frac_tol, ordered_mask)
+            if test_nn and len(t_inds):
+                # with a one to one matching, the sites of s1 must also all
+                # be close to a site of s2
+                t_inds = t_inds[find_subset_translations(
+                    s1fc, s2fc, -translations[t_inds], frac_tol, mask.T)]
+            for ti in t_inds:
+                t = translations[ti]
                 t_s2fc = s2fc + t
-                if self._cmp_fstruct(s1fc, t_s2fc, frac_tol, mask):
-                    dist, t_adj, mapping = self._cart_dists(
-                        s1fc, t_s2fc, avg_l, mask, normalization, frac_tol)
-                    if use_rms:
-                        val = np.linalg.norm(dist) / len(dist) ** 0.5
-                    else:
-                        val = max(dist)
-                    if best_match is None or val < best_match[0]:
-                        total_t = t + t_adj
-                        total_t -= np.round(total_t)
-                        best_match = val, dist, sc_m, total_t, mapping
-                        if (break_on_match or val < 1e-5) and val < self.stol:
-                            return best_match
+                dist, t_adj, mapping = self._cart_dists(
+                    s1fc, t_s2fc, avg_l, mask, normalization, frac_tol)
+                if use_rms:
+                    val = np.linalg.norm(dist) / len(dist) ** 0.5
+                else:
+                    val = max(dist)
+                if best_match is None or val < best_match[0]:
+                    total_t = t + t_adj
+                    total_t -= np.round(total_t)
+                    best_match = val, dist, sc_m, total_t, mapping
+                    if (break_on_match or val < 1e-5) and val < self.stol:
+                        return best_match
 
         if best_match and best_match[0] < self.stol:
             return best_match
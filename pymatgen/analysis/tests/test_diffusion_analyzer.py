@@ -25,8 +25,9 @@ import numpy as np
 import scipy.constants as const
 
 from pymatgen.analysis.diffusion_analyzer import DiffusionAnalyzer,\
-    get_conversion_factor, fit_arrhenius
+    get_conversion_factor, fit_arrhenius, get_sq_disp_fft
 from pymatgen.core.structure import Structure
+from pymatgen.core.trajectory import Trajectory
 from pymatgen.util.testing import PymatgenTest
 
 test_dir = os.path.join(os.path.dirname(__file__), "..", "..", "..",
@@ -63,6 +64,15 @@ class FuncTest(unittest.TestCase):
         self.assertAlmostEqual(r2[1], 10)
         self.assertEqual(r2[2], None)
 
+    def test_get_sq_disp_fft(self):
+        x = np.cumsum(np.random.randn(5, 300, 3), axis=1)
+        lags = [1, 2, 10, 150, 299]
+        sq_disp = get_sq_disp_fft(x, lags, max_size=2000)
+        self.assertEqual(sq_disp.shape, (5, 5, 3))
+        for i, n in enumerate(lags):
+            self.assertTrue(np.allclose(
+                sq_disp[:, i], np.average((x[:, n:] - x[:, :-n]) ** 2, axis=1)))
+
 
 class DiffusionAnalyzerTest(PymatgenTest):
 
@@ -137,6 +147,15 @@ class DiffusionAnalyzerTest(PymatgenTest):
             self.assertAlmostEqual(d.conductivity, 74.165372613735684, 4)
             self.assertAlmostEqual(d.diffusivity, 1.14606446822e-06, 7)
 
+            d_direct = DiffusionAnalyzer(
+                d.structure, d.disp, d.specie, d.temperature, d.time_step,
+                d.step_skip, smoothed="max", use_fft=False)
+            self.assertArrayAlmostEqual(d.msd, d_direct.msd)
+            self.assertArrayAlmostEqual(d.msd_components,
+                                        d_direct.msd_components)
+            self.assertArrayAlmostEqual(d.sq_disp_ions, d_direct.sq_disp_ions)
+            self.assertAlmostEqual(d.diffusivity, d_direct.diffusivity, 12)
+
             d = DiffusionAnalyzer(d.structure, d.disp, d.specie, d.temperature,
                                   d.time_step, d.step_skip, smoothed=False)
             self.assertAlmostEqual(d.conductivity, 27.20479170406027, 4)
@@ -162,5 +181,55 @@ class DiffusionAnalyzerTest(PymatgenTest):
             self.assertAlmostEqual(d.conductivity, 47.404056230438741, 4)
             self.assertAlmostEqual(d.diffusivity, 7.4226016496716148e-07, 7)
 
+            traj = Trajectory.from_structures(
+                d.get_drift_corrected_structures())
+            d2 = DiffusionAnalyzer.from_trajectory(
+                traj, d.specie, d.temperature, d.time_step, d.step_skip,
+                d.smoothed, avg_nsteps=100)
+            self.assertArrayAlmostEqual(d2.disp, d.disp)
+            self.assertAlmostEqual(d2.diffusivity, d.diffusivity, 12)
+
+    def test_from_vaspruns(self):
+        with open(os.path.join(test_dir, "DiffusionAnalyzer.json")) as f:
+            d = DiffusionAnalyzer.from_dict(json.load(f))
+        structures = list(d.get_drift_corrected_structures())
+
+        class FakeVasprun(object):
+            # The parts of a MD Vasprun used by DiffusionAnalyzer.
+            def __init__(self, structures, initial_structure):
+                self.ionic_steps = [{"structure": s} for s in structures]
+                self.initial_structure = initial_structure
+                self.final_structure = structures[-1] if structures \
+                    else initial_structure
+                self.ionic_step_skip = d.step_skip
+                self.nionic_steps = len(structures)
+                self.parameters = {"TEEND": d.temperature,
+                                   "POTIM": d.time_step}
+
+        vaspruns = [FakeVasprun(structures[:300], structures[0]),
+                    FakeVasprun(structures[300:700], structures[299]),
+                    FakeVasprun(structures[700:], structures[699])]
+        d1 = DiffusionAnalyzer.from_vaspruns(vaspruns, d.specie,
+                                             smoothed=False)
+        d2 = DiffusionAnalyzer.from_structures(
+            structures, d.specie, d.temperature, d.time_step, d.step_skip,
+            smoothed=False)
+        self.assertArrayAlmostEqual(d1.disp, d2.disp)
+        self.assertAlmostEqual(d1.diffusivity, d2.diffusivity, 12)
+
+        # Runs without ionic steps, including the first one, are skipped
+        vaspruns = [FakeVasprun([], structures[0])] + vaspruns[:2] + \
+            [FakeVasprun([], structures[699])] + vaspruns[2:]
+        d3 = DiffusionAnalyzer.from_vaspruns(vaspruns, d.specie,
+                                             smoothed=False)
+        self.assertArrayAlmostEqual(d3.disp, d2.disp)
+        self.assertEqual(d3.structure, d2.structure)
+        self.assertRaises(ValueError, DiffusionAnalyzer.from_vaspruns,
+                          vaspruns[:1], d.specie, smoothed=False)
+
+        vaspruns[2].initial_structure = structures[0]
+        self.assertRaises(ValueError, DiffusionAnalyzer.from_vaspruns,
+                          vaspruns, d.specie, smoothed=False)
+
 if __name__ == '__main__':
     unittest.main()
@@ -37,6 +37,23 @@ class VoronoiCoordFinderTest(PymatgenTest):
     def test_get_coordinated_sites(self):
         self.assertEqual(len(self.finder.get_coordinated_sites(0)), 8)
 
+    def test_symmetry_reduced(self):
+        s = self.get_structure('LiFePO4')
+        s.add_site_property("charge", [{"Li": 1, "Fe": 2, "P": 5, "O": -2}[
+            site.specie.symbol] for site in s])
+        finder = VoronoiCoordFinder(s, [Element("O")])
+        polyhedra = finder.get_all_voronoi_polyhedra()
+        reduced = finder.get_all_voronoi_polyhedra(symprec=0.01)
+        self.assertEqual(len(reduced), len(polyhedra))
+        for p1, p2 in zip(polyhedra, reduced):
+            self.assertEqual(len(p1), len(p2))
+            for site, weight in p1.items():
+                # The neighbors are the same sites, properties included.
+                self.assertAlmostEqual(p2[site], weight, 2)
+        self.assertArrayAlmostEqual(
+            self.finder.get_all_coordination_numbers(),
+            self.finder.get_all_coordination_numbers(symprec=0.01), 2)
+
 
 class VoronoiAnalysisTest(PymatgenTest):
 
@@ -338,6 +355,22 @@ class OrderParametersTest(PymatgenTest):
         with self.assertRaises(ValueError):
             ops_101.get_order_parameters(self.bcc, 0, indeces_neighs=[2])
 
+    def test_get_all_order_parameters(self):
+        ops = OrderParameters(["cn", "tet", "oct", "q2", "q4", "q6"],
+                              [[], [], [], [], [], []], 0.71)
+        for s in [self.fcc, self.hcp, self.diamond]:
+            op_vals = ops.get_all_order_parameters(s)
+            self.assertEqual(len(op_vals), len(s))
+            reduced = ops.get_all_order_parameters(s, symprec=0.01)
+            # None values, if any, become nan
+            self.assertArrayAlmostEqual(np.array(reduced, dtype=float),
+                                        np.array(op_vals, dtype=float), 4)
+        # The "bcc" parameter is computed for all the sites.
+        ops = OrderParameters(["cn", "bcc"], [[], []], 0.71)
+        for s in [self.fcc, self.hcp, self.diamond]:
+            self.assertEqual(ops.get_all_order_parameters(s, symprec=0.01),
+                             ops.get_all_order_parameters(s))
+
 
     def tearDown(self):
         del self.cubic
@@ -37,6 +37,13 @@ from monty.json import MSONable
 
 logger = logging.getLogger(__name__)
 
+# Vasprun attributes that are not available (or incomplete) when only the
+# summary of the vasprun.xml is parsed.
+_FULL_PARSE_ATTRIBUTES = {"ionic_steps", "structures", "tdos", "idos", "pdos",
+                          "complete_dos", "dos_has_errors", "eigenvalues",
+                          "projected_eigenvalues", "eigenvalue_band_properties",
+                          "get_trajectory"}
+
 
 class AbstractDrone(six.with_metaclass(abc.ABCMeta, MSONable)):
     """
@@ -116,6 +123,10 @@ class VaspToComputedEntryDrone(AbstractDrone):
         if parameters:
             self._parameters.update(parameters)
         self._data = data if data else []
+        # The summary parse mode of Vasprun is much faster and is used unless
+        # some of the requested properties need the full vasprun.xml.
+        self._summary_only = not _FULL_PARSE_ATTRIBUTES.intersection(
+            self._parameters.union(self._data))
 
     def assimilate(self, path):
         files = os.listdir(path)
@@ -148,7 +159,7 @@ class VaspToComputedEntryDrone(AbstractDrone):
                     filepath = fname
 
         try:
-            vasprun = Vasprun(filepath)
+            vasprun = Vasprun(filepath, summary_only=self._summary_only)
         except Exception as ex:
             logger.debug("error in {}: {}".format(filepath, ex))
             return None
@@ -20,12 +20,15 @@ __date__ = "Mar 18, 2012"
 
 import os
 import json
+import time
+import sqlite3
 import logging
 
+from contextlib import closing
 from monty.io import zopen
 from monty.json import MontyEncoder, MontyDecoder
 
-from multiprocessing import Manager, Pool
+from multiprocessing import Pool
 
 logger = logging.getLogger("BorgQueen")
 
@@ -36,6 +39,11 @@ class BorgQueen(object):
     directory tree. Uses multiprocessing to speed up things considerably. It
     also contains convenience methods to save and load data between sessions.
 
+    The assimilated data can be streamed to a JSON lines file or to a SQLite
+    database (see parallel_assimilate) instead of being kept in memory. In
+    this case, the paths that have already been assimilated and did not
+    change since are skipped when the assimilation is run again.
+
     Args:
         drone (Drone): An implementation of
             :class:`pymatgen.apps.borg.hive.AbstractDrone` to use for
@@ -49,59 +57,134 @@ class BorgQueen(object):
             will definitely see a significant speedup of at least 50% or so.
             If you are running this over a server with far more processors,
             the speedup will be even greater.
+        output_file (str): If not None, the assimilated data is written to
+            this file instead of being kept in memory. Filenames ending with
+            .db or .sqlite are SQLite databases, filenames containing .jsonl
+            are JSON lines files (with gzip or bz2 compression if the
+            filename ends with gz or bz2). Other filenames raise a
+            ValueError.
     """
 
-    def __init__(self, drone, rootpath=None, number_of_drones=1):
+    def __init__(self, drone, rootpath=None, number_of_drones=1,
+                 output_file=None):
         self._drone = drone
         self._num_drones = number_of_drones
         self._data = []
 
         if rootpath:
             if number_of_drones > 1:
-                self.parallel_assimilate(rootpath)
+                self.parallel_assimilate(rootpath, output_file=output_file)
             else:
-                self.serial_assimilate(rootpath)
+                self.serial_assimilate(rootpath, output_file=output_file)
+
+    def get_valid_paths(self, rootpath, nprocs=1):
+        """
+        Returns the valid paths for the drone in the entire subdirectory
+        structure in rootpath.
 
-    def parallel_assimilate(self, rootpath):
+        Args:
+            rootpath (str): The root directory.
+            nprocs (int): Number of processes. With more than one process,
+                the top-level subdirectories are walked in parallel.
         """
-        Assimilate the entire subdirectory structure in rootpath.
+        parent, subdirs, files = next(os.walk(rootpath))
+        valid_paths = list(self._drone.get_valid_paths((parent, subdirs,
+                                                        files)))
+        args = [(self._drone, os.path.join(parent, d)) for d in subdirs]
+        if nprocs > 1 and len(args) > 1:
+            p = Pool(min(nprocs, len(args)))
+            try:
+                results = p.map(_get_valid_paths, args)
+            finally:
+                p.close()
+                p.join()
+        else:
+            results = map(_get_valid_paths, args)
+        for paths in results:
+            valid_paths.extend(paths)
+        return valid_paths
+
+    def parallel_assimilate(self, rootpath, output_file=None):
         """
-        logger.info('Scanning for valid paths...')
-        valid_paths = []
-        for (parent, subdirs, files) in os.walk(rootpath):
-            valid_paths.extend(self._drone.get_valid_paths((parent, subdirs,
-                                                            files)))
-        manager = Manager()
-        data = manager.list()
-        status = manager.dict()
-        status['count'] = 0
-        status['total'] = len(valid_paths)
-        logger.info('{} valid paths found.'.format(len(valid_paths)))
-        p = Pool(self._num_drones)
-        p.map(order_assimilation, ((path, self._drone, data, status)
-                                   for path in valid_paths))
-        for d in data:
-            self._data.append(json.loads(d, cls=MontyDecoder))
-
-    def serial_assimilate(self, rootpath):
+        Assimilate the entire subdirectory structure in rootpath using a pool
+        of number_of_drones processes.
+
+        Args:
+            rootpath (str): The root directory to start assimilation.
+            output_file (str): If not None, the data is written to this file
+                (JSON lines or SQLite database) as soon as each path is
+                assimilated and the paths already present in output_file
+                are skipped if they did not change. Use load_data to read
+                the data.
+        """
+        self._assimilate(rootpath, output_file, self._num_drones)
+
+    def serial_assimilate(self, rootpath, output_file=None):
         """
         Assimilate the entire subdirectory structure in rootpath serially.
+
+        Args:
+            rootpath (str): The root directory to start assimilation.
+            output_file (str): See parallel_assimilate.
         """
-        valid_paths = []
-        for (parent, subdirs, files) in os.walk(rootpath):
-            valid_paths.extend(self._drone.get_valid_paths((parent, subdirs,
-                                                            files)))
-        data = []
-        count = 0
-        total = len(valid_paths)
-        for path in valid_paths:
-            newdata = self._drone.assimilate(path)
-            self._data.append(newdata)
-            count += 1
-            logger.info('{}/{} ({:.2f}%) done'.format(count, total,
-                                                      count / total * 100))
-        for d in data:
-            self._data.append(json.loads(d, cls=MontyDecoder))
+        self._assimilate(rootpath, output_file, 1)
+
+    def _assimilate(self, rootpath, output_file, nprocs):
+        # Check output_file before walking the directory tree.
+        sink = _get_sink(output_file) if output_file is not None else None
+        p = None
+        try:
+            logger.info('Scanning for valid paths...')
+            valid_paths = self.get_valid_paths(rootpath, nprocs)
+            logger.info('{} valid paths found.'.format(len(valid_paths)))
+
+            p = Pool(nprocs) if nprocs > 1 else None
+            if sink is not None:
+                # The mtimes are only needed to skip the paths already
+                # assimilated in output_file.
+                old_mtimes = sink.get_mtimes()
+                mtimes = p.map(_get_mtime, valid_paths) if p is not None \
+                    else [_get_mtime(path) for path in valid_paths]
+                args = [(path, mtime, self._drone)
+                        for path, mtime in zip(valid_paths, mtimes)
+                        if old_mtimes.get(path) != mtime]
+                if len(args) < len(valid_paths):
+                    logger.info('{} paths already assimilated.'.format(
+                        len(valid_paths) - len(args)))
+            else:
+                args = [(path, None, self._drone) for path in valid_paths]
+
+            total = len(args)
+            t0 = time.time()
+            if p is not None:
+                results = p.imap_unordered(_order_assimilation, args,
+                                           chunksize=4)
+            elif sink is not None:
+                results = (_order_assimilation(a) for a in args)
+            else:
+                # No need to go through JSON when the data stays in memory.
+                results = ((a[0], a[1], self._drone.assimilate(a[0]))
+                           for a in args)
+            for count, (path, mtime, d) in enumerate(results, 1):
+                if sink is not None:
+                    sink.write(path, mtime, d)
+                elif d is not None:
+                    self._data.append(json.loads(d, cls=MontyDecoder)
+                                      if p is not None else d)
+                rate = count / max(time.time() - t0, 1e-6)
+                logger.info('{}/{} ({:.2f}%) done, {:.2f} paths/s'.format(
+                    count, total, count / total * 100, rate))
+        finally:
+            if p is not None:
+                p.close()
+                p.join()
+            if sink is not None:
+                sink.close()
+
+        if total:
+            dt = time.time() - t0
+            logger.info('Assimilated {} paths in {:.1f} s ({:.2f} paths/s)'
+                        .format(total, dt, total / max(dt, 1e-6)))
 
     def get_data(self):
         """
@@ -125,20 +208,166 @@ class BorgQueen(object):
 
     def load_data(self, filename):
         """
-        Load assimilated data from a file
+        Load assimilated data from a file. JSON lines files and SQLite
+        databases written by parallel_assimilate are supported as well.
         """
-        with zopen(filename, "rt") as f:
-            self._data = json.load(f, cls=MontyDecoder)
+        if _is_sqlite_file(filename) or _is_jsonlines_file(filename):
+            sink = _get_sink(filename)
+            try:
+                decoder = MontyDecoder()
+                self._data = [decoder.process_decoded(d)
+                              for d in sink.get_data()]
+            finally:
+                sink.close()
+        else:
+            with zopen(filename, "rt") as f:
+                self._data = json.load(f, cls=MontyDecoder)
 
 
-def order_assimilation(args):
+def _is_sqlite_file(filename):
+    return filename.endswith(".db") or filename.endswith(".sqlite")
+
+
+def _is_jsonlines_file(filename):
+    return ".jsonl" in os.path.basename(filename)
+
+
+def _get_sink(filename):
+    if _is_sqlite_file(filename):
+        return _SQLiteSink(filename)
+    if _is_jsonlines_file(filename):
+        return _JSONLinesSink(filename)
+    raise ValueError("Unsupported output file {}: use a .jsonl, .db or "
+                     ".sqlite file.".format(filename))
+
+
+class _JSONLinesSink(object):
     """
-    Internal helper method for BorgQueen to process assimilation
+    JSON lines file with one record per assimilated path. A path assimilated
+    again is appended and the last record wins.
     """
-    (path, drone, data, status) = args
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._fh = None
+
+    def _iter_records(self):
+        if not os.path.exists(self.filename):
+            return
+        with zopen(self.filename, "rt") as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        # Incomplete line written by an interrupted run.
+                        logger.warning("Skipping invalid line in {}".format(
+                            self.filename))
+
+    def get_mtimes(self):
+        return {r["path"]: r["mtime"] for r in self._iter_records()}
+
+    def get_data(self):
+        records = {}
+        for r in self._iter_records():
+            records[r["path"]] = r["data"]
+        return [d for d in records.values() if d is not None]
+
+    def write(self, path, mtime, data):
+        if self._fh is None:
+            self._fh = zopen(self.filename, "at")
+        # data is already a JSON string.
+        self._fh.write('{{"path": {}, "mtime": {}, "data": {}}}\n'.format(
+            json.dumps(path), json.dumps(mtime),
+            "null" if data is None else data))
+        self._fh.flush()
+
+    def close(self):
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+class _SQLiteSink(object):
+    """
+    SQLite database with one row per assimilated path.
+    """
+
+    def __init__(self, filename):
+        self.conn = sqlite3.connect(filename)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS assimilated (path TEXT "
+                          "PRIMARY KEY, mtime REAL, data TEXT)")
+        self._nwrites = 0
+
+    def get_mtimes(self):
+        return dict(self.conn.execute("SELECT path, mtime FROM assimilated"))
+
+    def get_data(self):
+        return [json.loads(r[0]) for r in self.conn.execute(
+            "SELECT data FROM assimilated WHERE data IS NOT NULL")]
+
+    def write(self, path, mtime, data):
+        self.conn.execute("INSERT OR REPLACE INTO assimilated VALUES "
+                          "(?, ?, ?)", (path, mtime, data))
+        self._nwrites += 1
+        if self._nwrites % 100 == 0:
+            self.conn.commit()
+
+    def close(self):
+        with closing(self.conn):
+            self.conn.commit()
+
+
+def _get_mtime(path):
+    """
+    Returns the most recent modification time of path and of all the files
+    and directories inside path.
+    """
+    mtime = os.path.getmtime(path)
+    if os.path.isdir(path):
+        for parent, subdirs, files in os.walk(path):
+            for f in subdirs + files:
+                try:
+                    mtime = max(mtime, os.path.getmtime(
+                        os.path.join(parent, f)))
+                except OSError:
+                    pass
+    return mtime
+
+
+def _get_valid_paths(args):
+    """
+    Internal helper method for BorgQueen to find the valid paths in a
+    directory tree.
+    """
+    drone, rootpath = args
+    valid_paths = []
+    for (parent, subdirs, files) in os.walk(rootpath):
+        valid_paths.extend(drone.get_valid_paths((parent, subdirs, files)))
+    return valid_paths
+
+
+def _order_assimilation(args):
+    """
+    Internal helper method for BorgQueen to process assimilation. Returns
+    the path, its mtime and the assimilated data as a JSON string.
+    """
+    (path, mtime, drone) = args
     newdata = drone.assimilate(path)
     if newdata:
-        data.append(json.dumps(newdata, cls=MontyEncoder))
+        return path, mtime, json.dumps(newdata, cls=MontyEncoder)
+    return path, mtime, None
+
+
+def order_assimilation(args):
+    """
+    Internal helper method for BorgQueen to process assimilation. Kept for
+    backward compatibility, BorgQueen now uses _order_assimilation.
+    """
+    (path, drone, data, status) = args
+    newdata = _order_assimilation((path, None, drone))[2]
+    if newdata is not None:
+        data.append(newdata)
     status['count'] += 1
     count = status['count']
     total = status['total']
@@ -18,9 +18,11 @@ __date__ = "Mar 18, 2012"
 
 import unittest2 as unittest
 import os
+import shutil
+import tempfile
 
 from pymatgen.apps.borg.hive import VaspToComputedEntryDrone
-from pymatgen.apps.borg.queen import BorgQueen
+from pymatgen.apps.borg.queen import BorgQueen, order_assimilation
 
 test_dir = os.path.join(os.path.dirname(__file__), "..", "..", "..", "..",
                         'test_files')
@@ -42,6 +44,50 @@ class BorgQueenTest(unittest.TestCase):
         queen.load_data(os.path.join(test_dir, "assimilated.json"))
         self.assertEqual(len(queen.get_data()), 1)
 
+    def test_output_file(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            for fname in ["assimilated.jsonl", "assimilated.db"]:
+                output_file = os.path.join(tmpdir, fname)
+                drone = VaspToComputedEntryDrone()
+                queen = BorgQueen(drone, test_dir, 2, output_file=output_file)
+                self.assertEqual(len(queen.get_data()), 0)
+                queen.load_data(output_file)
+                self.assertEqual(
+                    sorted(e.energy for e in queen.get_data()),
+                    sorted(e.energy for e in self.queen.get_data()))
+
+                # Paths that did not change are not assimilated again.
+                calls = []
+                drone.assimilate = lambda path: calls.append(path)
+                queen.serial_assimilate(test_dir, output_file=output_file)
+                self.assertEqual(calls, [])
+                queen.load_data(output_file)
+                self.assertEqual(len(queen.get_data()), 4)
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_unsupported_output_file(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            output_file = os.path.join(tmpdir, "assimilated.json")
+            queen = BorgQueen(VaspToComputedEntryDrone())
+            self.assertRaises(ValueError, queen.parallel_assimilate, test_dir,
+                              output_file=output_file)
+            self.assertFalse(os.path.exists(output_file))
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_order_assimilation(self):
+        drone = VaspToComputedEntryDrone()
+        paths = self.queen.get_valid_paths(test_dir)
+        data = []
+        status = {"count": 0, "total": len(paths)}
+        for path in paths:
+            order_assimilation((path, drone, data, status))
+        self.assertEqual(status["count"], len(paths))
+        self.assertEqual(len(data), 4)
+
 if __name__ == "__main__":
     #import sys;sys.argv = ['', 'Test.testName']
     unittest.main()
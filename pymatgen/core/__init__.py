@@ -15,6 +15,7 @@ __date__ = "Dec 15, 2010 7:21:29 PM"
 from .periodic_table import Element, Specie, DummySpecie, get_el_sp
 from .composition import Composition, ChemicalPotential
 from .structure import Structure, IStructure, Molecule, IMolecule
+from .trajectory import Trajectory
 from .bonds import CovalentBond, get_bond_length
 from .lattice import Lattice
 from .sites import Site, PeriodicSite
@@ -29,7 +29,7 @@ from fractions import Fraction
 from functools import total_ordering
 
 from monty.fractions import gcd, lcm
-from pymatgen.core.periodic_table import get_el_sp, Element
+from pymatgen.core.periodic_table import get_el_sp, Element, Specie
 from pymatgen.util.string_utils import formula_double_format
 from monty.json import MSONable
 from pymatgen.core.units import unitized
@@ -118,10 +118,10 @@ class Composition(collections.Hashable, collections.Mapping, MSONable):
         self.allow_negative = kwargs.pop('allow_negative', False)
         # it's much faster to recognize a composition and use the elmap than
         # to pass the composition to dict()
-        if len(args) == 1 and isinstance(args[0], Composition):
-            elmap = args[0]
-        elif len(args) == 1 and isinstance(args[0], six.string_types):
-            elmap = self._parse_formula(args[0])
+        if len(args) == 1 and isinstance(args[0], six.string_types):
+            elmap = _parse_formula_el_sp(args[0])
+        elif len(args) == 1 and isinstance(args[0], Composition):
+            elmap = args[0]._data
         else:
             elmap = dict(*args, **kwargs)
         elamt = {}
@@ -131,9 +131,15 @@ class Composition(collections.Hashable, collections.Mapping, MSONable):
                 raise CompositionError("Amounts in Composition cannot be "
                                        "negative!")
             if abs(v) >= Composition.amount_tolerance:
-                elamt[get_el_sp(k)] = v
+                if not isinstance(k, (Element, Specie)):
+                    k = get_el_sp(k)
+                elamt[k] = v
                 self._natoms += abs(v)
         self._data = elamt
+        # Composition is immutable, so the hash and the reduced formula are
+        # computed on first use and then stored.
+        self._hash = None
+        self._reduced_formula_and_factor = None
 
     def __getitem__(self, item):
         try:
@@ -230,14 +236,28 @@ class Composition(collections.Hashable, collections.Mapping, MSONable):
 
     def __hash__(self):
         """
-        Minimally effective hash function that just distinguishes between
-        Compositions with different elements.
+        Hash based on the set of elements. The amounts are not used since
+        __eq__ compares them within amount_tolerance, and no rounding of the
+        amounts can be consistent with that. Use grouping_key to group many
+        compositions of the same chemical system.
         """
-        hashcode = 0
-        for el, amt in self.items():
-            if abs(amt) > Composition.amount_tolerance:
-                hashcode += el.Z
-        return hashcode
+        if self._hash is None:
+            self._hash = hash(frozenset(
+                el for el, amt in self._data.items()
+                if abs(amt) > Composition.amount_tolerance))
+        return self._hash
+
+    @property
+    def grouping_key(self):
+        """
+        Key to group compositions in dicts or sets, e.g., ("Fe2O3", 2) for
+        Fe4O6. Unlike the hash, it depends on the amounts, so that Fe2O3, FeO
+        and FeO2 do not collide. Compositions with the same key are equal.
+        Equal compositions have the same key, except for non-integer amounts
+        that differ by less than amount_tolerance but are formatted
+        differently in the formula (e.g., S and S1.00000000000001).
+        """
+        return self.get_reduced_formula_and_factor()
 
     @property
     def average_electroneg(self):
@@ -332,6 +352,8 @@ class Composition(collections.Hashable, collections.Mapping, MSONable):
             Li4Fe4P4O16 returns (Composition("LiFePO4"), 4).
         """
         factor = self.get_reduced_formula_and_factor()[1]
+        if factor == 1:
+            return self, factor
         return self / factor, factor
 
     def get_reduced_formula_and_factor(self):
@@ -342,16 +364,30 @@ class Composition(collections.Hashable, collections.Mapping, MSONable):
             A pretty normalized formula and a multiplicative factor, i.e.,
             Li4Fe4P4O16 returns (LiFePO4, 4).
         """
+        if self._reduced_formula_and_factor is not None:
+            return self._reduced_formula_and_factor
         all_int = all(x == int(x) for x in self.values())
         if not all_int:
-            return self.formula.replace(" ", ""), 1
+            self._reduced_formula_and_factor = \
+                self.formula.replace(" ", ""), 1
+            return self._reduced_formula_and_factor
         d = self.get_el_amt_dict()
+        key = frozenset(d.items())
+        try:
+            self._reduced_formula_and_factor = _reduced_formula_cache[key]
+            return self._reduced_formula_and_factor
+        except KeyError:
+            pass
         (formula, factor) = reduce_formula(d)
 
         if formula in Composition.special_formulas:
             formula = Composition.special_formulas[formula]
             factor /= 2
 
+        if len(_reduced_formula_cache) >= _FORMULA_CACHE_SIZE:
+            _reduced_formula_cache.clear()
+        _reduced_formula_cache[key] = formula, factor
+        self._reduced_formula_and_factor = formula, factor
         return formula, factor
 
     def get_integer_formula_and_factor(self, max_denominator=10000):
@@ -447,30 +483,7 @@ class Composition(collections.Hashable, collections.Mapping, MSONable):
         Returns:
             Composition with that formula.
         """
-        def get_sym_dict(f, factor):
-            sym_dict = collections.defaultdict(float)
-            for m in re.finditer(r"([A-Z][a-z]*)([-*\.\d]*)", f):
-                el = m.group(1)
-                amt = 1
-                if m.group(2).strip() != "":
-                    amt = float(m.group(2))
-                sym_dict[el] += amt * factor
-                f = f.replace(m.group(), "", 1)
-            if f.strip():
-                raise CompositionError("{} is an invalid formula!".format(f))
-            return sym_dict
-
-        m = re.search(r"\(([^\(\)]+)\)([\.\d]*)", formula)
-        if m:
-            factor = 1
-            if m.group(2) != "":
-                factor = float(m.group(2))
-            unit_sym_dict = get_sym_dict(m.group(1), factor)
-            expanded_sym = "".join(["{}{}".format(el, amt)
-                                    for el, amt in unit_sym_dict.items()])
-            expanded_formula = formula.replace(m.group(), expanded_sym)
-            return self._parse_formula(expanded_formula)
-        return get_sym_dict(formula, 1)
+        return _parse_formula(formula)
 
     @property
     def anonymized_formula(self):
@@ -590,8 +603,13 @@ class Composition(collections.Hashable, collections.Mapping, MSONable):
                 pass
 
         all_matches = Composition._comps_from_fuzzy_formula(fuzzy_formula)
-        #remove duplicates
-        all_matches = list(set(all_matches))
+        #remove duplicates, keeping the order in which the matches are found
+        #so that the ranking of ties does not depend on hash values
+        unique_matches = []
+        for match in all_matches:
+            if match not in unique_matches:
+                unique_matches.append(match)
+        all_matches = unique_matches
         #sort matches by rank descending
         all_matches = sorted(all_matches,
                              key=lambda match: match[1], reverse=True)
@@ -755,6 +773,73 @@ class Composition(collections.Hashable, collections.Mapping, MSONable):
                         yield match
 
 
+_el_amt_re = re.compile(r"([A-Z][a-z]*)([-*\.\d]*)")
+_paren_re = re.compile(r"\(([^\(\)]+)\)([\.\d]*)")
+
+
+def _parse_formula(formula):
+    """
+    Parses a string formula, e.g. Fe2O3, Li3Fe2(PO4)3, into a {symbol: amount}
+    dict. Parentheses are expanded from the innermost ones outwards.
+
+    Args:
+        formula (str): A string formula.
+
+    Returns:
+        Dict of {symbol: amount}.
+    """
+    def get_sym_dict(f, factor):
+        sym_dict = collections.defaultdict(float)
+        nmatched = 0
+        for m in _el_amt_re.finditer(f):
+            el, amt = m.groups()
+            sym_dict[el] += (float(amt) if amt else 1) * factor
+            nmatched += len(el) + len(amt)
+        # Whitespaces are the only characters allowed outside of the matches
+        if nmatched != len(f) - sum(c.isspace() for c in f):
+            raise CompositionError("{} is an invalid formula!".format(
+                _el_amt_re.sub("", f)))
+        return sym_dict
+
+    m = _paren_re.search(formula)
+    while m:
+        factor = 1
+        if m.group(2) != "":
+            factor = float(m.group(2))
+        unit_sym_dict = get_sym_dict(m.group(1), factor)
+        expanded_sym = "".join(["{}{}".format(el, amt)
+                                for el, amt in unit_sym_dict.items()])
+        formula = formula.replace(m.group(), expanded_sym)
+        m = _paren_re.search(formula)
+    return get_sym_dict(formula, 1)
+
+
+# Caches of the parsed formulas and of the reduced formulas and factors, which
+# are cleared when they reach _FORMULA_CACHE_SIZE items.
+_formula_cache = {}
+_reduced_formula_cache = {}
+_FORMULA_CACHE_SIZE = 100000
+
+
+def _parse_formula_el_sp(formula):
+    """
+    Memoized version of _parse_formula that also converts the symbols to
+    Element/Specie. The same formula strings are parsed over and over when
+    e.g. building phase diagrams, so the results are cached. The returned dict
+    is shared and must not be modified.
+    """
+    try:
+        return _formula_cache[formula]
+    except KeyError:
+        pass
+    if len(_formula_cache) >= _FORMULA_CACHE_SIZE:
+        _formula_cache.clear()
+    elmap = {get_el_sp(sym): amt
+             for sym, amt in _parse_formula(formula).items()}
+    _formula_cache[formula] = elmap
+    return elmap
+
+
 def reduce_formula(sym_amt):
     """
     Helper method to reduce a sym_amt dict to a reduced formula and factor.
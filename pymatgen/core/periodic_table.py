@@ -374,7 +374,23 @@ class Element(Enum):
 
     def __init__(self, symbol):
         self.symbol = "%s" % symbol
-        d = _pt_data[symbol]
+
+    def __getattr__(self, item):
+        # The data of an element is only parsed on the first access to one of
+        # its properties rather than for all elements when the Enum is
+        # created, which makes importing pymatgen much faster.
+        if (item.startswith("_") and item != "_data") or \
+                "_data" in self.__dict__:
+            raise AttributeError(item)
+        self._load_data()
+        return getattr(self, item)
+
+    def _load_data(self):
+        """
+        Parses the data of the element from the periodic table data and sets
+        the corresponding attributes.
+        """
+        d = _pt_data[self.symbol]
 
         # Store key variables for quick access
         self.Z = d["Atomic no"]
@@ -841,6 +857,11 @@ class Specie(MSONable):
             if k not in Specie.supported_properties:
                 raise ValueError("{} is not a supported property".format(k))
 
+    def __getnewargs__(self):
+        # Without this, unpickling calls __new__ without arguments and all
+        # the unpickled Specie end up sharing the same cached instance.
+        return self.symbol, self._oxi_state, self._properties or None
+
     def __getattr__(self, a):
         # overriding getattr doens't play nice with pickle, so we
         # can't use self._properties
@@ -1306,6 +1327,28 @@ def get_el_sp(obj):
     if isinstance(obj, (Element, Specie, DummySpecie)):
         return obj
 
+    try:
+        return _el_sp_cache[obj]
+    except (KeyError, TypeError):
+        pass
+
+    el_sp = _get_el_sp(obj)
+    try:
+        if len(_el_sp_cache) >= 1000:
+            _el_sp_cache.clear()
+        _el_sp_cache[obj] = el_sp
+    except TypeError:
+        # Unhashable input
+        pass
+    return el_sp
+
+
+# Cache of the objects returned by get_el_sp for the inputs that need to be
+# parsed (symbols, species strings, atomic numbers).
+_el_sp_cache = {}
+
+
+def _get_el_sp(obj):
     try:
         c = float(obj)
         i = int(c)
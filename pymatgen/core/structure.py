@@ -891,6 +891,11 @@ class IStructure(SiteCollection, MSONable):
             reverse (bool): If set to True, then the list elements are sorted
                 as if each comparison were reversed.
         """
+        if key is None:
+            # Same order as Site.__lt__, but the electronegativities are
+            # computed once per site instead of once per comparison.
+            key = lambda site: (site.species_and_occu.average_electroneg,
+                                site.species_string)
         sites = sorted(self, key=key, reverse=reverse)
         return self.__class__.from_sites(sites)
 
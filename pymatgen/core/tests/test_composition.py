@@ -130,7 +130,7 @@ class CompositionTest(unittest.TestCase):
                             ["N1 Ca1 Lu1", "U1 Al1 C1 N1"],
                             ["Li1 Co1 P2 N1 O10", "Li1 P2 C1 N1 O11",
                              "Li1 Co1 Po8 N1 O2", "Li1 Po8 C1 N1 O3"],
-                            ["Co2 P4 O4", "Co2 Po4", "P4 C2 O6",
+                            ["Co2 P4 O4", "P4 C2 O6", "Co2 Po4",
                              "Po4 C2 O2"], []]
         for i, c in enumerate(correct_formulas):
             self.assertEqual([Composition(comp) for comp in c],
@@ -278,6 +278,55 @@ class CompositionTest(unittest.TestCase):
         self.assertEqual(comp1.__hash__(), comp2.__hash__(),
                          "Hashcode equality test failed!")
 
+    def test_hash(self):
+        self.assertEqual(hash(Composition({'S': 1})),
+                         hash(Composition({'S': 1.00000000000001})))
+        self.assertEqual(hash(Composition("Li0.5O0.25")),
+                         hash(Composition({'Li': 0.5, 'O': 0.25 + 1e-10})))
+        self.assertEqual(len({Composition("Fe2O3"), Composition("FeO"),
+                              Composition("O3Fe2")}), 2)
+        # Amounts equal within amount_tolerance on both sides of a rounding
+        # edge
+        c1 = Composition({'Fe': 0.004863 - 1e-10, 'O': 1})
+        c2 = Composition({'Fe': 0.004863 + 1e-10, 'O': 1})
+        self.assertEqual(c1, c2)
+        self.assertEqual(hash(c1), hash(c2))
+        self.assertEqual(len({c1, c2}), 1)
+
+    def test_grouping_key(self):
+        comps = [Composition(f) for f in ["Fe2O3", "FeO", "FeO2", "Fe4O6",
+                                          "O3Fe2", "Li0.5O0.25"]]
+        keys = [c.grouping_key for c in comps]
+        self.assertEqual(len(set(keys)), 5)
+        for c1, k1 in zip(comps, keys):
+            for c2, k2 in zip(comps, keys):
+                self.assertEqual(c1 == c2, k1 == k2)
+        self.assertEqual(Composition({'Li': 0.5, 'O': 0.25 + 1e-10})
+                         .grouping_key, Composition("Li0.5O0.25").grouping_key)
+        c1 = Composition({'Fe': 0.004863 - 1e-10, 'O': 1})
+        c2 = Composition({'Fe': 0.004863 + 1e-10, 'O': 1})
+        self.assertEqual(c1.grouping_key, c2.grouping_key)
+
+    def test_cached_reduced_formula(self):
+        comp = Composition("Li4Fe4P4O16")
+        self.assertEqual(comp.reduced_formula, "LiFePO4")
+        self.assertIs(comp.get_reduced_formula_and_factor(),
+                      comp.get_reduced_formula_and_factor())
+        self.assertEqual(comp.reduced_composition, Composition("LiFePO4"))
+        reduced = Composition("LiFePO4")
+        self.assertIs(reduced.reduced_composition, reduced)
+
+    def test_parse_formula_cache(self):
+        # Repeated parsing of the same formula gives independent, equal
+        # Compositions
+        c1 = Composition("Li3Fe2(PO4)3")
+        c2 = Composition("Li3Fe2(PO4)3")
+        self.assertEqual(c1, c2)
+        self.assertIsNot(c1._data, c2._data)
+        self.assertEqual(c1["O"], 12)
+        self.assertRaises(CompositionError, Composition, "Li3Fe2(PO4)3$")
+        self.assertRaises(CompositionError, Composition, "Li3Fe2(PO4)3$")
+
     def test_comparisons(self):
         c1 = Composition({'S': 1})
         c1_1 = Composition({'S': 1.00000000000001})
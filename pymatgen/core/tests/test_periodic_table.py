@@ -25,6 +25,16 @@ class ElementTestCase(unittest.TestCase):
         #Test caching
         self.assertEqual(id(Element("Fe")), id(Element("Fe")))
 
+    def test_lazy_data(self):
+        # Data is parsed on first access and gives the same values whatever
+        # the attribute accessed first
+        self.assertEqual(Element.Kr.Z, 36)
+        self.assertAlmostEqual(Element.Rb.atomic_mass, 85.4678)
+        self.assertEqual(Element.Sr.data["Atomic no"], 38)
+        self.assertIn("_data", Element.Kr.__dict__)
+        self.assertFalse(hasattr(Element.Kr, "not_a_property"))
+        self.assertEqual(pickle.loads(pickle.dumps(Element.Kr)), Element.Kr)
+
     def test_dict(self):
         fe = Element.Fe
         d = fe.as_dict()
@@ -0,0 +1,84 @@
+# coding: utf-8
+# Copyright (c) Pymatgen Development Team.
+# Distributed under the terms of the MIT License.
+
+from __future__ import division, unicode_literals
+
+import os
+
+import numpy as np
+
+from pymatgen.core.lattice import Lattice
+from pymatgen.core.structure import Structure
+from pymatgen.core.trajectory import Trajectory
+from pymatgen.io.vasp.outputs import Xdatcar
+from pymatgen.util.testing import PymatgenTest
+
+test_dir = os.path.join(os.path.dirname(__file__), "..", "..", "..",
+                        'test_files')
+
+
+class TrajectoryTest(PymatgenTest):
+
+    def setUp(self):
+        self.structures = Xdatcar(os.path.join(test_dir,
+                                               "XDATCAR_5")).structures
+        self.traj = Trajectory.from_structures(self.structures, time_step=2)
+
+    def test_init(self):
+        self.assertEqual(len(self.traj), 4)
+        self.assertEqual(self.traj.nsites, 3)
+        self.assertTrue(self.traj.constant_lattice)
+        for s1, s2 in zip(self.traj, self.structures):
+            self.assertEqual(s1, s2)
+        self.assertEqual(self.traj[1], self.structures[1])
+        self.assertRaises(ValueError, Trajectory, self.traj.lattice,
+                          ["Li", "O"], self.traj.frac_coords)
+        self.assertRaises(ValueError, Trajectory, np.zeros((2, 3, 3)),
+                          self.traj.species, self.traj.frac_coords)
+
+    def test_slice(self):
+        t = self.traj[::2]
+        self.assertEqual(len(t), 2)
+        self.assertEqual(t.time_step, 4)
+        self.assertEqual(t[1], self.structures[2])
+
+    def test_variable_lattice(self):
+        structures = []
+        for i, s in enumerate(self.structures):
+            s = s.copy()
+            s.modify_lattice(Lattice(s.lattice.matrix * (1 + 0.01 * i)))
+            structures.append(s)
+        t = Trajectory.from_structures(structures)
+        self.assertFalse(t.constant_lattice)
+        self.assertEqual(t.lattices.shape, (4, 3, 3))
+        for i, s in enumerate(structures):
+            self.assertEqual(t[i], s)
+        self.assertArrayAlmostEqual(t.get_cart_coords()[3],
+                                    structures[3].cart_coords)
+
+    def test_get_frac_displacements(self):
+        t = Trajectory(Lattice.cubic(10), ["Li"],
+                       [[[0.9, 0, 0]], [[0.05, 0, 0]], [[0.15, 0.1, 0]]])
+        self.assertArrayAlmostEqual(t.get_frac_displacements(),
+                                    [[[0, 0, 0], [0.15, 0, 0],
+                                      [0.25, 0.1, 0]]])
+        self.assertArrayAlmostEqual(
+            t.get_frac_displacements([[0.8, 0, 0]])[0, 0], [0.1, 0, 0])
+
+    def test_extend(self):
+        t = self.traj[:2]
+        t.extend(self.traj[2:])
+        self.assertArrayAlmostEqual(t.frac_coords, self.traj.frac_coords)
+        self.assertTrue(t.constant_lattice)
+
+    def test_to_from_dict(self):
+        t = Trajectory.from_dict(self.traj.as_dict())
+        self.assertArrayAlmostEqual(t.frac_coords, self.traj.frac_coords)
+        self.assertEqual(t.species, self.traj.species)
+        self.assertEqual(t.time_step, 2)
+
+
+if __name__ == '__main__':
+    import unittest2 as unittest
+    unittest.main()
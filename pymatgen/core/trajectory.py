@@ -0,0 +1,237 @@
+# coding: utf-8
+# Copyright (c) Pymatgen Development Team.
+# Distributed under the terms of the MIT License.
+
+from __future__ import division, unicode_literals
+
+"""
+This module provides a compact representation of molecular dynamics
+trajectories, in which all frames are stored as a single array of fractional
+coordinates instead of one Structure per frame.
+"""
+
+__author__ = "Pymatgen Development Team"
+__date__ = "Oct 18 2016"
+
+import numpy as np
+
+from monty.json import MSONable
+
+from pymatgen.core.lattice import Lattice
+from pymatgen.core.periodic_table import get_el_sp
+from pymatgen.core.structure import Structure
+
+
+class Trajectory(MSONable):
+    """
+    A trajectory of periodic structures with the same sites (e.g., from a
+    molecular dynamics run). The fractional coordinates of all frames are
+    stored as a single nframes x nsites x 3 array, with either one lattice
+    for the whole trajectory or one lattice per frame.
+
+    .. attribute:: frac_coords
+
+        nframes x nsites x 3 array of fractional coordinates.
+
+    .. attribute:: species
+
+        List of species of the sites.
+
+    .. attribute:: lattice
+
+        Lattice of the trajectory for a constant lattice. For a variable
+        lattice, this is the lattice of the first frame.
+
+    .. attribute:: lattices
+
+        nframes x 3 x 3 array of the lattice matrices of each frame, or None
+        for a constant lattice.
+
+    .. attribute:: time_step
+
+        Time between frames, or None if unknown.
+    """
+
+    def __init__(self, lattice, species, frac_coords, time_step=None):
+        """
+        Args:
+            lattice (Lattice/array): Either a single lattice (as a Lattice
+                or 3x3 matrix) for a constant lattice, or a nframes x 3 x 3
+                array of lattice matrices for a variable lattice.
+            species ([Specie]): Species of the sites. Strings are converted
+                to species.
+            frac_coords (array): nframes x nsites x 3 array of fractional
+                coordinates.
+            time_step (float): Time between frames. Defaults to None.
+        """
+        self.frac_coords = np.array(frac_coords, dtype=np.float64)
+        if self.frac_coords.ndim != 3 or self.frac_coords.shape[2] != 3:
+            raise ValueError("frac_coords must be a nframes x nsites x 3 "
+                             "array.")
+        self.species = [get_el_sp(sp) for sp in species]
+        if len(self.species) != self.frac_coords.shape[1]:
+            raise ValueError("The number of species does not match the "
+                             "number of sites.")
+        if isinstance(lattice, Lattice):
+            self.lattices = None
+            self.lattice = lattice
+        else:
+            matrices = np.array(lattice, dtype=np.float64)
+            if matrices.shape == (3, 3):
+                self.lattices = None
+                self.lattice = Lattice(matrices)
+            elif matrices.shape == (len(self.frac_coords), 3, 3):
+                self.lattices = matrices
+                self.lattice = Lattice(matrices[0])
+            else:
+                raise ValueError("lattice must be a Lattice, a 3x3 matrix or "
+                                 "a nframes x 3 x 3 array.")
+        self.time_step = time_step
+
+    @property
+    def constant_lattice(self):
+        """
+        True if all frames have the same lattice.
+        """
+        return self.lattices is None
+
+    @property
+    def nsites(self):
+        return self.frac_coords.shape[1]
+
+    def __len__(self):
+        return len(self.frac_coords)
+
+    def get_lattice(self, i):
+        """
+        Returns the Lattice of frame i.
+        """
+        if self.lattices is None:
+            return self.lattice
+        return Lattice(self.lattices[i])
+
+    def get_structure(self, i):
+        """
+        Returns the Structure of frame i.
+        """
+        return Structure(self.get_lattice(i), self.species,
+                         self.frac_coords[i])
+
+    def __getitem__(self, item):
+        """
+        An integer index returns the Structure of a frame, and a slice
+        returns a Trajectory of the selected frames (without copying the
+        coordinates).
+        """
+        if isinstance(item, slice):
+            lattice = self.lattice if self.lattices is None \
+                else self.lattices[item]
+            return Trajectory(lattice, self.species, self.frac_coords[item],
+                              time_step=None if self.time_step is None else
+                              self.time_step * (item.step or 1))
+        return self.get_structure(item)
+
+    def __iter__(self):
+        """
+        Iterates over the Structures of the frames. Structures are only
+        created as they are needed.
+        """
+        for i in range(len(self)):
+            yield self.get_structure(i)
+
+    def get_cart_coords(self):
+        """
+        Returns the nframes x nsites x 3 array of cartesian coordinates.
+        """
+        if self.lattices is None:
+            return np.dot(self.frac_coords, self.lattice.matrix)
+        return np.einsum("fij,fjk->fik", self.frac_coords, self.lattices)
+
+    def get_frac_displacements(self, initial_frac_coords=None):
+        """
+        Returns the fractional displacements of the sites from their initial
+        positions, unwrapped assuming that no site moves by more than half a
+        lattice vector between consecutive frames.
+
+        Args:
+            initial_frac_coords (array): nsites x 3 fractional coordinates
+                from which the displacements are computed. Defaults to the
+                coordinates of the first frame.
+
+        Returns:
+            nsites x nframes x 3 array of fractional displacements.
+        """
+        p = np.transpose(self.frac_coords, (1, 0, 2))
+        if initial_frac_coords is None:
+            initial_frac_coords = p[:, 0]
+        dp = np.empty_like(p)
+        dp[:, 0] = p[:, 0] - initial_frac_coords
+        dp[:, 1:] = p[:, 1:] - p[:, :-1]
+        dp -= np.round(dp)
+        return np.cumsum(dp, axis=1)
+
+    def extend(self, trajectory):
+        """
+        Appends the frames of another trajectory with the same species.
+
+        Args:
+            trajectory (Trajectory): Trajectory to append.
+        """
+        if trajectory.species != self.species:
+            raise ValueError("Trajectories with different species cannot be "
+                             "concatenated.")
+        if self.lattices is None and trajectory.lattices is None and \
+                np.allclose(self.lattice.matrix, trajectory.lattice.matrix):
+            lattices = None
+        else:
+            lattices = np.concatenate([self._get_lattice_array(),
+                                       trajectory._get_lattice_array()])
+        self.frac_coords = np.concatenate([self.frac_coords,
+                                           trajectory.frac_coords])
+        if lattices is not None:
+            self.lattices = lattices
+
+    def _get_lattice_array(self):
+        if self.lattices is None:
+            return np.tile(self.lattice.matrix, (len(self), 1, 1))
+        return self.lattices
+
+    @classmethod
+    def from_structures(cls, structures, time_step=None):
+        """
+        Creates a Trajectory from a sequence of Structures with the same
+        species. The lattice is stored only once if it is the same for all
+        structures.
+
+        Args:
+            structures ([Structure]): Structures (may be a generator).
+            time_step (float): Time between frames. Defaults to None.
+        """
+        species = None
+        frac_coords = []
+        lattices = []
+        for s in structures:
+            if species is None:
+                species = s.species
+            frac_coords.append(s.frac_coords)
+            lattices.append(s.lattice.matrix)
+        if species is None:
+            raise ValueError("At least one structure is needed.")
+        lattices = np.array(lattices)
+        if np.allclose(lattices, lattices[0]):
+            lattices = lattices[0]
+        return cls(lattices, species, frac_coords, time_step=time_step)
+
+    def as_dict(self):
+        return {"@module": self.__class__.__module__,
+                "@class": self.__class__.__name__,
+                "lattice": self.lattice.matrix.tolist()
+                if self.lattices is None else self.lattices.tolist(),
+                "species": [str(sp) for sp in self.species],
+                "frac_coords": self.frac_coords.tolist(),
+                "time_step": self.time_step}
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d["lattice"], d["species"], d["frac_coords"],
+                   time_step=d.get("time_step"))
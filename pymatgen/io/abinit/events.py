@@ -26,7 +26,7 @@ from monty.json import MontyDecoder
 from pymatgen.core import Structure
 from monty.json import MSONable
 from pymatgen.serializers.json_coders import pmg_serialize
-from .abiinspect import YamlTokenizer
+from .abiinspect import YamlTokenizer, YamlDoc
 
 logger = logging.getLogger(__name__)
 
@@ -259,6 +259,19 @@ _BASE_CLASSES = [
 ]
 
 
+if getattr(yaml, "__with_libyaml__", False):
+    class _EventLoader(yaml.CLoader):
+        """
+        YAML loader based on libyaml used to parse the events (much faster than the pure python loader).
+        """
+
+    # The constructors of the events are registered in yaml.Loader when the classes are defined.
+    # The two loaders share the same dictionary so that events defined later are supported as well.
+    _EventLoader.yaml_constructors = yaml.Loader.yaml_constructors
+else:
+    _EventLoader = yaml.Loader
+
+
 class EventReport(collections.Iterable, MSONable):
     """
     Iterable storing the events raised by an ABINIT calculation.
@@ -410,34 +423,109 @@ class EventsParserError(Exception):
     """Base class for the exceptions raised by :class:`EventsParser`."""
 
 
+class _ParsedFile(object):
+    """
+    Position reached by :class:`EventsParser` in a file and events found so far.
+    """
+    def __init__(self, ino):
+        self.ino = ino
+        # Position after the last YAML document that has been parsed.
+        self.offset, self.lineno = 0, 0
+        self.events = []
+        self.run_completed, self.start_datetime, self.end_datetime = False, None, None
+
+
+def _iter_yaml_docs(stream, offset=0, lineno=0):
+    """
+    Generates the YAML documents found in a binary stream (same conventions as :class:`YamlTokenizer`).
+    The stream is read in binary mode so that the offsets are positions in bytes, but the tag and the
+    text of the documents are decoded to strings.
+
+    Args:
+        stream: File object opened in binary mode and positioned at offset.
+        offset: Initial position in bytes.
+        lineno: Number of lines before offset.
+
+    Returns:
+        (doc, offset, lineno) tuples where offset and lineno give the position after the end of the document.
+    """
+    in_doc, lines, doc_tag, doc_lineno = None, [], None, None
+
+    for line in stream:
+        lineno += 1
+        offset += len(line)
+
+        if line.startswith(b"---"):
+            # Include only lines in the form "--- !tag" or "---"
+            in_doc = False
+            l = line[3:].strip()
+
+            if l.startswith(b"!"):
+                doc_tag, in_doc = l.decode("utf-8", "ignore"), True
+            elif not l:
+                doc_tag, in_doc = None, True
+
+            if in_doc:
+                doc_lineno = lineno
+
+        if in_doc:
+            lines.append(line)
+
+            if line.startswith(b"..."):
+                text = b"".join(lines).decode("utf-8", "ignore")
+                yield YamlDoc(text=text, lineno=doc_lineno, tag=doc_tag), offset, lineno
+                in_doc, lines, doc_tag = None, [], None
+
+
 class EventsParser(object):
     """
     Parses the output or the log file produced by ABINIT and extract the list of events.
+
+    The parser remembers the position of the last YAML document found in each file
+    and the events parsed so far so that subsequent calls to parse only analyze the
+    content that has been appended to the file. The file is parsed from the beginning
+    if it has been replaced or truncated.
     """
     Error = EventsParserError
 
+    # TODO Use CamelCase for the Fortran messages.
+    # Bug is still an error of class SoftwareError
+    EVENT_TAGS = "*Error|*Warning|*Comment|*Bug|*ERROR|*WARNING|*COMMENT|*BUG"
+
+    def __init__(self):
+        # Absolute path --> _ParsedFile
+        self._parsed_files = {}
+
     def parse(self, filename, verbose=0):
         """
         Parse the given file. Return :class:`EventReport`.
         """
-        run_completed, start_datetime, end_datetime = False, None, None
         filename = os.path.abspath(filename)
-        report = EventReport(filename)
+        stat = os.stat(filename)
 
-        # TODO Use CamelCase for the Fortran messages.
-        # Bug is still an error of class SoftwareError
-        w = WildCard("*Error|*Warning|*Comment|*Bug|*ERROR|*WARNING|*COMMENT|*BUG")
+        parsed = self._parsed_files.get(filename)
+        if parsed is None or parsed.ino != stat.st_ino or stat.st_size < parsed.offset:
+            parsed = _ParsedFile(stat.st_ino)
+            self._parsed_files[filename] = parsed
 
-        with YamlTokenizer(filename) as tokens:
-            for doc in tokens:
+        if stat.st_size > parsed.offset:
+            self._parse_new_docs(filename, parsed, verbose)
+
+        report = EventReport(filename, events=parsed.events)
+        report.set_run_completed(parsed.run_completed, parsed.start_datetime, parsed.end_datetime)
+        return report
+
+    def _parse_new_docs(self, filename, parsed, verbose):
+        """Parse the YAML documents located after parsed.offset and update parsed."""
+        w = WildCard(self.EVENT_TAGS)
+
+        with open(filename, "rb") as fh:
+            fh.seek(parsed.offset)
+            for doc, offset, lineno in _iter_yaml_docs(fh, offset=parsed.offset, lineno=parsed.lineno):
                 if w.match(doc.tag):
-                    #print("got doc.tag", doc.tag,"--")
                     try:
-                        #print(doc.text)
-                        event = yaml.load(doc.text)
-                        #print(event.yaml_tag, type(event))
+                        event = yaml.load(doc.text, Loader=_EventLoader)
                     except:
-                        #raise 
                         # Wrong YAML doc. Check tha doc tag and instantiate the proper event.
                         message = "Malformatted YAML document at line: %d\n" % doc.lineno
                         message += doc.text
@@ -453,16 +541,16 @@ class EventsParser(object):
                             event = AbinitYamlWarning(message=message, src_file=__file__, src_line=0)
 
                     event.lineno = doc.lineno
-                    report.append(event)
+                    parsed.events.append(event)
 
                 # Check whether the calculation completed.
                 if doc.tag == "!FinalSummary":
-                    run_completed = True
+                    parsed.run_completed = True
                     d = doc.as_dict()
-                    start_datetime, end_datetime = d["start_datetime"], d["end_datetime"]
+                    parsed.start_datetime, parsed.end_datetime = d["start_datetime"], d["end_datetime"]
 
-        report.set_run_completed(run_completed, start_datetime, end_datetime)
-        return report
+                # Incomplete documents at the end of the file will be parsed at the next call.
+                parsed.offset, parsed.lineno = offset, lineno
 
     def report_exception(self, filename, exc):
         """
@@ -11,6 +11,7 @@ from __future__ import unicode_literals, division, print_function
 import os
 import sys
 import time
+import uuid
 import collections
 import warnings
 import shutil
@@ -40,6 +41,7 @@ from .tasks import ScfTask, DdkTask, DdeTask, TaskManager, FixQueueCriticalError
 from .utils import File, Directory, Editor
 from .abiinspect import yaml_read_irred_perts
 from .works import NodeContainer, Work, BandStructureWork, PhononWork, BecWork, G0W0Work, QptdmWork
+from .nodestore import NodeStore
 
 
 import logging
@@ -82,6 +84,21 @@ class FlowResults(NodeResults):
         return new
 
 
+def _get_node_signature(node):
+    """
+    Returns a cheap signature of the state of a node used to detect the nodes
+    that changed since the last dump of the flow.
+    """
+    last = node.history[-1] if node.history else None
+    sig = (str(node.status), len(node.history), None if last is None else (last.created, last.msg),
+           node.finalized, node.num_corrections)
+
+    if node.is_task:
+        sig += (node.queue_id, node.num_restarts, node.datetimes.start, node.datetimes.end)
+
+    return sig
+
+
 class FlowError(NodeError):
     """Base Exception for :class:`Node` methods"""
 
@@ -293,6 +310,11 @@ class Flow(Node, NodeContainer, MSONable):
             with open(filepath, "rb") as fh:
                 flow = pmg_pickle_load(fh)
 
+            # Apply the changes saved by incremental_dump after the last pickle_dump.
+            NodeStore.from_workdir(os.path.dirname(filepath)).apply_states(
+                flow, getattr(flow, "_dump_generation", None))
+            flow._dump_signatures = flow._get_dump_signatures()
+
         # Check if versions match.
         if flow.VERSION != cls.VERSION:
             msg = ("File flow version %s != latest version %s\n."
@@ -755,10 +777,14 @@ class Flow(Node, NodeContainer, MSONable):
 
         Args:
             show: True to show the status of the flow.
+            queue_ids: Set with the identifiers of the jobs in the queue (see get_queue_ids).
+                Submitted tasks whose output files did not change are not parsed again
+                if their job is still in the queue. None if the content of the queue is not known.
             kwargs: keyword arguments passed to show_status
         """
+        queue_ids = kwargs.pop("queue_ids", None)
         for work in self:
-            work.check_status()
+            work.check_status(queue_ids=queue_ids)
 
         if kwargs.pop("show", False):
             self.show_status(**kwargs)
@@ -1289,6 +1315,16 @@ class Flow(Node, NodeContainer, MSONable):
 
         return num_cancelled
 
+    def get_queue_ids(self, username=None):
+        """
+        Returns the set with the identifiers of the jobs in the queue, obtained with
+        a single call to the resource manager. None if the identifiers cannot be determined.
+
+        Args:
+            username: (str) the username of the jobs (default is to autodetect)
+        """
+        return self.manager.qadapter.get_queue_ids(username=username)
+
     def get_njobs_in_queue(self, username=None):
         """
         returns the number of jobs in the queue, None when the number of jobs cannot be determined.
@@ -1364,10 +1400,69 @@ class Flow(Node, NodeContainer, MSONable):
 
         protocol = self.pickle_protocol
 
+        # Signatures of the nodes used by incremental_dump to find the nodes that changed.
+        self._dump_signatures = self._get_dump_signatures()
+
+        # The generation identifies this dump in the NodeStore: the states written by incremental_dump
+        # before this dump are ignored by pickle_load even if the store has not been reset.
+        old_generation = getattr(self, "_dump_generation", None)
+        self._dump_generation = uuid.uuid4().hex
+
         # Atomic transaction with FileLock.
         with FileLock(self.pickle_file):
-            with AtomicFile(self.pickle_file, mode="wb") as fh:
-                pmg_pickle_dump(self, fh, protocol=protocol)
+            try:
+                with AtomicFile(self.pickle_file, mode="wb") as fh:
+                    pmg_pickle_dump(self, fh, protocol=protocol)
+            except:
+                # The pickle file has not been replaced.
+                self._dump_generation = old_generation
+                raise
+
+            # The states saved in the store are now included in the pickle file.
+            self.node_store.reset([node for node in self.iflat_nodes() if node is not self],
+                                  self._dump_generation)
+
+        return 0
+
+    @property
+    def node_store(self):
+        """
+        :class:`NodeStore` with the status of the nodes and the state of the nodes that
+        changed after the last pickle_dump. The status of the flow can be read
+        with `NodeStore.from_workdir(workdir).get_rows()` without loading the flow.
+        """
+        return NodeStore.from_workdir(self.workdir)
+
+    def _get_dump_signatures(self):
+        return {node.node_id: _get_node_signature(node) for node in self.iflat_nodes() if node is not self}
+
+    @check_spectator
+    def incremental_dump(self):
+        """
+        Save the state of the works and the tasks that changed since the last dump in the
+        :class:`NodeStore` of the flow (one transaction per node). The full pickle file is
+        written if the nodes of the flow changed (e.g. new works have been registered).
+
+        Returns 0 if success
+        """
+        if self.has_chrooted:
+            warnings.warn("Cannot dump since we have chrooted from %s" % self.has_chrooted)
+            return -1
+
+        old_signatures = getattr(self, "_dump_signatures", None)
+        signatures = self._get_dump_signatures()
+
+        if (old_signatures is None or not os.path.exists(self.pickle_file) or
+            set(old_signatures.keys()) != set(signatures.keys())):
+            return self.pickle_dump()
+
+        changed = [node for node in self.iflat_nodes()
+                   if node is not self and signatures[node.node_id] != old_signatures[node.node_id]]
+        if not changed: return 0
+
+        self.node_store.write_nodes(changed, self._dump_generation, protocol=self.pickle_protocol)
+        self._dump_signatures = signatures
+        logger.info("incremental_dump: saved %d node(s)" % len(changed))
 
         return 0
 
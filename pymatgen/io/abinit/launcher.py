@@ -175,7 +175,7 @@ class PyLauncher(object):
             tasks[0].start()
             num_launched += 1
 
-            self.flow.pickle_dump()
+            self.flow.incremental_dump()
 
         return num_launched
 
@@ -211,19 +211,24 @@ class PyLauncher(object):
             if not tasks:
                 continue
 
-            for task in tasks:
-                fired = task.start()
-                if fired:
+            if max_nlaunch > 0:
+                tasks = tasks[:max_nlaunch - num_launched]
+
+            # Submit the tasks in parallel (the number of threads and processes
+            # is limited by the CommandRunner of the queue adapters).
+            fired = qu.get_command_runner().map(lambda task: task.start(), tasks)
+
+            for task, task_fired in zip(tasks, fired):
+                if task_fired:
                     launched.append(task)
                     num_launched += 1
 
-                if num_launched >= max_nlaunch > 0:
-                    logger.info('num_launched >= max_nlaunch, going back to sleep')
-                    do_exit = True
-                    break
+            if num_launched >= max_nlaunch > 0:
+                logger.info('num_launched >= max_nlaunch, going back to sleep')
+                do_exit = True
 
         # Update the database.
-        self.flow.pickle_dump()
+        self.flow.incremental_dump()
 
         return num_launched
 
@@ -543,9 +548,15 @@ class PyFlowScheduler(object):
                 work.set_manager(new_manager)
 
         nqjobs = 0
+        queue_ids = None
+        # The snapshots of the queue are shared by all the tasks during this iteration.
+        qu.get_command_runner().clear_cache()
         if self.contact_resource_manager:
-            # This call is expensive and therefore it's optional
-            nqjobs = flow.get_njobs_in_queue()
+            # This call is expensive and therefore it's optional.
+            # We contact the resource manager only once per iteration: the identifiers
+            # of the jobs in the queue are also used by check_status.
+            queue_ids = flow.get_queue_ids()
+            nqjobs = len(queue_ids) if queue_ids is not None else flow.get_njobs_in_queue()
             if nqjobs is None:
                 nqjobs = 0
                 if flow.manager.has_queue: logger.warning('Cannot get njobs_inqueue')
@@ -559,8 +570,8 @@ class PyFlowScheduler(object):
         else:
             max_nlaunch = min(self.max_njobs_inqueue - nqjobs, self.max_nlaunches)
 
-        # check status.
-        flow.check_status(show=False)
+        # check status. Tasks whose output files did not change are not parsed again.
+        flow.check_status(show=False, queue_ids=queue_ids)
 
         # This check is not perfect, we should make a list of tasks to sumbit
         # and select only the subset so that we don't exceeed mac_ncores_used 
@@ -582,7 +593,7 @@ class PyFlowScheduler(object):
                     max_nlaunch -= 1
                     if max_nlaunch == 0:
                         logger.info("Restart: too many jobs in the queue, returning")
-                        flow.pickle_dump()
+                        flow.incremental_dump()
                         return
 
             except task.RestartError:
@@ -599,8 +610,8 @@ class PyFlowScheduler(object):
         nfixed = flow.fix_abicritical()
         if nfixed: print("Fixed %d AbiCritical error(s)" % nfixed)
 
-        # update database
-        flow.pickle_dump()
+        # update database (only the nodes that changed are written)
+        flow.incremental_dump()
 
         # Submit the tasks that are ready.
         try:
@@ -0,0 +1,190 @@
+# coding: utf-8
+# Copyright (c) Pymatgen Development Team.
+# Distributed under the terms of the MIT License.
+"""
+SQLite database with one row per node of a :class:`Flow`.
+The status of the nodes can be read without unpickling the flow and the state
+of the nodes that changed can be saved without writing the full pickle file.
+"""
+from __future__ import unicode_literals, division, print_function
+
+import os
+import ast
+import time
+import sqlite3
+import collections
+
+from contextlib import closing
+from io import BytesIO
+from monty.string import is_string
+from pymatgen.serializers.pickle_coders import PmgPickler, PmgUnpickler
+from .nodes import Node
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+__all__ = [
+    "NodeStore",
+]
+
+
+class _NodeStatePickler(PmgPickler):
+    """
+    Pickler used for the state of the nodes. References to the other nodes of the flow
+    are replaced by their node_id so that only the state of the node is written.
+    """
+    def persistent_id(self, obj):
+        if isinstance(obj, Node):
+            return "Node", obj.node_id
+        return PmgPickler.persistent_id(self, obj)
+
+
+class _NodeStateUnpickler(PmgUnpickler):
+    """Unpickler for the state of the nodes. Node references are resolved with nid2node."""
+
+    def __init__(self, fh, nid2node):
+        PmgUnpickler.__init__(self, fh)
+        self.nid2node = nid2node
+
+    def persistent_load(self, pid):
+        if is_string(pid):
+            # Protocol 0 stores pids as strings.
+            pid = ast.literal_eval(pid)
+        if pid[0] == "Node":
+            return self.nid2node[pid[1]]
+        return PmgUnpickler.persistent_load(self, pid)
+
+
+NodeRow = collections.namedtuple("NodeRow", "node_id, parent_id, node_class, workdir, status, queue_id, mtime")
+
+
+class NodeStore(object):
+    """
+    SQLite database with one row per node (works and tasks) of a flow.
+
+    Each row contains the status of the node and a few other quantities so that the status
+    of the flow can be queried without loading the flow. The column `state` contains the
+    pickled state of the nodes that changed after the last full dump of the flow (NULL if
+    the state in the pickle file is up to date). Each node is updated in its own transaction.
+
+    Each full dump of the flow has a generation, stored both in the pickle file and in the rows
+    written after this dump. States with another generation than the pickle file (e.g. if the
+    process died between the pickle dump and the reset of the store) are ignored.
+    """
+    FNAME = "__AbinitFlow__.sqlite"
+
+    def __init__(self, filepath):
+        """
+        Args:
+            filepath: Path of the SQLite database. Created if it does not exist.
+        """
+        self.filepath = os.path.abspath(filepath)
+
+    @classmethod
+    def from_workdir(cls, workdir):
+        """Returns the store of the flow located in workdir."""
+        return cls(os.path.join(workdir, cls.FNAME))
+
+    @property
+    def exists(self):
+        return os.path.exists(self.filepath)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.filepath, timeout=60)
+        conn.execute("CREATE TABLE IF NOT EXISTS nodes ("
+                     "node_id INTEGER PRIMARY KEY, parent_id INTEGER, node_class TEXT, "
+                     "workdir TEXT, status TEXT, queue_id INTEGER, mtime REAL, state BLOB, generation TEXT)")
+        return conn
+
+    @staticmethod
+    def _get_row(node, generation, state=None):
+        parent = None
+        if node.is_task:
+            parent = node.work
+        elif node.is_work:
+            parent = node.flow
+
+        return (node.node_id, None if parent is None else parent.node_id, node.__class__.__name__,
+                node.workdir, str(node.status), node.queue_id if node.is_task else None,
+                time.time(), state, generation)
+
+    def write_nodes(self, nodes, generation, protocol=-1):
+        """
+        Save the status and the state of the nodes. Each node is written in its own transaction.
+
+        Args:
+            nodes: List of works and tasks.
+            generation: Generation of the last full dump of the flow.
+            protocol: Pickle protocol used for the state of the nodes.
+        """
+        with closing(self._connect()) as conn:
+            for node in nodes:
+                # Tasks remove the objects that cannot be pickled in __getstate__
+                state = node.__getstate__() if hasattr(node, "__getstate__") else node.__dict__
+                bio = BytesIO()
+                _NodeStatePickler(bio, protocol=protocol).dump(state)
+
+                with conn:
+                    conn.execute("INSERT OR REPLACE INTO nodes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                 self._get_row(node, generation, state=sqlite3.Binary(bio.getvalue())))
+
+    def reset(self, nodes, generation):
+        """
+        Replace the content of the database with the status of the nodes, without their state.
+        Used after a full dump of the flow.
+
+        Args:
+            nodes: List of works and tasks.
+            generation: Generation of the full dump of the flow.
+        """
+        with closing(self._connect()) as conn:
+            with conn:
+                conn.execute("DELETE FROM nodes")
+                conn.executemany("INSERT INTO nodes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                 [self._get_row(node, generation) for node in nodes])
+
+    def apply_states(self, flow, generation):
+        """
+        Update the nodes of the flow with the states saved by write_nodes after the full dump
+        with the given generation. States written before other full dumps are ignored.
+        Returns the number of nodes that have been updated.
+        """
+        if not self.exists or generation is None: return 0
+
+        nid2node = {node.node_id: node for node in flow.iflat_nodes()}
+        count = 0
+        with closing(self._connect()) as conn:
+            for nid, state in conn.execute("SELECT node_id, state FROM nodes "
+                                           "WHERE state IS NOT NULL AND generation = ?", (generation,)):
+                if nid not in nid2node:
+                    logger.warning("Cannot find node %s in flow" % nid)
+                    continue
+                state = _NodeStateUnpickler(BytesIO(bytes(state)), nid2node).load()
+                nid2node[nid].__dict__.update(state)
+                count += 1
+
+        return count
+
+    def get_rows(self, status=None):
+        """
+        Returns the list of :class:`NodeRow` ordered by node_id.
+
+        Args:
+            status: If not None, only the nodes with this status (string or Status) are returned.
+        """
+        query = "SELECT node_id, parent_id, node_class, workdir, status, queue_id, mtime FROM nodes"
+        args = ()
+        if status is not None:
+            query += " WHERE status = ?"
+            args = (str(status),)
+
+        with closing(self._connect()) as conn:
+            return [NodeRow(*row) for row in conn.execute(query + " ORDER BY node_id", args)]
+
+    def get_status_counts(self):
+        """Returns a dictionary with the number of tasks for each status."""
+        with closing(self._connect()) as conn:
+            # The parent of a task is a work, the parent of a work is the flow (not stored).
+            return dict(conn.execute("SELECT status, COUNT(*) FROM nodes WHERE parent_id IN "
+                                     "(SELECT node_id FROM nodes) GROUP BY status").fetchall())
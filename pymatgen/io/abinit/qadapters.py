@@ -1010,6 +1010,10 @@ limits:
         s = self._submit_to_queue(script_file)
         self.record_launch(s.qid)
 
+        # The cached snapshots of the queue do not contain the new job.
+        if not isinstance(self, ShellAdapter):
+            qu.get_command_runner().clear_cache()
+
         if s.qid is None:
             raise self.Error("Error in job submission with %s. file %s \n" %
                             (self.__class__.__name__, script_file) +
@@ -1060,6 +1064,32 @@ limits:
         Concrete Subclasses must implement this method. Return (njobs, process)
         """
 
+    def get_queue_ids(self, username=None):
+        """
+        Returns the set with the identifiers (int) of the jobs in the queue with a single call
+        to the resource manager. This snapshot can be shared by all the tasks of a flow instead
+        of querying the status of each job separately. Returns None when the identifiers cannot be determined.
+
+        Args:
+            username: (str) the username of the jobs (default is to autodetect)
+        """
+        if username is None: username = getpass.getuser()
+        qids, process = self._get_queue_ids(username=username)
+
+        if process is not None and process.returncode != 0:
+            err_msg = ('Error trying to get the identifiers of the jobs in the queue. ' +
+                       'The error response reads:\n {}'.format(process.stderr.read()))
+            logger.critical(err_msg)
+
+        return qids
+
+    def _get_queue_ids(self, username):
+        """
+        Subclasses should implement this method. Return (qids, process) where qids
+        is a set of queue identifiers or None if the identifiers cannot be determined.
+        """
+        return None, None
+
     # Methods to fix problems
     def add_exclude_nodes(self, nodes):
         return _EXCL_NODES_FILE.add_nodes(self.qname, nodes)
@@ -1254,7 +1284,7 @@ $${qverbatim}
 
     def _submit_to_queue(self, script_file):
         """Submit a job script to the queue."""
-        process = Popen(['sbatch', script_file], stdout=PIPE, stderr=PIPE)
+        process = qu.get_command_runner().run(['sbatch', script_file])
         out, err = process.communicate()
 
         # grab the returncode. SLURM returns 0 if the job was successful
@@ -1285,7 +1315,7 @@ $${qverbatim}
             raise self.Error('qadapter failed to exclude nodes')
 
     def _get_njobs_in_queue(self, username):
-        process = Popen(['squeue', '-o "%u"', '-u', username], stdout=PIPE, stderr=PIPE)
+        process = qu.get_command_runner().run(['squeue', '-o "%u"', '-u', username], cached=True)
         out, err = process.communicate()
 
         njobs = None
@@ -1298,6 +1328,17 @@ $${qverbatim}
 
         return njobs, process
 
+    def _get_queue_ids(self, username):
+        process = qu.get_command_runner().run(['squeue', '-h', '-o', '%i', '-u', username], cached=True)
+        out, err = process.communicate()
+
+        qids = None
+        if process.returncode == 0:
+            # One job identifier per line (no header).
+            qids = set(int(line) for line in out.split() if line.strip().isdigit())
+
+        return qids, process
+
 
 class PbsProAdapter(QueueAdapter):
     """Adapter for PbsPro"""
@@ -1549,7 +1590,7 @@ $${qverbatim}
 
     def _submit_to_queue(self, script_file):
         """Submit a job script to the queue."""
-        process = Popen(['qsub', script_file], stdout=PIPE, stderr=PIPE)
+        process = qu.get_command_runner().run(['qsub', script_file])
         out, err = process.communicate()
 
         # grab the return code. PBS returns 0 if the job was successful
@@ -1564,7 +1605,7 @@ $${qverbatim}
         return SubmitResults(qid=queue_id, out=out, err=err, process=process)
 
     def _get_njobs_in_queue(self, username):
-        process = Popen(['qstat', '-a', '-u', username], stdout=PIPE, stderr=PIPE)
+        process = qu.get_command_runner().run(['qstat', '-a', '-u', username], cached=True)
         out, err = process.communicate()
 
         njobs = None
@@ -1580,6 +1621,24 @@ $${qverbatim}
 
         return njobs, process
 
+    def _get_queue_ids(self, username):
+        process = qu.get_command_runner().run(['qstat', '-u', username], cached=True)
+        out, err = process.communicate()
+
+        qids = None
+        if process.returncode == 0:
+            # lines of the jobs start with the job identifier e.g.
+            # '1339044.sdb          username  queuename    2012-02-29-16-43  20460   --   --    --  00:20 C 00:09'
+            # Completed jobs ('C') are not in the queue anymore.
+            qids = set()
+            for line in out.decode("utf-8").splitlines():
+                tokens = line.split()
+                if username not in tokens or (len(tokens) > 2 and tokens[-2] == "C"): continue
+                qid = tokens[0].split(".")[0]
+                if qid.isdigit(): qids.add(int(qid))
+
+        return qids, process
+
     def exclude_nodes(self, nodes):
         """No meaning for Shell"""
         return False
@@ -1694,7 +1753,7 @@ $${qverbatim}
 
     def _submit_to_queue(self, script_file):
         """Submit a job script to the queue."""
-        process = Popen(['qsub', script_file], stdout=PIPE, stderr=PIPE)
+        process = qu.get_command_runner().run(['qsub', script_file])
         out, err = process.communicate()
 
         # grab the returncode. SGE returns 0 if the job was successful
@@ -1714,7 +1773,7 @@ $${qverbatim}
         raise self.Error('qadapter failed to exclude nodes, not implemented yet in sge')
 
     def _get_njobs_in_queue(self, username):
-        process = Popen(['qstat', '-u', username], stdout=PIPE, stderr=PIPE)
+        process = qu.get_command_runner().run(['qstat', '-u', username], cached=True)
         out, err = process.communicate()
 
         njobs = None
@@ -1781,7 +1840,7 @@ $${qverbatim}
 
     def _submit_to_queue(self, script_file):
         """Submit a job script to the queue."""
-        process = Popen(['msub', script_file], stdout=PIPE, stderr=PIPE)
+        process = qu.get_command_runner().run(['msub', script_file])
         out, err = process.communicate()
 
         queue_id = None
@@ -1797,7 +1856,7 @@ $${qverbatim}
         return SubmitResults(qid=queue_id, out=out, err=err, process=process)
 
     def _get_njobs_in_queue(self, username):
-        process = Popen(['showq', '-s -u', username], stdout=PIPE, stderr=PIPE)
+        process = qu.get_command_runner().run(['showq', '-s -u', username], cached=True)
         out, err = process.communicate()
 
         njobs = None
@@ -8,6 +8,12 @@ The preferred way of importing this module is:
 """
 from __future__ import print_function, division, unicode_literals
 
+import time
+import threading
+
+from io import BytesIO
+from subprocess import Popen, PIPE
+from multiprocessing.pool import ThreadPool
 from monty.string import is_string
 from pymatgen.core.units import Time, Memory
 
@@ -113,3 +119,164 @@ def any2mb(s):
         return int(Memory.from_string(s).to("Mb"))
     else:
         return int(s)
+
+
+class CommandResults(object):
+    """
+    Results of a command executed by :class:`CommandRunner`.
+    The object provides the subset of the Popen API used by the queue adapters
+    for processes that have already terminated.
+    """
+    def __init__(self, args, returncode, out, err, timed_out=False):
+        self.args = args
+        self.returncode = returncode
+        self.out, self.err = out, err
+        self.timed_out = timed_out
+
+    def __repr__(self):
+        return "<%s, args=%s, returncode=%s>" % (self.__class__.__name__, self.args, self.returncode)
+
+    def poll(self):
+        return self.returncode
+
+    def wait(self):
+        return self.returncode
+
+    def communicate(self):
+        return self.out, self.err
+
+    @property
+    def stdout(self):
+        return BytesIO(self.out)
+
+    @property
+    def stderr(self):
+        return BytesIO(self.err)
+
+
+class CommandRunner(object):
+    """
+    Executes the commands of the resource managers (sbatch, squeue, qstat ...).
+
+        - The number of processes running at the same time is limited to max_workers.
+        - Processes running for more than timeout seconds are killed.
+        - The results of the commands executed with cached=True (e.g. squeue) are
+          reused for cache_ttl seconds so that they can be shared by all the tasks.
+        - map executes a function in a pool of threads, e.g. to submit several jobs in parallel.
+
+    Python 2 does not provide asyncio, so the concurrency is implemented with threads
+    waiting for the external processes.
+    """
+    def __init__(self, max_workers=8, timeout=60, cache_ttl=10):
+        """
+        Args:
+            max_workers: Maximum number of processes (and threads used by map).
+            timeout: Default timeout in seconds. None to wait indefinitely.
+            cache_ttl: Time in seconds after which the cached results are discarded.
+        """
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+
+        self._semaphore = threading.BoundedSemaphore(max_workers)
+        # Protects _cache and _key_locks. The locks in _key_locks are held while
+        # a cached command runs, so that only identical commands wait for each other.
+        self._cache_lock = threading.Lock()
+        self._key_locks = {}
+        self._cache = {}
+
+    def run(self, args, timeout=None, cached=False):
+        """
+        Execute the command and return a :class:`CommandResults`.
+
+        Args:
+            args: List with the command and its arguments.
+            timeout: Timeout in seconds. Defaults to self.timeout.
+            cached: True if the results of a previous call with the same arguments
+                can be reused if they are younger than cache_ttl.
+        """
+        args = tuple(args)
+        if not cached:
+            return self._run(args, timeout)
+
+        # Only one process is started if several threads request the same command.
+        with self._cache_lock:
+            key_lock = self._key_locks.setdefault(args, threading.Lock())
+
+        with key_lock:
+            with self._cache_lock:
+                entry = self._cache.get(args)
+            if entry is not None and time.time() - entry[0] < self.cache_ttl:
+                return entry[1]
+
+            results = self._run(args, timeout)
+            with self._cache_lock:
+                self._cache[args] = (time.time(), results)
+            return results
+
+    def _run(self, args, timeout):
+        timeout = self.timeout if timeout is None else timeout
+
+        with self._semaphore:
+            process = Popen(args, stdout=PIPE, stderr=PIPE)
+
+            timer, timed_out = None, []
+            if timeout is not None:
+                def kill():
+                    timed_out.append(True)
+                    try:
+                        process.kill()
+                    except OSError:
+                        pass
+                timer = threading.Timer(timeout, kill)
+                timer.start()
+
+            try:
+                out, err = process.communicate()
+            finally:
+                if timer is not None: timer.cancel()
+
+        if timed_out:
+            logger.critical("Command %s killed after %s seconds" % (" ".join(args), timeout))
+            err += ("\nKilled after timeout of %s seconds" % timeout).encode("utf-8")
+
+        return CommandResults(args, process.returncode, out, err, timed_out=bool(timed_out))
+
+    def clear_cache(self):
+        """Discard the cached results."""
+        with self._cache_lock:
+            self._cache = {}
+
+    def map(self, func, iterable):
+        """
+        Apply func to the items of iterable using max_workers threads.
+        Returns the list of results. Exceptions raised by func are propagated.
+        """
+        items = list(iterable)
+        if len(items) <= 1 or self.max_workers == 1:
+            return [func(item) for item in items]
+
+        pool = ThreadPool(min(self.max_workers, len(items)))
+        try:
+            return pool.map(func, items)
+        finally:
+            pool.close()
+            pool.join()
+
+
+_COMMAND_RUNNER = None
+
+
+def get_command_runner():
+    """Returns the :class:`CommandRunner` used by the queue adapters."""
+    global _COMMAND_RUNNER
+    if _COMMAND_RUNNER is None:
+        _COMMAND_RUNNER = CommandRunner()
+    return _COMMAND_RUNNER
+
+
+def set_command_runner(runner):
+    """Set the :class:`CommandRunner` used by the queue adapters. Returns the previous runner."""
+    global _COMMAND_RUNNER
+    old, _COMMAND_RUNNER = _COMMAND_RUNNER, runner
+    return old
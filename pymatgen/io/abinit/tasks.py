@@ -1586,6 +1586,8 @@ class Task(six.with_metaclass(abc.ABCMeta, Node)):
         if changed:
             if status == self.S_SUB: 
                 self.datetimes.submission = datetime.datetime.now()
+                # Files produced by previous runs must be parsed again.
+                self._files_stat = None
                 self.history.info("Submitted with MPI=%s, Omp=%s, Memproc=%.1f [Gb] %s " % (
                     self.mpi_procs, self.omp_threads, self.mem_per_proc.to("Gb"), msg))
 
@@ -1619,11 +1621,57 @@ class Task(six.with_metaclass(abc.ABCMeta, Node)):
 
         return status
 
-    def check_status(self):
+    def _get_files_stat(self):
+        """
+        Return a tuple with the modification time and the size of the files
+        inspected by check_status. (None, None) is used for files that do not exist.
+        """
+        stats = []
+        for f in (self.mpiabort_file, self.stderr_file, self.qerr_file,
+                  self.qout_file, self.output_file, self.log_file):
+            try:
+                st = os.stat(f.path)
+                stats.append((st.st_mtime, st.st_size))
+            except OSError:
+                stats.append((None, None))
+
+        return tuple(stats)
+
+    def check_status(self, queue_ids=None):
         """
         This function checks the status of the task by inspecting the output and the
         error files produced by the application and by the queue manager.
+
+        The files are parsed only if their modification time or their size changed
+        since the last call. A submitted or running task whose files did not change
+        keeps its status, unless its job is no longer in the queue or its output file
+        did not change for more than frozen_timeout (in this case, the files are parsed
+        to decide whether the task is frozen).
+
+        Args:
+            queue_ids: Set with the identifiers of the jobs in the queue (e.g. from
+                QueueAdapter.get_queue_ids). Tasks whose job is not in queue_ids are
+                always parsed. None if the content of the queue is not known.
         """
+        if self.status not in (self.S_SUB, self.S_RUN):
+            return self._check_status()
+
+        files_stat = (self.status, self._get_files_stat())
+        in_queue = queue_ids is None or self.queue_id is None or self.queue_id in queue_ids
+
+        if in_queue and files_stat == getattr(self, "_files_stat", None):
+            # Nothing changed since the last check. If the output file is older than frozen_timeout,
+            # only _check_status can tell whether the task is frozen (e.g. empty err files mean running).
+            mtime = files_stat[1][4][0]
+            if mtime is None or time.time() - mtime <= self.manager.policy.frozen_timeout:
+                return self.status
+
+        status = self._check_status()
+        self._files_stat = files_stat
+        return status
+
+    def _check_status(self):
+        """Parse the output and the error files and set the status of the task."""
         # 1) see it the job is blocked
         # 2) see if an error occured at submitting the job the job was submitted, TODO these problems can be solved
         # 3) see if there is output
@@ -1894,7 +1942,11 @@ class Task(six.with_metaclass(abc.ABCMeta, Node)):
             "output": self.output_file,
             "log": self.log_file}[source]
 
-        parser = events.EventsParser()
+        # The parser is kept so that only the content appended to the files is parsed at the next call.
+        try:
+            parser = self._events_parser
+        except AttributeError:
+            parser = self._events_parser = events.EventsParser()
 
         if not ofile.exists: 
             if not self.mpiabort_file.exists:
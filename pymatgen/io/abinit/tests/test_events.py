@@ -3,6 +3,7 @@ from __future__ import unicode_literals, division, print_function
 
 import os
 import datetime
+import six
 
 from pymatgen.util.testing import PymatgenTest
 from pymatgen.io.abinit import events 
@@ -66,6 +67,64 @@ class EventsParserTest(PymatgenTest):
 
         #assert 0
 
+    def test_incremental_parse(self):
+        """Parsing a log file while it is being written."""
+        with open(ref_file("mgb2_nscf.log"), "rb") as fh:
+            lines = fh.readlines()
+
+        tmpfile = self.tmpfile_write("")
+        parser = events.EventsParser()
+        # Stop inside the first warning, after the first warning and at the end of the file.
+        for stop in (220, 230, len(lines)):
+            with open(tmpfile, "wb") as fh:
+                fh.write(b"".join(lines[:stop]))
+            report = parser.parse(tmpfile)
+            ref_report = events.EventsParser().parse(tmpfile)
+            assert report.num_warnings == ref_report.num_warnings
+            assert report.run_completed == ref_report.run_completed
+            assert [ev.lineno for ev in report] == [ev.lineno for ev in ref_report]
+
+        assert report.num_warnings == 2 and report.run_completed
+        # Nothing to parse. Truncated files are parsed again from the beginning.
+        assert len(parser.parse(tmpfile)) == 2
+        with open(tmpfile, "wb") as fh:
+            fh.write(b"".join(lines[:230]))
+        report = parser.parse(tmpfile)
+        assert report.num_warnings == 1 and not report.run_completed
+        os.remove(tmpfile)
+
+
+    def test_run_completed_and_malformed_docs(self):
+        """Run completion and malformed YAML documents with the incremental parser."""
+        with open(ref_file("mgb2_nscf.log"), "rb") as fh:
+            data = fh.read()
+
+        # Tags and texts are strings, even if the file is read in binary mode.
+        with open(ref_file("mgb2_nscf.log"), "rb") as fh:
+            docs = [doc for doc, _, _ in events._iter_yaml_docs(fh)]
+        assert all(isinstance(doc.tag, six.text_type) and isinstance(doc.text, six.text_type)
+                   for doc in docs if doc.tag is not None)
+        assert [doc.tag for doc in docs].count("!WARNING") == 2
+
+        i = data.index(b"--- !FinalSummary")
+        tmpfile = self.tmpfile_write("")
+        with open(tmpfile, "wb") as fh:
+            fh.write(data[:i])
+            fh.write(b"--- !ERROR\nsrc_file: m_foo.F90\nmessage: [unbalanced\n...\n")
+        parser = events.EventsParser()
+        report = parser.parse(tmpfile)
+        assert not report.run_completed
+        assert report.num_warnings == 2 and report.num_errors == 1
+        error = report.get_events_of_type(events.AbinitYamlError)[0]
+        assert "Malformatted YAML document" in error.message and "m_foo.F90" in error.message
+
+        with open(tmpfile, "ab") as fh:
+            fh.write(data[i:])
+        report = parser.parse(tmpfile)
+        assert report.run_completed
+        assert report.num_warnings == 2 and report.num_errors == 1
+        os.remove(tmpfile)
+
 
 class EventHandlersTest(PymatgenTest):
     def test_events(self):
@@ -5,6 +5,7 @@
 from __future__ import unicode_literals, division, print_function
 
 import os
+import time
 import tempfile
 import shutil
 
@@ -17,6 +18,8 @@ from pymatgen.io.abinit.flows import *
 from pymatgen.io.abinit.works import *
 from pymatgen.io.abinit.tasks import *
 from pymatgen.io.abinit.pseudos import Pseudo
+from pymatgen.io.abinit.qjobs import QueueJob
+from pymatgen.io.abinit.nodestore import NodeStore
 
 _test_dir = os.path.join(os.path.dirname(__file__), "..", "..", "..", "..", 
                          'test_files', "abinit")
@@ -205,6 +208,133 @@ class FlowTest(FlowUnitTest):
         flow.show_status()
         flow.show_event_handlers()
 
+    def test_check_status_cache(self):
+        """Testing the cache of check_status based on the stat of the output files."""
+        flow = Flow(workdir=self.workdir, manager=self.manager)
+        task = flow.register_task(self.fake_input)[0]
+        flow.allocate()
+        flow.build()
+
+        ncalls = [0]
+        check_status = task._check_status
+        def counted_check_status():
+            ncalls[0] += 1
+            return check_status()
+        task._check_status = counted_check_status
+
+        task.set_status(task.S_RUN, msg="running")
+        assert task.check_status() == task.S_RUN
+        assert ncalls[0] == 1
+
+        # Files did not change, the status is taken from the cache.
+        assert task.check_status() == task.S_RUN
+        assert ncalls[0] == 1
+
+        # Tasks whose job is not in the queue anymore are always parsed.
+        task.set_qjob(QueueJob.from_qtype_and_id("slurm", 123))
+        assert task.check_status(queue_ids={123}) == task.S_RUN
+        assert ncalls[0] == 1
+        assert task.check_status(queue_ids=set()) == task.S_RUN
+        assert ncalls[0] == 2
+
+        # A new file triggers the parsing.
+        with open(task.stderr_file.path, "w") as fh:
+            fh.write("Fortran runtime error")
+        assert task.check_status() == task.S_QCRITICAL
+        assert ncalls[0] == 3
+
+    def test_check_status_frozen(self):
+        """Testing the detection of frozen tasks when the files did not change."""
+        flow = Flow(workdir=self.workdir, manager=self.manager)
+        task = flow.register_task(self.fake_input)[0]
+        flow.allocate()
+        flow.build()
+
+        # Output file older than frozen_timeout, empty stderr and qerr files: the task is running.
+        for f in (task.output_file, task.log_file, task.stderr_file, task.qerr_file):
+            with open(f.path, "w") as fh:
+                if f in (task.output_file, task.log_file): fh.write("Output of the run\n")
+        old = time.time() - 2 * self.manager.policy.frozen_timeout
+        os.utime(task.output_file.path, (old, old))
+
+        task.set_status(task.S_RUN, msg="running")
+        assert task.check_status() == task.S_RUN
+        # Files did not change, the task is still running.
+        assert task.check_status() == task.S_RUN
+        assert task.check_status() == task.S_RUN
+
+        # Without the err files, the task is frozen.
+        os.remove(task.stderr_file.path)
+        os.remove(task.qerr_file.path)
+        assert task.check_status() == task.S_ERROR
+
+    def test_incremental_dump(self):
+        """Testing incremental_dump and the NodeStore of the flow."""
+        flow = Flow(workdir=self.workdir, manager=self.manager)
+        flow.register_task(self.fake_input)
+        flow.register_task(self.fake_input)
+        flow.allocate()
+        flow.build_and_pickle_dump()
+
+        # The status of the nodes can be read without loading the flow.
+        store = NodeStore.from_workdir(self.workdir)
+        rows = store.get_rows()
+        assert [row.node_id for row in rows] == sorted(node.node_id for node in flow.iflat_nodes()
+                                                       if node is not flow)
+        assert store.get_status_counts() == {str(flow[0][0].status): 2}
+
+        # Nothing changed, nothing is written.
+        mtimes = [row.mtime for row in rows]
+        assert flow.incremental_dump() == 0
+        assert [row.mtime for row in store.get_rows()] == mtimes
+
+        task = flow[1][0]
+        task.set_status(task.S_RUN, msg="running")
+        task.set_qjob(QueueJob.from_qtype_and_id("slurm", 42))
+        assert flow.incremental_dump() == 0
+        # The work containing the task is running as well.
+        rows = store.get_rows(status=task.S_RUN)
+        assert [row.node_id for row in rows] == [flow[1].node_id, task.node_id]
+        assert rows[1].queue_id == 42 and rows[0].queue_id is None
+        assert rows[1].parent_id == flow[1].node_id and rows[1].workdir == task.workdir
+
+        same_flow = Flow.pickle_load(self.workdir)
+        same_task = same_flow[1][0]
+        assert same_task.status == task.S_RUN
+        assert same_task.queue_id == 42
+        assert same_flow[0][0].status < task.S_SUB
+        # References to other nodes are restored.
+        assert same_task.work is same_flow[1]
+
+        # A full dump resets the store.
+        flow.pickle_dump()
+        assert store.apply_states(flow, flow._dump_generation) == 0
+        same_flow = Flow.pickle_load(self.workdir)
+        assert same_flow[1][0].queue_id == 42
+        assert store.get_rows(status=task.S_RUN)[1].queue_id == 42
+
+        # New works require a full dump.
+        flow.register_task(self.fake_input)
+        flow.allocate()
+        assert flow.incremental_dump() == 0
+        assert len(store.get_rows()) == 6
+        assert len(Flow.pickle_load(self.workdir)) == 3
+
+        # The states written before the last full dump are ignored if the store has not been reset.
+        task.set_qjob(QueueJob.from_qtype_and_id("slurm", 43))
+        assert flow.incremental_dump() == 0
+        task.set_qjob(QueueJob.from_qtype_and_id("slurm", 44))
+        def crash(self, nodes, generation):
+            raise RuntimeError("Killed")
+        reset = NodeStore.reset
+        NodeStore.reset = crash
+        try:
+            with self.assertRaises(RuntimeError): flow.pickle_dump()
+        finally:
+            NodeStore.reset = reset
+        assert store.get_rows(status=task.S_RUN)[-1].queue_id == 43
+        assert Flow.pickle_load(self.workdir)[1][0].queue_id == 44
+
     def test_workdir(self):
         """Testing if one can use workdir=None in flow.__init__ and then flow.allocate(workdir)."""
         flow = Flow(workdir=None, manager=self.manager)
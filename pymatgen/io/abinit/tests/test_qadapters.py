@@ -3,6 +3,10 @@
 # Distributed under the terms of the MIT License.
 from __future__ import unicode_literals, division, print_function
 
+import os
+import time
+import shutil
+import tempfile
 import yaml
 import unittest2 as unittest
 
@@ -449,6 +453,102 @@ mpirun -n 3 executable < stdin > stdout 2> stderr
         aequal(qad_exclusive.get_select(), '1:ncpus=2:vmem=48000mb:mpiprocs=2+'
                                            '2:ncpus=24:vmem=48000mb:mpiprocs=24')
 
+class CommandRunnerTest(PymatgenTest):
+    """
+    Test the execution of the commands of the resource manager.
+    sbatch and squeue are replaced by stub scripts.
+    """
+    SBATCH = """\
+#!/bin/bash
+echo "$@" >> %(log)s
+echo "Submitted batch job 1234"
+"""
+
+    SQUEUE = """\
+#!/bin/bash
+echo "$@" >> %(log)s
+if [ "$1" == "-h" ]; then
+    echo 1234
+    echo 1235
+else
+    echo USER
+    echo $3
+    echo $3
+fi
+"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.log = os.path.join(self.tmpdir, "commands.log")
+        for name, script in [("sbatch", self.SBATCH), ("squeue", self.SQUEUE)]:
+            path = os.path.join(self.tmpdir, name)
+            with open(path, "w") as fh:
+                fh.write(script % {"log": self.log})
+            os.chmod(path, 0o755)
+
+        self.old_path = os.environ["PATH"]
+        os.environ["PATH"] = self.tmpdir + os.pathsep + self.old_path
+        self.runner = qu.CommandRunner(max_workers=4, timeout=10, cache_ttl=60)
+        self.old_runner = qu.set_command_runner(self.runner)
+
+    def tearDown(self):
+        os.environ["PATH"] = self.old_path
+        qu.set_command_runner(self.old_runner)
+        shutil.rmtree(self.tmpdir)
+
+    def num_calls(self, command):
+        with open(self.log) as fh:
+            return sum(1 for line in fh if line.startswith(command))
+
+    def test_slurm_commands(self):
+        qad = make_qadapter(**SlurmAdapterTest.QDICT)
+        script = os.path.join(self.tmpdir, "job.sh")
+        with open(script, "w") as fh:
+            fh.write("#!/bin/bash\necho job")
+
+        # The snapshot of the queue is cached and shared.
+        assert qad.get_queue_ids(username="foo") == {1234, 1235}
+        assert qad.get_queue_ids(username="foo") == {1234, 1235}
+        assert self.num_calls("-h") == 1
+        assert qad.get_njobs_in_queue(username="foo") == 2
+        assert qad.get_njobs_in_queue(username="foo") == 2
+        assert self.num_calls("-o") == 1
+
+        qjob, process = qad.submit_to_queue(script)
+        assert qjob.qid == 1234 and process.returncode == 0
+        assert qad.num_launches == 1
+
+        # The submission invalidates the cache.
+        assert qad.get_queue_ids(username="foo") == {1234, 1235}
+        assert self.num_calls("-h") == 2
+
+    def test_cached_commands(self):
+        def run(args):
+            start = time.time()
+            self.runner.run(args, cached=True)
+            return time.time() - start
+
+        # A cached command does not wait for another command that takes longer.
+        times = self.runner.map(run, [["sleep", "1"], ["true"], ["sleep", "1"]])
+        assert times[1] < 0.5
+        assert max(times) < 1.5
+
+        # Identical commands start a single process.
+        self.runner.map(lambda i: self.runner.run(["squeue", "-h", "-u", "foo"], cached=True), range(4))
+        assert self.num_calls("-h") == 1
+
+    def test_timeout_and_map(self):
+        results = self.runner.run(["sleep", "10"], timeout=0.2)
+        assert results.timed_out and results.returncode != 0
+        assert not self.runner.run(["true"]).timed_out
+
+        # The commands are executed in parallel.
+        start = time.time()
+        results = self.runner.map(lambda i: self.runner.run(["sleep", "0.5"]), range(4))
+        assert time.time() - start < 1.5
+        assert [r.returncode for r in results] == [0] * 4
+
+
 if __name__ == '__main__':
     import unittest2 as unittest
     unittest.main()
@@ -591,12 +591,17 @@ class Work(BaseWork, NodeContainer):
         else:
             return status_list
 
-    def check_status(self):
-        """Check the status of the tasks."""
+    def check_status(self, queue_ids=None):
+        """
+        Check the status of the tasks.
+
+        Args:
+            queue_ids: Set with the identifiers of the jobs in the queue, passed to task.check_status.
+        """
         # Recompute the status of the tasks
         for task in self:
             if task.status == task.S_LOCKED: continue
-            task.check_status()
+            task.check_status(queue_ids=queue_ids)
 
         # Take into account possible dependencies. Use a list instead of generators 
         for task in self:
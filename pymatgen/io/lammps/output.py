@@ -14,6 +14,8 @@ This module implements classes for processing Lammps output files:
     trajectory file: the file generated by the 'dump' command
 """
 
+import itertools
+import os
 import re
 from io import open
 
@@ -22,6 +24,7 @@ import numpy as np
 from pymatgen.core.periodic_table import _pt_data
 from pymatgen.core.structure import Molecule
 from pymatgen.core.lattice import Lattice
+from pymatgen.core.trajectory import Trajectory
 from pymatgen.analysis.diffusion_analyzer import DiffusionAnalyzer
 from pymatgen.io.lammps.data import LammpsData, LammpsForceFieldData
 
@@ -39,10 +42,19 @@ class LammpsRun(object):
         data_file (str): path to the data file
         trajectory_file (str): path to the trajectory file
         log_file (str): path to the log file
+        is_forcefield (bool): whether the data file is a force field data
+            file
+        trajectory_stride (int): only parse every trajectory_stride-th
+            frame of the trajectory file. The other frames are skipped
+            without being parsed.
+        cache_trajectory (bool): whether to cache the parsed trajectory
+            as .npy files next to the trajectory file. The cache is used
+            by later runs as long as it is newer than the trajectory file.
     """
 
     def __init__(self, data_file, trajectory_file, log_file="log.lammps",
-                 is_forcefield=False):
+                 is_forcefield=False, trajectory_stride=1,
+                 cache_trajectory=False):
         self.data_file = data_file
         self.trajectory_file = trajectory_file
         self.log_file = log_file
@@ -52,66 +64,78 @@ class LammpsRun(object):
         else:
             self.lammps_data = LammpsData.from_file(data_file)
         self._set_mol_masses_and_charges()
-        self._parse_trajectory()
+        self._parse_trajectory(trajectory_stride, cache_trajectory)
 
-    def _parse_trajectory(self):
+    def _parse_trajectory(self, stride=1, cache=False):
         """
         parse the trajectory file.
+
+        Each "ITEM: ATOMS" section is read as a block and converted at once
+        to a structured array sorted by atom id. The first 2 fields of the
+        atoms section must be the id and the atom type. There can be an
+        arbitrary number of fields after that and they all will be treated
+        as floats.
+
+        Args:
+            stride (int): only parse every stride-th frame.
+            cache (bool): whether to load/save the parsed trajectory from/to
+                .npy files.
         """
+        cache_prefix = "{}.stride{}".format(self.trajectory_file, stride)
+        cache_files = [cache_prefix + ".npy", cache_prefix + "_timesteps.npy"]
+        if cache and all(os.path.exists(f) and os.path.getmtime(f) >=
+                         os.path.getmtime(self.trajectory_file)
+                         for f in cache_files):
+            self.trajectory = np.load(cache_files[0])
+            self.timesteps = np.load(cache_files[1])
+            return
+
         traj_timesteps = []
-        trajectory = []
-        timestep_label = "ITEM: TIMESTEP"
-        # "ITEM: ATOMS id type ...
-        traj_label_pattern = re.compile(
-            "^\s*ITEM:\s+ATOMS\s+id\s+type\s+([A-Za-z\s]*)")
-        # default: id type x y z vx vy vz mol"
-        # updated below based on the field names in the ITEM: ATOMS line
-        # Note: the first 2 fields must be the id and the atom type. There can be
-        # arbitrary number of fields after that and they all will be treated as floats.
-        traj_pattern = re.compile(
-            "\s*(\d+)\s+(\d+)\s+([0-9eE\.+-]+)\s+([0-9eE\.+-]+)\s+"
-            "([0-9eE\.+-]+)\s+"
-            "([0-9eE\.+-]+)\s+"
-            "([0-9eE\.+-]+)\s+([0-9eE\.+-]+)\s+(\d+)\s*")
-        parse_timestep = False
+        frames = []
+        traj_dtype = None
+        natoms = None
+        timestep = None
+        nframes = 0
         with open(self.trajectory_file) as tf:
             for line in tf:
-                if timestep_label in line:
-                    parse_timestep = True
-                    continue
-                if parse_timestep:
-                    traj_timesteps.append(float(line))
-                    parse_timestep = False
-                if traj_label_pattern.search(line):
-                    fields = traj_label_pattern.search(line).group(1)
-                    fields = fields.split()
-                    # example:- id type x y z vx vy vz mol ...
-                    traj_pattern_string = "\s*(\d+)\s+(\d+)" + "".join(
-                        ["\s+([0-9eE\.+-]+)"
-                         for _ in range(len(fields))])
-                    traj_pattern = re.compile(traj_pattern_string)
-                if traj_pattern.search(line):
-                    # first 2 fields must be id and type, the rest of them
-                    # will be casted as floats
-                    m = traj_pattern.search(line)
-                    line_data = []
-                    line_data.append(int(m.group(1)) - 1)
-                    line_data.append(int(m.group(2)))
-                    line_data.extend(
-                        [float(x) for i, x in enumerate(m.groups()) if
-                         i + 1 > 2])
-                    trajectory.append(tuple(line_data))
-        traj_dtype = np.dtype([(str('Atoms_id'), np.int64),
-                               (str('atom_type'), np.int64)] +
-                              [(str(fld), np.float64)
-                               for fld in fields])
-        self.trajectory = np.array(trajectory, dtype=traj_dtype)
+                if line.startswith("ITEM: TIMESTEP"):
+                    timestep = float(next(tf))
+                elif line.startswith("ITEM: NUMBER OF ATOMS"):
+                    natoms = int(next(tf))
+                elif line.startswith("ITEM: ATOMS"):
+                    lines = list(itertools.islice(tf, natoms))
+                    if nframes % stride == 0:
+                        # example:- id type x y z vx vy vz mol ...
+                        fields = line.split()[4:]
+                        if traj_dtype is None or \
+                                traj_dtype.names[2:] != tuple(fields):
+                            traj_dtype = np.dtype(
+                                [(str('Atoms_id'), np.int64),
+                                 (str('atom_type'), np.int64)] +
+                                [(str(fld), np.float64) for fld in fields])
+                        frames.append(_parse_atoms_block(lines, traj_dtype))
+                        traj_timesteps.append(timestep)
+                    nframes += 1
+        self.trajectory = np.concatenate(frames)
         self.timesteps = np.array(traj_timesteps, dtype=np.float64)
-        for step in range(self.timesteps.size):
-            begin = step * self.natoms
-            end = (step + 1) * self.natoms
-            self.trajectory[begin:end] = np.sort(self.trajectory[begin:end],
-                                                 order=str("Atoms_id"))
+        if cache:
+            np.save(cache_files[0], self.trajectory)
+            np.save(cache_files[1], self.timesteps)
+
+    def get_frame_vectors(self, fields=("x", "y", "z")):
+        """
+        Returns the given per-atom fields of all the time steps as a single
+        array.
+
+        Args:
+            fields (list): names of the fields, e.g. ["x", "y", "z"] or
+                ["vx", "vy", "vz"]
+
+        Returns:
+            numpy array of shape (n_timesteps, natoms, len(fields))
+        """
+        return np.column_stack([self.trajectory[f] for f in fields]).reshape(
+            (self.timesteps.size, -1, len(fields)))
 
     def _set_mol_masses_and_charges(self):
         """
@@ -170,11 +194,8 @@ class LammpsRun(object):
         """
         begin = step * self.natoms
         end = (step + 1) * self.natoms
-        mol_vector_structured = \
-            self.trajectory[begin:end][self.mol_config[mol_id]][param]
-        new_shape = mol_vector_structured.shape + (-1,)
-        mol_vector = mol_vector_structured.view(np.float64).reshape(new_shape)
-        return mol_vector.copy()
+        atoms = self.trajectory[begin:end][self.mol_config[mol_id]]
+        return np.column_stack([atoms[p] for p in param])
 
     # TODO: remove this and use only get_displacements(an order of magnitude faster)
     def get_structures_from_trajectory(self):
@@ -185,22 +206,9 @@ class LammpsRun(object):
         Returns:
             list of Structure objects
         """
+        species = self._get_species()
         structures = []
-        mass_to_symbol = dict(
-            (round(y["Atomic mass"], 1), x) for x, y in _pt_data.items())
-        unique_atomic_masses = np.array(self.lammps_data.atomic_masses)[:, 1]
-        for step in range(self.timesteps.size):
-            begin = step * self.natoms
-            end = (step + 1) * self.natoms
-            mol_vector_structured = \
-                self.trajectory[begin:end][:][["x", "y", "z"]]
-            new_shape = mol_vector_structured.shape + (-1,)
-            mol_vector = mol_vector_structured.view(np.float64).reshape(
-                new_shape)
-            coords = mol_vector.copy()
-            species = [
-                mass_to_symbol[round(unique_atomic_masses[atype - 1], 1)]
-                for atype in self.trajectory[begin:end][:]["atom_type"]]
+        for step, coords in enumerate(self.get_frame_vectors()):
             mol = Molecule(species, coords)
             try:
                 boxed_mol = mol.get_boxed_structure(*self.box_lengths)
@@ -222,35 +230,47 @@ class LammpsRun(object):
         lattice = Lattice([[self.box_lengths[0], 0, 0],
                            [0, self.box_lengths[1], 0],
                            [0, 0, self.box_lengths[2]]])
-        mass_to_symbol = dict(
-            (round(y["Atomic mass"], 1), x) for x, y in _pt_data.items())
-        unique_atomic_masses = np.array(self.lammps_data.atomic_masses)[:, 1]
-        frac_coords = []
-        for step in range(self.timesteps.size):
-            begin = step * self.natoms
-            end = (step + 1) * self.natoms
-            mol_vector_structured = \
-                self.trajectory[begin:end][:][["x", "y", "z"]]
-            new_shape = mol_vector_structured.shape + (-1,)
-            mol_vector = mol_vector_structured.view(np.float64).reshape(
-                new_shape)
-            coords = mol_vector.copy()
-            if step == 0:
-                species = [
-                    mass_to_symbol[round(unique_atomic_masses[atype - 1], 1)]
-                    for atype in self.trajectory[begin:end][:]["atom_type"]]
-                mol = Molecule(species, coords)
-                structure = mol.get_boxed_structure(*self.box_lengths)
-            step_frac_coords = [lattice.get_fractional_coords(crd) for crd in
-                                coords]
-            frac_coords.append(np.array(step_frac_coords)[:, None])
-        frac_coords = np.concatenate(frac_coords, axis=1)
+        coords = self.get_frame_vectors()
+        mol = Molecule(self._get_species(), coords[0])
+        structure = mol.get_boxed_structure(*self.box_lengths)
+        frac_coords = np.transpose(lattice.get_fractional_coords(coords),
+                                   (1, 0, 2))
         dp = frac_coords[:, 1:] - frac_coords[:, :-1]
         dp = dp - np.round(dp)
         f_disp = np.cumsum(dp, axis=1)
         disp = lattice.get_cartesian_coords(f_disp)
         return structure, disp
 
+    def _get_species(self):
+        """
+        Element symbols of the atoms, guessed from their masses.
+        """
+        mass_to_symbol = dict(
+            (round(y["Atomic mass"], 1), x) for x, y in _pt_data.items())
+        unique_atomic_masses = np.array(self.lammps_data.atomic_masses)[:, 1]
+        return [mass_to_symbol[round(unique_atomic_masses[atype - 1], 1)]
+                for atype in self.trajectory[:self.natoms]["atom_type"]]
+
+    def get_trajectory(self):
+        """
+        Returns the dumped atomic positions as a Trajectory, with the
+        fractional coordinates of all time steps obtained at once from the
+        parsed trajectory array.
+
+        Returns:
+            Trajectory
+        """
+        box = np.array(self.lammps_data.box_size, dtype=np.float64)
+        lattice = Lattice(np.diag(box[:, 1] - box[:, 0]))
+        frac_coords = (self.get_frame_vectors() - box[:, 0]) / \
+            (box[:, 1] - box[:, 0])
+        time_step = None
+        if self.timesteps.size > 1:
+            time_step = (self.timesteps[1] - self.timesteps[0]) * \
+                self.lammps_log.timestep
+        return Trajectory(lattice, self._get_species(), frac_coords,
+                          time_step=time_step)
+
     def get_diffusion_analyzer(self, specie, temperature, time_step, step_skip,
                                smoothed=None,
                                min_obs=30, avg_nsteps=1000):
@@ -389,6 +409,29 @@ class LammpsLog(object):
         self.thermo_data = np.array(thermo_data, dtype=thermo_data_dtype)
 
 
+def _parse_atoms_block(lines, traj_dtype):
+    """
+    Parse the lines of an "ITEM: ATOMS" section of a dump file at once.
+
+    Args:
+        lines ([str]): lines of the section, one per atom
+        traj_dtype (numpy.dtype): structured dtype of the atoms, starting with
+            the atom id and type fields
+
+    Returns:
+        structured numpy array of the atoms, sorted by atom id. The atom ids
+        start from 0.
+    """
+    data = np.fromstring(" ".join(lines).encode("ascii"), sep=" ")
+    data = data.reshape((len(lines), len(traj_dtype.names)))
+    data = data[np.argsort(data[:, 0], kind="mergesort")]
+    atoms = np.empty(len(lines), dtype=traj_dtype)
+    atoms["Atoms_id"] = data[:, 0] - 1
+    for i, fld in enumerate(traj_dtype.names[1:]):
+        atoms[fld] = data[:, i + 1]
+    return atoms
+
+
 def pbc_wrap(array, box_lengths):
     """
     wrap the array for molecule coordinates around the periodic boundary.
@@ -4,6 +4,8 @@ from __future__ import division, print_function, unicode_literals, \
     absolute_import
 
 import os
+import shutil
+import tempfile
 import unittest
 
 import numpy as np
@@ -57,6 +59,56 @@ class TestLammpsOutput(unittest.TestCase):
                                            trajectory_ans[:, i + 1],
                                            decimal=10)
 
+    def test_get_trajectory(self):
+        traj = self.lammpsrun.get_trajectory()
+        natoms = self.lammpsrun.natoms
+        self.assertEqual(traj.frac_coords.shape,
+                         (self.lammpsrun.timesteps.size, natoms, 3))
+        self.assertTrue(traj.constant_lattice)
+        np.testing.assert_almost_equal(traj.lattice.abc,
+                                       self.lammpsrun.box_lengths)
+        np.testing.assert_almost_equal(
+            traj.get_cart_coords()[1][:, 0] +
+            self.lammpsrun.lammps_data.box_size[0][0],
+            self.lammpsrun.trajectory[natoms:2 * natoms]["x"])
+        self.assertEqual(traj[0].composition,
+                         traj[traj.frac_coords.shape[0] - 1].composition)
+
+    def test_get_displacements(self):
+        structure, disp = self.lammpsrun.get_displacements()
+        natoms = self.lammpsrun.natoms
+        nsteps = self.lammpsrun.timesteps.size
+        self.assertEqual(len(structure), natoms)
+        self.assertEqual(disp.shape, (natoms, nsteps - 1, 3))
+        traj = self.lammpsrun.get_trajectory()
+        f_disp = traj.get_frac_displacements()
+        np.testing.assert_almost_equal(
+            traj.lattice.get_cartesian_coords(f_disp)[:, 1:], disp)
+
+    def test_trajectory_stride_and_cache(self):
+        data_file = os.path.join(test_dir, "nvt.data")
+        log_file = os.path.join(test_dir, "nvt.log")
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            traj_file = os.path.join(tmp_dir, "nvt.dump")
+            shutil.copy(os.path.join(test_dir, "nvt.dump"), traj_file)
+            natoms = self.lammpsrun.natoms
+            for i in range(2):
+                # The second run loads the cached trajectory.
+                run = LammpsRun(data_file, traj_file, log_file,
+                                is_forcefield=True, trajectory_stride=3,
+                                cache_trajectory=True)
+                np.testing.assert_almost_equal(
+                    run.timesteps, self.lammpsrun.timesteps[::3])
+                self.assertEqual(run.trajectory.size,
+                                 run.timesteps.size * natoms)
+                np.testing.assert_almost_equal(
+                    run.trajectory["x"][natoms:2 * natoms],
+                    self.lammpsrun.trajectory["x"][3 * natoms:4 * natoms])
+                self.assertTrue(os.path.exists(traj_file + ".stride3.npy"))
+        finally:
+            shutil.rmtree(tmp_dir)
+
 
 if __name__ == "__main__":
     unittest.main()
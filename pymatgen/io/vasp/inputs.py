@@ -1304,6 +1304,10 @@ class Kpoints(MSONable):
                    tet_connections=d.get("tet_connections"))
 
 
+# Parsed PotcarSingle objects, by (VASP_PSP_DIR, functional, symbol).
+_POTCAR_CACHE = {}
+
+
 def get_potcar_dir():
     if "VASP_PSP_DIR" in os.environ:
         return os.environ["VASP_PSP_DIR"]
@@ -1513,11 +1517,26 @@ class PotcarSingle(object):
 
     @staticmethod
     def from_symbol_and_functional(symbol, functional="PBE"):
+        """
+        Returns the POTCAR of symbol for a functional from the VASP_PSP_DIR
+        directory. The POTCARs are cached by directory, functional and symbol,
+        so that each file is only read and parsed once. The returned object is
+        shared and should not be modified.
+        """
         funcdir = PotcarSingle.functional_dir[functional]
         d = get_potcar_dir()
         if d is None:
             raise ValueError("No POTCAR directory found. Please set "
                              "the VASP_PSP_DIR environment variable")
+        key = (d, functional, symbol)
+        if key not in _POTCAR_CACHE:
+            _POTCAR_CACHE[key] = PotcarSingle._from_potcar_dir(d, funcdir,
+                                                               symbol,
+                                                               functional)
+        return _POTCAR_CACHE[key]
+
+    @staticmethod
+    def _from_potcar_dir(d, funcdir, symbol, functional):
         paths_to_try = [os.path.join(d, funcdir, "POTCAR.{}".format(symbol)),
                         os.path.join(d, funcdir, symbol, "POTCAR")]
         for p in paths_to_try:
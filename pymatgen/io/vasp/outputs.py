@@ -17,6 +17,7 @@ from io import StringIO
 
 import numpy as np
 from monty.io import zopen, reverse_readfile
+from monty.functools import lazy_property
 from monty.json import MSONable
 from monty.json import jsanitize
 from monty.re import regrep
@@ -28,6 +29,7 @@ from pymatgen.core.composition import Composition
 from pymatgen.core.lattice import Lattice
 from pymatgen.core.periodic_table import Element
 from pymatgen.core.structure import Structure
+from pymatgen.core.trajectory import Trajectory
 from pymatgen.core.units import unitized
 from pymatgen.electronic_structure.bandstructure import BandStructure, \
     BandStructureSymmLine, get_reconstructed_band_structure
@@ -116,6 +118,14 @@ def _parse_v_parameters(val_type, val, filename, param_name):
     return val
 
 
+def _parse_coords(lines):
+    """
+    Parses lines of coordinates (with optional trailing fields) into a
+    N x 3 array.
+    """
+    return np.array([l.split()[:3] for l in lines], dtype=np.float64)
+
+
 def _parse_varray(elem):
     return [[_vasprun_float(i) for i in v.text.split()] for v in elem]
 
@@ -151,6 +161,86 @@ def _vasprun_float(f):
         raise e
 
 
+# Blocks skipped in the summary mode of Vasprun, and iterparse events of this
+# mode (native strings, as required by cElementTree in Python 2).
+_SUMMARY_SKIPPED_TAGS = ("dos", "eigenvalues", "projected")
+_SUMMARY_EVENTS = (str("start"), str("end"))
+_SUMMARY_TAG = re.compile(r"</?(calculation|dos|eigenvalues|projected)\b")
+_SUMMARY_TAG_LINE = re.compile(
+    r"\s*<(/?)(calculation|dos|eigenvalues|projected)\b[^<>]*>\s*$")
+_SUMMARY_EFERMI_LINE = re.compile(r'\s*<i name="efermi">[^<>]*</i>\s*$')
+
+
+def _get_summary_xml(stream):
+    """
+    Helper function for the summary mode of Vasprun. Filters the lines of a
+    vasprun.xml to remove all ionic steps but the last one, as well as the
+    dos (except for the fermi energy), eigenvalues and projected eigenvalues
+    blocks, without parsing the xml. This relies on the layout of the
+    vasprun.xml written by VASP, in which the tags of these blocks and the
+    fermi energy are on their own lines.
+
+    Returns:
+        (filtered xml string, number of ionic steps), or None if the file
+        does not have the expected layout (or is incomplete), in which case
+        the blocks have to be skipped while the xml is parsed.
+    """
+    lines = []
+    calculation = None
+    out = lines
+    nionic_steps = 0
+    end_tag = None
+    for line in stream:
+        if _SUMMARY_TAG.search(line):
+            m = _SUMMARY_TAG_LINE.match(line)
+            if m is None:
+                return None
+            closing, tag = m.groups()
+        elif end_tag != "dos" or 'name="efermi"' not in line:
+            if end_tag is None:
+                out.append(line)
+            continue
+        elif _SUMMARY_EFERMI_LINE.match(line):
+            # Fermi energy in a skipped dos block.
+            out.append(line)
+            continue
+        else:
+            return None
+
+        if end_tag is not None:
+            # Inside a skipped block, only its end matters.
+            if closing and tag == end_tag:
+                end_tag = None
+                if tag == "dos":
+                    out.append(line)
+        elif tag == "calculation":
+            if not closing:
+                if out is not lines:
+                    return None
+                nionic_steps += 1
+                if calculation is not None:
+                    # Only the last ionic step is kept.
+                    del calculation[:]
+                calculation = [line]
+                lines.append(calculation)
+                out = calculation
+            else:
+                if out is lines:
+                    return None
+                calculation.append(line)
+                out = lines
+        elif closing:
+            return None
+        else:
+            end_tag = tag
+            if tag == "dos":
+                out.append(line)
+    if end_tag is not None or out is not lines:
+        return None
+    return "".join("".join(l) if isinstance(l, list) else l
+                   for l in lines), nionic_steps
+
+
 class Vasprun(MSONable):
     """
     Vastly improved cElementTree-based parser for vasprun.xml files. Uses
@@ -198,6 +288,14 @@ class Vasprun(MSONable):
             proper vasprun.xml are parsed. You can set to False if you want
             partial results (e.g., if you are monitoring a calculation during a
             run), but use the results with care. A warning is issued.
+        summary_only (bool): Whether to parse only what is needed to build a
+            ComputedEntry, e.g., for the drones. Only the last ionic step is
+            parsed (ionic_steps and structures contain only this step) and
+            the dos (except for the fermi energy), the eigenvalues and the
+            projected eigenvalues are skipped. These blocks are filtered out
+            of the lines of the file before the xml is parsed, or skipped by
+            the parser if the file does not have the layout written by VASP.
+            This is much faster for large runs. Defaults to False.
 
     **Vasp results**
 
@@ -346,7 +444,7 @@ class Vasprun(MSONable):
                  ionic_step_offset=0, parse_dos=True,
                  parse_eigen=True, parse_projected_eigen=False,
                  parse_potcar_file=True, occu_tol=1e-8,
-                 exception_on_bad_xml=True):
+                 exception_on_bad_xml=True, summary_only=False):
         self.filename = filename
         self.ionic_step_skip = ionic_step_skip
         self.ionic_step_offset = ionic_step_offset
@@ -354,7 +452,17 @@ class Vasprun(MSONable):
         self.exception_on_bad_xml = exception_on_bad_xml
 
         with zopen(filename, "rt") as f:
-            if ionic_step_skip or ionic_step_offset:
+            summary = _get_summary_xml(f) if summary_only else None
+            if summary is not None:
+                to_parse, self.nionic_steps = summary
+                self._parse(StringIO(to_parse), parse_dos=False,
+                            parse_eigen=False, parse_projected_eigen=False)
+            elif summary_only:
+                # Unexpected layout, the blocks are skipped by the parser.
+                f.seek(0)
+                self._parse(f, parse_dos=False, parse_eigen=False,
+                            parse_projected_eigen=False, summary_only=True)
+            elif ionic_step_skip or ionic_step_offset:
                 # remove parts of the xml file and parse the string
                 run = f.read()
                 steps = run.split("<calculation>")
@@ -388,15 +496,52 @@ class Vasprun(MSONable):
             msg += "Ionic convergence reached: %s." % self.converged_ionic
             warnings.warn(msg, UnconvergedVASPWarning)
 
-    def _parse(self, stream, parse_dos, parse_eigen, parse_projected_eigen):
+    def _parse(self, stream, parse_dos, parse_eigen, parse_projected_eigen,
+               summary_only=False):
+        """
+        Parses the vasprun.xml. In the summary mode, the dos, eigenvalues and
+        projected blocks are skipped (only the fermi energy is read) and only
+        the last calculation is parsed. nionic_steps is set as well.
+        """
         self.efermi = None
         self.eigenvalues = None
         self.projected_eigenvalues = None
         self.other_dielectric = {}
         ionic_steps = []
         parsed_header = False
+        # Summary mode: element whose subtree is skipped, and last calculation.
+        skipped = None
+        last_calculation = None
+        nionic_steps = 0
         try:
-            for event, elem in ET.iterparse(stream):
+            for event, elem in ET.iterparse(
+                    stream, events=_SUMMARY_EVENTS if summary_only else None):
+                if summary_only:
+                    if event == "start":
+                        if skipped is None and \
+                                elem.tag in _SUMMARY_SKIPPED_TAGS:
+                            skipped = elem
+                        continue
+                    if skipped is not None:
+                        if elem is not skipped:
+                            continue
+                        skipped = None
+                        if elem.tag == "dos":
+                            # Only the fermi energy, which is cheap to read.
+                            efermi = elem.find("i")
+                            if efermi is not None and \
+                                    efermi.attrib.get("name") == "efermi":
+                                self.efermi = float(efermi.text)
+                        elem.clear()
+                        continue
+                    if elem.tag == "calculation":
+                        # Only the last calculation is parsed, at the end.
+                        parsed_header = True
+                        nionic_steps += 1
+                        if last_calculation is not None:
+                            last_calculation.clear()
+                        last_calculation = elem
+                        continue
                 tag = elem.tag
                 if not parsed_header:
                     if tag == "generator":
@@ -428,6 +573,13 @@ class Vasprun(MSONable):
                         self.dos_has_errors = False
                     except Exception as ex:
                         self.dos_has_errors = True
+                elif tag == "dos":
+                    # Only the fermi energy, which is cheap to read.
+                    efermi = elem.find("i")
+                    if efermi is not None and \
+                            efermi.attrib.get("name") == "efermi":
+                        self.efermi = float(efermi.text)
+                    elem.clear()
                 elif parse_eigen and tag == "eigenvalues":
                     self.eigenvalues = self._parse_eigen(elem)
                 elif parse_projected_eigen and tag == "projected":
@@ -463,6 +615,10 @@ class Vasprun(MSONable):
                 warnings.warn(
                     "XML is malformed. Parsing has stopped but partial data"
                     "is available.", UserWarning)
+        if summary_only:
+            if last_calculation is not None:
+                ionic_steps.append(self._parse_calculation(last_calculation))
+            self.nionic_steps = nionic_steps
         self.ionic_steps = ionic_steps
         self.vasp_version = self.generator["version"]
 
@@ -470,6 +626,20 @@ class Vasprun(MSONable):
     def structures(self):
         return [step["structure"] for step in self.ionic_steps]
 
+    def get_trajectory(self):
+        """
+        Returns the ionic steps as a Trajectory, e.g., to perform diffusion
+        analysis of a MD run with DiffusionAnalyzer.from_trajectory. The time
+        step is POTIM times the ionic_step_skip.
+
+        Returns:
+            Trajectory
+        """
+        return Trajectory.from_structures(
+            (step["structure"] for step in self.ionic_steps),
+            time_step=self.parameters.get("POTIM", 0) *
+            (self.ionic_step_skip or 1))
+
     @property
     def epsilon_static(self):
         """
@@ -521,7 +691,7 @@ class Vasprun(MSONable):
         exited before reaching the max ionic steps for a relaxation run
         """
         nsw = self.parameters.get("NSW", 0)
-        return nsw <= 1 or len(self.ionic_steps) < nsw
+        return nsw <= 1 or self.nionic_steps < nsw
 
     @property
     def converged(self):
@@ -2723,9 +2893,16 @@ class Xdatcar(object):
     """
     Class representing an XDATCAR file. Only tested with VASP 5.x files.
 
+    .. attribute:: trajectory
+
+        Trajectory parsed from XDATCAR. The coordinates of the frames are
+        read directly into the Trajectory array, without creating a Poscar
+        or Structure for each frame.
+
     .. attribute:: structures
 
-        List of structures parsed from XDATCAR.
+        List of structures parsed from XDATCAR. The list is created from
+        the trajectory on first access.
     """
 
     def __init__(self, filename):
@@ -2737,7 +2914,8 @@ class Xdatcar(object):
         """
         preamble = None
         coords_str = []
-        structures = []
+        first_coords_str = None
+        frames = []
         preamble_done = False
         with zopen(filename, "rt") as f:
             for l in f:
@@ -2757,16 +2935,24 @@ class Xdatcar(object):
                     else:
                         preamble.append(l)
                 elif l == "" or "Direct configuration=" in l:
-                    p = Poscar.from_string("\n".join(preamble +
-                                                     ["Direct"] + coords_str))
-                    structures.append(p.structure)
+                    if coords_str:
+                        first_coords_str = first_coords_str or coords_str
+                        frames.append(_parse_coords(coords_str))
                     coords_str = []
                 else:
                     coords_str.append(l)
-            p = Poscar.from_string("\n".join(preamble +
-                                             ["Direct"] + coords_str))
-            structures.append(p.structure)
-        self.structures = structures
+            if coords_str:
+                first_coords_str = first_coords_str or coords_str
+                frames.append(_parse_coords(coords_str))
+        # The lattice and species are obtained from the first frame only.
+        p = Poscar.from_string("\n".join(preamble + ["Direct"] +
+                                         first_coords_str))
+        lattice, species = p.structure.lattice, p.structure.species
+        self.trajectory = Trajectory(lattice, species, frames)
+
+    @lazy_property
+    def structures(self):
+        return list(self.trajectory)
 
 
 class Dynmat(object):
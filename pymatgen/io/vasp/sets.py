@@ -13,6 +13,7 @@ import shutil
 from functools import partial
 from glob import glob
 import warnings
+from copy import deepcopy
 
 import six
 import numpy as np
@@ -46,6 +47,22 @@ __date__ = "Nov 16, 2011"
 
 MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
 
+# Content of the config files of the input sets, by path.
+_CONFIG_CACHE = {}
+
+
+def _load_config(filename):
+    """
+    Returns a copy of the content of a yaml/json config file. The file is
+    only read again if it has been modified, and a copy is returned since the
+    input sets modify their settings.
+    """
+    filename = os.path.abspath(filename)
+    mtime = os.path.getmtime(filename)
+    if filename not in _CONFIG_CACHE or _CONFIG_CACHE[filename][0] != mtime:
+        _CONFIG_CACHE[filename] = (mtime, loadfn(filename))
+    return deepcopy(_CONFIG_CACHE[filename][1])
+
 
 class AbstractVaspInputSet(six.with_metaclass(abc.ABCMeta, MSONable)):
     """
@@ -473,7 +490,7 @@ class DictVaspInputSet(AbstractVaspInputSet):
         Returns:
             DictVaspInputSet
         """
-        return DictVaspInputSet(name, loadfn(filename), **kwargs)
+        return DictVaspInputSet(name, _load_config(filename), **kwargs)
 
 
 MITVaspInputSet = partial(DictVaspInputSet.from_file, "MIT",
@@ -530,7 +547,7 @@ class MITNEBVaspInputSet(DictVaspInputSet):
                  sort_structure=False, **kwargs):
         super(MITNEBVaspInputSet, self).__init__(
             "MIT NEB",
-            loadfn(os.path.join(MODULE_DIR, "MITVaspInputSet.yaml")),
+            _load_config(os.path.join(MODULE_DIR, "MITVaspInputSet.yaml")),
             ediff_per_atom=False, sort_structure=False,
             **kwargs)
         self.endpoint_set = MITVaspInputSet(ediff_per_atom=False, sort_structure=False)
@@ -679,7 +696,7 @@ class MITMDVaspInputSet(DictVaspInputSet):
             defaults.update(user_incar_settings)
         super(MITMDVaspInputSet, self).__init__(
             "MIT MD",
-            loadfn(os.path.join(MODULE_DIR, "MITVaspInputSet.yaml")),
+            _load_config(os.path.join(MODULE_DIR, "MITVaspInputSet.yaml")),
             hubbard_off=hubbard_off, sort_structure=sort_structure,
             user_incar_settings=defaults, **kwargs)
 
@@ -783,7 +800,7 @@ class MPStaticVaspInputSet(DictVaspInputSet):
     def __init__(self, kpoints_density=90, sym_prec=0.1, **kwargs):
         super(MPStaticVaspInputSet, self).__init__(
             "MP Static",
-            loadfn(os.path.join(MODULE_DIR, "MPVaspInputSet.yaml")),
+            _load_config(os.path.join(MODULE_DIR, "MPVaspInputSet.yaml")),
             **kwargs)
         self.incar_settings.update(
             {"IBRION": -1, "ISMEAR": -5, "LAECHG": True, "LCHARG": True,
@@ -988,7 +1005,7 @@ class MPStaticDielectricDFPTVaspInputSet(DictVaspInputSet):
     def __init__(self, user_incar_settings=None, ionic=True):
         super(MPStaticDielectricDFPTVaspInputSet, self).__init__(
             "Materials Project Static Dielectric DFPT",
-            loadfn(os.path.join(MODULE_DIR, "MPVaspInputSet.yaml")))
+            _load_config(os.path.join(MODULE_DIR, "MPVaspInputSet.yaml")))
         self.user_incar_settings = user_incar_settings if \
             user_incar_settings is not None else {}
         self.incar_settings.update(self.user_incar_settings)
@@ -1029,7 +1046,7 @@ class MPBSHSEVaspInputSet(DictVaspInputSet):
                  kpoints_density=None, kpoints_line_density=20):
         super(MPBSHSEVaspInputSet, self).__init__(
             "Materials Project HSE Band Structure",
-            loadfn(os.path.join(MODULE_DIR, "MPHSEVaspInputSet.yaml")))
+            _load_config(os.path.join(MODULE_DIR, "MPHSEVaspInputSet.yaml")))
         self.user_incar_settings = user_incar_settings if \
             user_incar_settings is not None else {}
         self.incar_settings.update(
@@ -1141,7 +1158,7 @@ class MPNonSCFVaspInputSet(MPStaticVaspInputSet):
                              "'Uniform'!")
         DictVaspInputSet.__init__(self,
             "Materials Project Static",
-            loadfn(os.path.join(MODULE_DIR, "MPVaspInputSet.yaml")),
+            _load_config(os.path.join(MODULE_DIR, "MPVaspInputSet.yaml")),
             constrain_total_magmom=constrain_total_magmom,
             sort_structure=sort_structure)
         self.user_incar_settings = user_incar_settings
@@ -1497,7 +1514,7 @@ class MVLElasticInputSet(DictVaspInputSet):
     def __init__(self, potim=0.015, user_incar_settings=None):
         super(MVLElasticInputSet, self).__init__(
             "Materials Virtual Lab Elastic Constant Calculation",
-            loadfn(os.path.join(MODULE_DIR, "MPVaspInputSet.yaml")))
+            _load_config(os.path.join(MODULE_DIR, "MPVaspInputSet.yaml")))
         self.user_incar_settings = user_incar_settings or {}
         self.incar_settings.update(self.user_incar_settings)
         self.incar_settings.update({"IBRION": 6, "NFREE": 2, "POTIM": potim})
@@ -623,6 +623,9 @@ class PotcarSingleTest(unittest.TestCase):
             os.environ["VASP_PSP_DIR"] = test_potcar_dir
         p = PotcarSingle.from_symbol_and_functional("Li_sv", "PBE")
         self.assertEqual(p.enmax, 271.649)
+        # The parsed POTCARs are cached.
+        self.assertIs(PotcarSingle.from_symbol_and_functional("Li_sv", "PBE"),
+                      p)
 
     def test_functional_types(self):
         self.assertEqual(self.psingle.functional, 'PBE')
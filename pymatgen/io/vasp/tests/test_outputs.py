@@ -18,7 +18,10 @@ __date__ = "Jul 16, 2012"
 
 import unittest2 as unittest
 import os
+import re
 import json
+import shutil
+import tempfile
 import numpy as np
 import warnings
 
@@ -28,7 +31,8 @@ import xml.etree.cElementTree as ET
 from pymatgen.electronic_structure.core import OrbitalType
 from pymatgen.io.vasp.inputs import Kpoints
 from pymatgen.io.vasp.outputs import Chgcar, Locpot, Oszicar, Outcar, \
-    Vasprun, Procar, Xdatcar, Dynmat, BSVasprun, UnconvergedVASPWarning
+    Vasprun, Procar, Xdatcar, Dynmat, BSVasprun, UnconvergedVASPWarning, \
+    _get_summary_xml
 from pymatgen import Spin, Orbital, Lattice, Structure
 from pymatgen.entries.compatibility import MaterialsProjectCompatibility
 
@@ -59,6 +63,14 @@ class VasprunTest(unittest.TestCase):
         v = Vasprun(os.path.join(test_dir, "vasprun.xml.vdw"))
         self.assertAlmostEqual(v.final_energy, -9.78310677)
 
+    def test_get_trajectory(self):
+        v = Vasprun(os.path.join(test_dir, "vasprun.xml.vdw"))
+        t = v.get_trajectory()
+        self.assertEqual(len(t), len(v.ionic_steps))
+        # Relaxation with a variable cell.
+        self.assertFalse(t.constant_lattice)
+        self.assertEqual(t[-1], v.ionic_steps[-1]["structure"])
+
     def test_properties(self):
 
         filepath = os.path.join(test_dir, 'vasprun.xml.nonlm')
@@ -264,6 +276,58 @@ class VasprunTest(unittest.TestCase):
         self.assertEqual(vasprun_fc.normalmode_eigenvecs.shape, (48, 16, 3))
         self.assertTrue(np.allclose(vasprun_fc.normalmode_eigenvecs[33], nm_ans))
 
+    def test_summary_only(self):
+        for fname in ["vasprun.xml.vdw", "vasprun.xml.uniform",
+                      "vasprun.xml.unconverged"]:
+            filepath = os.path.join(test_dir, fname)
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                full = Vasprun(filepath, parse_potcar_file=False)
+                summary = Vasprun(filepath, parse_potcar_file=False,
+                                  summary_only=True)
+            self.assertEqual(len(summary.ionic_steps), 1)
+            self.assertEqual(summary.nionic_steps, len(full.ionic_steps))
+            self.assertEqual(summary.converged, full.converged)
+            self.assertEqual(summary.final_structure, full.final_structure)
+            self.assertEqual(summary.final_energy, full.final_energy)
+            self.assertEqual(summary.efermi, full.efermi)
+            self.assertEqual(summary.parameters, full.parameters)
+            self.assertEqual(summary.potcar_symbols, full.potcar_symbols)
+            self.assertIsNone(summary.eigenvalues)
+            self.assertEqual(summary.get_computed_entry(True).as_dict(),
+                             full.get_computed_entry(True).as_dict())
+
+    def test_summary_only_reflowed(self):
+        # Without the line layout written by VASP, the blocks are skipped by
+        # the xml parser.
+        tmpdir = tempfile.mkdtemp()
+        try:
+            for fname in ["vasprun.xml.uniform", "vasprun.xml.unconverged"]:
+                with open(os.path.join(test_dir, fname)) as f:
+                    xml = f.read()
+                reflowed = os.path.join(tmpdir, fname)
+                with open(reflowed, "w") as f:
+                    f.write(re.sub(r">\s+<", "><", xml))
+                with open(reflowed) as f:
+                    self.assertIsNone(_get_summary_xml(f))
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore")
+                    full = Vasprun(os.path.join(test_dir, fname),
+                                   parse_potcar_file=False)
+                    summary = Vasprun(reflowed, parse_potcar_file=False,
+                                      summary_only=True)
+                self.assertEqual(len(summary.ionic_steps), 1)
+                self.assertEqual(summary.nionic_steps, len(full.ionic_steps))
+                self.assertEqual(summary.final_structure,
+                                 full.final_structure)
+                self.assertEqual(summary.final_energy, full.final_energy)
+                self.assertEqual(summary.efermi, full.efermi)
+                self.assertIsNone(summary.eigenvalues)
+                self.assertEqual(summary.get_computed_entry(True).as_dict(),
+                                 full.get_computed_entry(True).as_dict())
+        finally:
+            shutil.rmtree(tmpdir)
+
     def test_Xe(self):
         vr = Vasprun(os.path.join(test_dir, 'vasprun.xml.xe'), parse_potcar_file=False)
         self.assertEquals(vr.atomic_symbols, ['Xe'])
@@ -665,6 +729,20 @@ class XdatcarTest(unittest.TestCase):
         for s in structures:
             self.assertEqual(s.formula, "Li2 O1")
 
+        t = x.trajectory
+        self.assertEqual(t.frac_coords.shape, (4, 3, 3))
+        self.assertTrue(t.constant_lattice)
+        self.assertTrue(np.allclose(t.frac_coords[0, 1], [0.75, 0.75, 0.75]))
+        self.assertAlmostEqual(t.lattice.volume, structures[0].volume)
+
+        # The structures are created once and can be modified or replaced.
+        self.assertIs(x.structures, structures)
+        structures[0].translate_sites([0], [0.1, 0, 0])
+        self.assertTrue(np.allclose(x.structures[0][0].frac_coords,
+                                    t.frac_coords[0, 0] + [0.1, 0, 0]))
+        x.structures = structures[1:]
+        self.assertEqual(len(x.structures), 3)
+
 
 class DynmatTest(unittest.TestCase):
 
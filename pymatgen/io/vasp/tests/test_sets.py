@@ -314,6 +314,17 @@ class MITMPVaspInputSetTest(unittest.TestCase):
         d = self.mitparamset.get_all_vasp_input(self.struct)
         self.assertEqual(d["INCAR"]["ISMEAR"], 0)
 
+    def test_config_cache(self):
+        # The config files are loaded once, but each input set has its own
+        # copy of the settings.
+        mitparamset = MITVaspInputSet()
+        self.assertIsNot(mitparamset.incar_settings,
+                         self.mitparamset.incar_settings)
+        self.assertNotIn("LDAUU", self.mitggaparam.incar_settings)
+        self.assertIn("LDAUU", mitparamset.incar_settings)
+        self.assertNotEqual(MPVaspInputSet().incar_settings["MAGMOM"],
+                            self.userparamset.incar_settings["MAGMOM"])
+
     def test_to_from_dict(self):
         self.mitparamset = MITVaspInputSet()
         self.mithseparamset = MITHSEVaspInputSet()
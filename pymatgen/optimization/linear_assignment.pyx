@@ -73,6 +73,68 @@ class LinearAssignment(object):
         self.min_cost = compute(self.n, self.c, self._x, self._y, self.epsilon)
         self.solution = self._x[:self.nx]
 
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def linear_assignment_batch(costs, mask=None, epsilon=1e-13):
+    """
+    Solves many Linear Assignment Problems with cost matrices of the same
+    shape in a single call, with the same algorithm as LinearAssignment.
+    All the problems are solved without the GIL and without creating Python
+    objects, which dominate the time for small problems.
+
+    Args:
+        costs: Stack of cost matrices, of shape (m, nx, ny) with nx <= ny.
+            costs[k, i, j] is the cost of matching x[i] to y[j] in problem k.
+        mask: Boolean array of shape (nx, ny) shared by all the problems.
+            mask[i, j] = True indicates that x[i] cannot be matched to y[j].
+            These entries are given a cost of 1e20, as the masked distances
+            of pbc_shortest_vectors.
+        epsilon: Tolerance for determining if solution vector is < 0
+
+    Returns:
+        (solutions, min_costs): Integer array of shape (m, nx) with the
+        matching of the rows to columns of each problem and array of shape
+        (m,) with the minimum costs.
+    """
+    c = np.array(costs, dtype=np.float_, copy=False, order='C')
+    if c.ndim != 3:
+        raise ValueError("costs must be a stack of cost matrices")
+    nprob, nx, n = c.shape
+    if nx > n:
+        raise ValueError("cost matrix must have at least as many columns as rows")
+
+    if nx != n or mask is not None:
+        padded = np.zeros((nprob, n, n), dtype=np.float_)
+        padded[:, :nx] = c
+        if mask is not None:
+            mask = np.array(mask, dtype=np.bool_, copy=False)
+            if mask.shape != (nx, n):
+                raise ValueError("mask has incorrect shape")
+            padded[:, :nx][:, mask] = 1e20
+        c = padded
+
+    x = np.empty((nprob, n), dtype=np.int_)
+    y = np.empty((nprob, n), dtype=np.int_)
+    min_costs = np.empty(nprob, dtype=np.float_)
+
+    cdef np.float_t[:, :, ::1] cv = c
+    cdef np.int_t[:, ::1] xv = x
+    cdef np.int_t[:, ::1] yv = y
+    cdef np.float_t[:] mc = min_costs
+    cdef np.float_t eps = fabs(epsilon)
+    cdef int k, size = n
+    cdef int nk = nprob
+
+    if size > 0:
+        with nogil:
+            for k in range(nk):
+                mc[k] = compute(size, cv[k], xv[k], yv[k], eps)
+    else:
+        min_costs[:] = 0
+
+    return x[:, :nx], min_costs
+
 @cython.boundscheck(False)
 @cython.wraparound(False)
 cdef np.float_t compute(int size, np.float_t[:, :] c, np.int_t[:] x, np.int_t[:] y, np.float_t eps) nogil:
@@ -6,7 +6,8 @@ from __future__ import unicode_literals
 
 import unittest2 as unittest
 
-from pymatgen.optimization.linear_assignment import LinearAssignment
+from pymatgen.optimization.linear_assignment import LinearAssignment, \
+    linear_assignment_batch
 import numpy as np
 
 class LinearAssignmentTest(unittest.TestCase):
@@ -129,6 +130,30 @@ class LinearAssignmentTest(unittest.TestCase):
         #doesn't work properly
         self.assertEqual(la.orig_c.dtype, np.float64)
 
+    def test_batch(self):
+        np.random.seed(0)
+        costs = np.random.rand(20, 6, 8)
+        mask = np.random.rand(6, 8) < 0.3
+        solutions, min_costs = linear_assignment_batch(costs)
+        self.assertEqual(solutions.shape, (20, 6))
+        for c, s, m in zip(costs, solutions, min_costs):
+            la = LinearAssignment(c)
+            self.assertTrue(np.array_equal(s, la.solution))
+            self.assertAlmostEqual(m, la.min_cost)
+
+        solutions, min_costs = linear_assignment_batch(costs, mask)
+        for c, s, m in zip(costs, solutions, min_costs):
+            masked = c.copy()
+            masked[mask] = 1e20
+            la = LinearAssignment(masked)
+            self.assertTrue(np.array_equal(s, la.solution))
+            self.assertAlmostEqual(m, la.min_cost)
+            self.assertFalse(np.any(mask[np.arange(6), s]))
+
+        solutions, min_costs = linear_assignment_batch(np.zeros((0, 3, 3)))
+        self.assertEqual(solutions.shape, (0, 3))
+        self.assertRaises(ValueError, linear_assignment_batch, costs[:, :, :4])
+
 
 if __name__ == "__main__":
     #import sys;sys.argv = ['', 'Test.testName']
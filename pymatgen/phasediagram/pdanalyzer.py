@@ -57,6 +57,7 @@ class PDAnalyzer(object):
             pd: Phase Diagram to analyze.
         """
         self._pd = pd
+        self._facet_bary_data = None
 
     def _make_comp_matrix(self, complist):
         """
@@ -100,6 +101,123 @@ class PDAnalyzer(object):
                 for f, amt in zip(facet, decomp_amts)
                 if abs(amt[0]) > PDAnalyzer.numerical_tol}
 
+    def _get_facet_bary_data(self):
+        """
+        Returns the origins and the inverse basis matrices of the simplices of
+        all facets, stacked as arrays of shape (nfacets, dim-1) and
+        (nfacets, dim-1, dim-1). Computed once and stored on the analyzer.
+        """
+        if self._facet_bary_data is None:
+            simplices = np.array(self._pd.simplices, dtype=float)
+            origins = simplices[:, -1, :]
+            t_inv = np.linalg.inv(simplices[:, :-1, :] - origins[:, None, :])
+            self._facet_bary_data = origins, t_inv
+        return self._facet_bary_data
+
+    def _get_facets_and_bary_coords(self, comps, chunk_size=None):
+        """
+        Vectorized version of _get_facet for many compositions. The facet
+        of each composition is the first one (in the order of the phase
+        diagram facets) that contains it, as in _get_facet.
+
+        Args:
+            comps ([Composition]): Compositions.
+            chunk_size (int): Number of compositions tested against all facets
+                at once. Defaults to a value which keeps the intermediate
+                arrays at a few tens of MB.
+
+        Returns:
+            (facets, bary_coords) as arrays of shape (ncomps, dim). facets
+            contains the indices of the qhull_entries of the facet of each
+            composition, and bary_coords the corresponding barycentric
+            coordinates, i.e., the atomic fractions of the decomposition.
+        """
+        elements = self._pd.elements
+        for comp in comps:
+            if set(comp.elements).difference(elements):
+                raise ValueError('{} has elements not in the phase diagram {}'
+                                 ''.format(comp, elements))
+        ncomps = len(comps)
+        dim = len(elements)
+        facet_array = np.array(self._pd.facets, dtype=int).reshape((-1, dim))
+        if dim == 1:
+            return (np.repeat(facet_array, ncomps, axis=0),
+                    np.ones((ncomps, 1)))
+
+        c = self._make_comp_matrix(comps).reshape((ncomps, dim))[:, 1:]
+        origins, t_inv = self._get_facet_bary_data()
+        nfacets = len(facet_array)
+        if chunk_size is None:
+            chunk_size = max(1, 2000000 // (nfacets * dim))
+        tol = PDAnalyzer.numerical_tol / 10
+        facet_inds = np.zeros(ncomps, dtype=int)
+        bary_coords = np.zeros((ncomps, dim))
+        for start in range(0, ncomps, chunk_size):
+            chunk = c[start:start + chunk_size]
+            n = len(chunk)
+            # Barycentric coordinates of each composition in each facet.
+            b = np.einsum("nfk,fkj->nfj", chunk[:, None, :] - origins[None],
+                          t_inv)
+            inside = np.all(b >= -tol, axis=2) & \
+                (1 - np.sum(b, axis=2) >= -tol)
+            first = np.argmax(inside, axis=1)
+            rows = np.arange(n)
+            not_found = np.where(~inside[rows, first])[0]
+            if len(not_found) > 0:
+                raise RuntimeError("No facet found for comp = {}".format(
+                    comps[start + not_found[0]]))
+            facet_inds[start:start + n] = first
+            bary_coords[start:start + n, :-1] = b[rows, first]
+        bary_coords[:, -1] = 1 - np.sum(bary_coords[:, :-1], axis=1)
+        return facet_array[facet_inds], bary_coords
+
+    def get_decomposition_many(self, comps):
+        """
+        Provides the decompositions of many compositions at once. Much faster
+        than calling get_decomposition for each composition when there are
+        many compositions and/or facets.
+
+        Args:
+            comps ([Composition]): Compositions.
+
+        Returns:
+            (entry_indices, amounts) as arrays of shape (ncomps, dim), where
+            dim is the number of elements of the phase diagram. The
+            decomposition of comps[i] is given by the entries
+            pd.qhull_entries[entry_indices[i, j]] with amounts
+            amounts[i, j]. Unlike get_decomposition, entries with a zero
+            amount are not removed.
+        """
+        return self._get_facets_and_bary_coords(list(comps))
+
+    def get_e_above_hull_many(self, entries, allow_negative=False):
+        """
+        Provides the energies above convex hull of many entries at once. Much
+        faster than calling get_e_above_hull for each entry when there are
+        many entries and/or facets.
+
+        Args:
+            entries ([PDEntry]): PDEntry like objects.
+            allow_negative: Whether to allow negative e_above_hulls. Defaults
+                to False.
+
+        Returns:
+            Array of the energies above convex hull of the entries. Stable
+            entries have an energy above hull of 0.
+        """
+        entries = list(entries)
+        facets, amounts = self._get_facets_and_bary_coords(
+            [e.composition for e in entries])
+        qhull_energies = np.array([e.energy_per_atom
+                                   for e in self._pd.qhull_entries])
+        e_per_atom = np.array([e.energy_per_atom for e in entries])
+        ehull = e_per_atom - np.sum(amounts * qhull_energies[facets], axis=1)
+        stable_entries = self._pd.stable_entries
+        ehull[[i for i, e in enumerate(entries) if e in stable_entries]] = 0
+        if not allow_negative and np.any(ehull < -PDAnalyzer.numerical_tol):
+            raise ValueError("No valid decomp found!")
+        return ehull
+
     def get_hull_energy(self, comp):
         """
         Args:
@@ -111,16 +111,19 @@ class PhaseDiagram(MSONable):
         elements = list(elements)
         dim = len(elements)
 
-        get_reduced_comp = lambda e: e.composition.reduced_composition
+        # The reduced formula is the grouping key of the reduced composition,
+        # and is cached by the compositions.
+        get_reduced_formula = lambda e: e.composition.reduced_formula
 
-        entries = sorted(entries, key=get_reduced_comp)
+        entries = sorted(entries, key=get_reduced_formula)
 
         el_refs = {}
         min_entries = []
         all_entries = []
-        for c, g in itertools.groupby(entries, key=get_reduced_comp):
+        for f, g in itertools.groupby(entries, key=get_reduced_formula):
             g = list(g)
             min_entry = min(g, key=lambda e: e.energy_per_atom)
+            c = min_entry.composition
             if c.is_element:
                 el_refs[c.elements[0]] = min_entry
             min_entries.append(min_entry)
@@ -175,6 +178,131 @@ class PhaseDiagram(MSONable):
         self.elements = elements
         self.qhull_entries = qhull_entries
 
+    def add_entries(self, entries):
+        """
+        Adds entries to the phase diagram, updating the convex hull in place.
+        Instead of rebuilding the whole hull, only the facets lying above the
+        new entries are removed and the resulting hole is re-triangulated
+        with the new vertices, which gives the same facets as constructing a
+        new PhaseDiagram from all the entries. The hull is only rebuilt from
+        scratch if an elemental reference changes (since this changes all
+        formation energies) or for a 1D phase diagram.
+
+        Note that PDAnalyzers of the phase diagram have to be recreated after
+        an update.
+
+        Args:
+            entries ([PDEntry]): PDEntry-like objects to add. Their elements
+                must be in the phase diagram.
+
+        Returns:
+            (newly_stable, no_longer_stable) as two sets of entries.
+        """
+        entries = list(entries)
+        for entry in entries:
+            if set(entry.composition.elements).difference(self.elements):
+                raise PhaseDiagramError(
+                    "{} has elements not in the phase diagram {}".format(
+                        entry.composition, self.elements))
+        old_stable = self.stable_entries
+        self.all_entries.extend(entries)
+
+        rebuild = self.dim == 1
+        for entry in entries:
+            c = entry.composition
+            if c.is_element and entry.energy_per_atom < \
+                    self.el_refs[c.elements[0]].energy_per_atom:
+                rebuild = True
+        if rebuild:
+            PhaseDiagram.__init__(self, self.all_entries, self.elements)
+        else:
+            self._insert_hull_entries(entries)
+
+        new_stable = self.stable_entries
+        return new_stable - old_stable, old_stable - new_stable
+
+    def _insert_hull_entries(self, entries):
+        """
+        Inserts new entries in the convex hull one at a time with the
+        beneath-beyond method. For each entry below the hull, the facets it
+        can see are replaced by the simplices joining it to the horizon of
+        these facets, i.e. the ridges belonging to a single visible facet.
+        """
+        dim = self.dim
+        elements = self.elements
+        qhull_entries = self.qhull_entries
+        qhull_data = self.qhull_data
+        extra_point = qhull_data[-1]
+        qhull_data = list(qhull_data[:-1])
+        comp_index = {e.composition.reduced_composition: i
+                      for i, e in enumerate(qhull_entries)}
+        vec = np.array([self.el_refs[el].energy_per_atom for el in elements])
+
+        facets = [np.array(f) for f in self.facets]
+        planes = [self._get_facet_plane(qhull_data, f) for f in facets]
+
+        for entry in entries:
+            c = entry.composition
+            row = [c.get_atomic_fraction(el) for el in elements] + \
+                [entry.energy_per_atom]
+            form_e = row[-1] - np.dot(row[:-1], vec)
+            reduced = c.reduced_composition
+            ind = comp_index.get(reduced)
+            if ind is not None:
+                if entry.energy_per_atom >= \
+                        qhull_entries[ind].energy_per_atom:
+                    continue
+                # Replace the previous lowest energy entry. The facets
+                # containing it are all visible from the new entry.
+                qhull_entries[ind] = entry
+                qhull_data[ind] = np.array(row[1:])
+            elif form_e < -self.formation_energy_tol:
+                ind = len(qhull_entries)
+                comp_index[reduced] = ind
+                qhull_entries.append(entry)
+                qhull_data.append(np.array(row[1:]))
+            else:
+                continue
+
+            point = np.array(row[1:-1] + [1])
+            visible = [i for i, plane in enumerate(planes)
+                       if np.dot(point, plane) - entry.energy_per_atom >
+                       self.formation_energy_tol]
+            if not visible:
+                continue
+
+            ridges = collections.Counter()
+            for i in visible:
+                for j in range(dim):
+                    ridges[tuple(sorted(np.delete(facets[i], j)))] += 1
+            visible = set(visible)
+            facets = [f for i, f in enumerate(facets) if i not in visible]
+            planes = [p for i, p in enumerate(planes) if i not in visible]
+            for ridge, count in ridges.items():
+                if count != 1 or ind in ridge:
+                    continue
+                facet = np.array(ridge + (ind,))
+                m = np.array([qhull_data[i] for i in facet])
+                m[:, -1] = 1
+                if abs(np.linalg.det(m)) > 1e-14:
+                    facets.append(facet)
+                    planes.append(self._get_facet_plane(qhull_data, facet))
+
+        self.qhull_data = np.array(qhull_data + [extra_point])
+        self.facets = facets
+        self.simplices = [self.qhull_data[f, :-1] for f in facets]
+
+    @staticmethod
+    def _get_facet_plane(qhull_data, facet):
+        """
+        Coefficients p of the hyperplane of a facet, such that the energy on
+        the plane at compositional coordinates x is np.dot(x + [1], p).
+        """
+        m = np.array([qhull_data[i] for i in facet])
+        energies = m[:, -1].copy()
+        m[:, -1] = 1
+        return np.linalg.solve(m, energies)
+
     @property
     def all_entries_hulldata(self):
         data = []
@@ -300,6 +428,22 @@ class GrandPotentialPhaseDiagram(PhaseDiagram):
                 all_entries.append(GrandPotPDEntry(e, self.chempots))
         super(GrandPotentialPhaseDiagram, self).__init__(all_entries, elements)
 
+    def add_entries(self, entries):
+        """
+        Adds entries to the grand potential phase diagram, updating the
+        convex hull in place. See PhaseDiagram.add_entries.
+
+        Args:
+            entries ([PDEntry]): PDEntry-like objects to add.
+
+        Returns:
+            (newly_stable, no_longer_stable) as two sets of GrandPotPDEntry.
+        """
+        elements = set(self.elements)
+        return super(GrandPotentialPhaseDiagram, self).add_entries(
+            [GrandPotPDEntry(e, self.chempots) for e in entries
+             if set(e.composition.elements).intersection(elements)])
+
     def __str__(self):
         output = []
         chemsys = "-".join([el.symbol for el in self.elements])
@@ -361,6 +505,26 @@ class CompoundPhaseDiagram(PhaseDiagram):
         super(CompoundPhaseDiagram, self).__init__(
             pentries, elements=species_mapping.values())
 
+    def add_entries(self, entries):
+        """
+        Adds entries to the compound phase diagram, updating the convex hull
+        in place. See PhaseDiagram.add_entries.
+
+        Args:
+            entries ([PDEntry]): PDEntry-like objects to add. Entries which
+                do not fall within the space defined by the terminal
+                compositions are ignored.
+
+        Returns:
+            (newly_stable, no_longer_stable) as two sets of
+            TransformedPDEntry.
+        """
+        entries = list(entries)
+        self.original_entries = list(self.original_entries) + entries
+        pentries = self.transform_entries(entries,
+                                          self.terminal_compositions)[0]
+        return super(CompoundPhaseDiagram, self).add_entries(pentries)
+
     def transform_entries(self, entries, terminal_compositions):
         """
         Method to transform all entries to the composition coordinate in the
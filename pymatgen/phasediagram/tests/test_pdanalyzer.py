@@ -61,6 +61,34 @@ class PDAnalyzerTest(unittest.TestCase):
         for k, v in expected_ans.items():
             self.assertAlmostEqual(ansdict[k], v)
 
+    def test_get_decomposition_many(self):
+        comps = [e.composition for e in self.pd.all_entries]
+        comps.append(Composition("Li3Fe7O11"))
+        inds, amts = self.analyzer.get_decomposition_many(comps)
+        self.assertEqual(inds.shape, (len(comps), len(self.pd.elements)))
+        self.assertEqual(amts.shape, (len(comps), len(self.pd.elements)))
+        for comp, i, a in zip(comps, inds, amts):
+            decomp = self.analyzer.get_decomposition(comp)
+            d = {self.pd.qhull_entries[j]: amt for j, amt in zip(i, a)
+                 if abs(amt) > PDAnalyzer.numerical_tol}
+            self.assertEqual(set(d.keys()), set(decomp.keys()))
+            for k, v in decomp.items():
+                self.assertAlmostEqual(d[k], v)
+        self.assertRaises(ValueError, self.analyzer.get_decomposition_many,
+                          [Composition("LiFeCu")])
+
+    def test_get_e_above_hull_many(self):
+        entries = self.pd.all_entries
+        e_ah = self.analyzer.get_e_above_hull_many(entries)
+        self.assertEqual(len(e_ah), len(entries))
+        for entry, e in zip(entries, e_ah):
+            self.assertAlmostEqual(e, self.analyzer.get_e_above_hull(entry))
+        self.assertRaises(ValueError, self.analyzer.get_e_above_hull_many,
+                          [PDEntry("Li2O", -100)])
+        e_ah = self.analyzer.get_e_above_hull_many([PDEntry("Li2O", -100)],
+                                                   allow_negative=True)
+        self.assertLess(e_ah[0], 0)
+
     def test_get_transition_chempots(self):
         for el in self.pd.elements:
             self.assertLessEqual(len(self.analyzer.get_transition_chempots(el)),
@@ -108,6 +136,9 @@ class PDAnalyzerTest(unittest.TestCase):
         pda = PDAnalyzer(pd)
         decomp, e = pda.get_decomp_and_e_above_hull(PDEntry('H', 1))
         self.assertAlmostEqual(e, 1)
+        e_ah = pda.get_e_above_hull_many([PDEntry('H', 1), entry])
+        self.assertAlmostEqual(e_ah[0], 1)
+        self.assertAlmostEqual(e_ah[1], 0)
         self.assertAlmostEqual(decomp[entry], 1.0)
 
 
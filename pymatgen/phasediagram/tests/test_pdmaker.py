@@ -15,6 +15,16 @@ from pymatgen.phasediagram.pdanalyzer import PDAnalyzer
 from pymatgen.phasediagram.plotter import PDPlotter
 
 
+def get_facet_entries(pd):
+    """
+    Facets of a phase diagram as a set of frozensets of the original entries,
+    which does not depend on the order of the qhull_entries.
+    """
+    return set(frozenset(getattr(pd.qhull_entries[i], "original_entry",
+                                 pd.qhull_entries[i]) for i in f)
+               for f in pd.facets)
+
+
 class PhaseDiagramTest(unittest.TestCase):
 
     def setUp(self):
@@ -90,6 +100,42 @@ class PhaseDiagramTest(unittest.TestCase):
         self.assertEqual(len(pd.facets), 1)
 
 
+    def test_add_entries(self):
+        elements = [e for e in self.entries if e.composition.is_element]
+        others = [e for e in self.entries if not e.composition.is_element]
+        pd = PhaseDiagram(elements + others[::3], self.elements)
+        for entries in [others[1::3], others[2::3]]:
+            newly_stable, no_longer_stable = pd.add_entries(entries)
+            full_pd = PhaseDiagram(pd.all_entries, self.elements)
+            self.assertEqual(get_facet_entries(pd),
+                             get_facet_entries(full_pd))
+            self.assertEqual(set(pd.qhull_entries),
+                             set(full_pd.qhull_entries))
+            self.assertTrue(newly_stable.issubset(pd.stable_entries))
+            self.assertFalse(no_longer_stable.intersection(
+                pd.stable_entries))
+        self.assertEqual(
+            sorted((e.name, e.energy) for e in pd.stable_entries),
+            sorted((e.name, e.energy) for e in self.pd.stable_entries))
+
+        # A new stable entry, which destabilizes LiFeO2.
+        lifeo2 = [e for e in pd.stable_entries
+                  if e.composition.reduced_formula == "LiFeO2"][0]
+        entry = PDEntry(lifeo2.composition, lifeo2.energy - 1)
+        newly_stable, no_longer_stable = pd.add_entries([entry])
+        self.assertEqual(newly_stable, {entry})
+        self.assertIn(lifeo2, no_longer_stable)
+        self.assertEqual(get_facet_entries(pd), get_facet_entries(
+            PhaseDiagram(pd.all_entries, self.elements)))
+        # A new elemental reference leads to a full update.
+        entry = PDEntry("Li", self.pd.el_refs[Element("Li")].energy - 1)
+        newly_stable, no_longer_stable = pd.add_entries([entry])
+        self.assertIn(entry, newly_stable)
+        self.assertEqual(get_facet_entries(pd), get_facet_entries(
+            PhaseDiagram(pd.all_entries, self.elements)))
+        self.assertRaises(PhaseDiagramError, pd.add_entries,
+                          [PDEntry("LiCu", -10)])
+
     def test_str(self):
         self.assertIsNotNone(str(self.pd))
 
@@ -128,6 +174,12 @@ class GrandPotentialPhaseDiagramTest(unittest.TestCase):
                                    7, "Calculated formation for " +
                                    formula + " is not correct!")
 
+    def test_add_entries(self):
+        pd = GrandPotentialPhaseDiagram(self.entries[::2], {Element("O"): -5},
+                                        self.elements)
+        pd.add_entries(self.entries[1::2])
+        self.assertEqual(get_facet_entries(pd), get_facet_entries(self.pd))
+
     def test_str(self):
         self.assertIsNotNone(str(self.pd))
 
@@ -159,6 +211,12 @@ class CompoundPhaseDiagramTest(unittest.TestCase):
             self.assertAlmostEqual(energy, stable_formation_energies[formula],
                                    7)
 
+    def test_add_entries(self):
+        pd = CompoundPhaseDiagram(self.entries[::2], [Composition("Li2O"),
+                                                      Composition("Fe2O3")])
+        pd.add_entries(self.entries[1::2])
+        self.assertEqual(get_facet_entries(pd), get_facet_entries(self.pd))
+
     def test_str(self):
         self.assertIsNotNone(str(self.pd))
 
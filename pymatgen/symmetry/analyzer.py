@@ -24,7 +24,10 @@ __date__ = "Mar 9, 2012"
 
 import itertools
 import logging
-from collections import defaultdict, Counter
+import threading
+from collections import defaultdict, Counter, OrderedDict
+from multiprocessing import cpu_count
+from multiprocessing.pool import ThreadPool
 
 import math
 from math import cos
@@ -104,6 +107,17 @@ class SpacegroupAnalyzer(object):
         self._unique_species = unique_species
         self._numbers = np.array(zs, dtype='intc')
 
+        self._cache_key = None
+        if _symmetry_cache is not None:
+            self._cache_key = (self._transposed_latt.tostring(),
+                               self._positions.tostring(),
+                               self._numbers.tostring(),
+                               tuple(unique_species), symprec, angle_tolerance)
+            dataset = _symmetry_cache.get(self._cache_key, "dataset")
+            if dataset is not None:
+                self._spacegroup_data = dataset
+                return
+
         dataset = {}
         keys = ('number',
                 'hall_number',
@@ -147,6 +161,39 @@ class SpacegroupAnalyzer(object):
                                             dtype='double', order='C')
         dataset['pointgroup'] = dataset['pointgroup'].strip()
         self._spacegroup_data = dataset
+        if self._cache_key is not None:
+            _symmetry_cache.set(self._cache_key, "dataset", dataset)
+
+    @classmethod
+    def analyze_many(cls, structures, symprec=1e-3, angle_tolerance=5,
+                     nthreads=None):
+        """
+        Analyzes the symmetry of many structures concurrently. spglib releases
+        the GIL, so the analyzers are created in a pool of threads, without
+        the cost of pickling the structures for a pool of processes.
+
+        Args:
+            structures ([Structure]): Structures to analyze.
+            symprec (float): Tolerance for symmetry finding.
+            angle_tolerance (float): Angle tolerance for symmetry finding.
+            nthreads (int): Number of threads. Defaults to the number of
+                cpus.
+
+        Returns:
+            List of SpacegroupAnalyzer in the same order as structures. The
+            datasets are obtained with get_symmetry_dataset.
+        """
+        structures = list(structures)
+        nthreads = min(nthreads or cpu_count(), len(structures))
+        if nthreads <= 1:
+            return [cls(s, symprec, angle_tolerance) for s in structures]
+        pool = ThreadPool(nthreads)
+        try:
+            return pool.map(lambda s: cls(s, symprec, angle_tolerance),
+                            structures)
+        finally:
+            pool.close()
+            pool.join()
 
     def get_spacegroup(self):
         """
@@ -273,6 +320,10 @@ class SpacegroupAnalyzer(object):
             "translations" gives the numpy float64 array of the translation
             vectors in scaled positions.
         """
+        if self._cache_key is not None and _symmetry_cache is not None:
+            symmetry = _symmetry_cache.get(self._cache_key, "symmetry")
+            if symmetry is not None:
+                return symmetry
 
         # Get number of symmetry operations and allocate symmetry operations
         # multi = spg.multiplicity(cell, positions, numbers, symprec)
@@ -284,7 +335,10 @@ class SpacegroupAnalyzer(object):
                                self._transposed_latt.copy(),
                                self._positions, self._numbers, self._symprec,
                                self._angle_tol)
-        return rotation[:num_sym], translation[:num_sym]
+        symmetry = rotation[:num_sym], translation[:num_sym]
+        if self._cache_key is not None and _symmetry_cache is not None:
+            _symmetry_cache.set(self._cache_key, "symmetry", symmetry)
+        return symmetry
 
     def get_symmetry_operations(self, cartesian=False):
         """
@@ -401,7 +455,8 @@ class SpacegroupAnalyzer(object):
             return self._structure.get_reduced_structure()
 
     def get_ir_reciprocal_mesh(self, mesh=(10, 10, 10), shift=(0, 0, 0),
-                               is_time_reversal=True):
+                               is_time_reversal=True, return_arrays=False,
+                               mapping_file=None, chunk_size=1000000):
         """
         k-point mesh of the Brillouin zone generated taken into account
         symmetry.The method returns the irreducible kpoints of the mesh
@@ -414,25 +469,58 @@ class SpacegroupAnalyzer(object):
                 Monkhorst-Pack is [0.5,0.5,0.5]
             is_time_reversal (bool): Set to True to impose time reversal
                 symmetry.
+            return_arrays (bool): Whether to return numpy arrays instead of
+                a list of tuples. Much faster for dense meshes.
+            mapping_file (str): If not None, the grid addresses and the
+                mapping of the full mesh are written to this file through
+                memory-mapped arrays instead of being allocated in memory,
+                and the weights are computed chunk by chunk. For meshes that
+                do not fit in memory. Implies return_arrays.
+            chunk_size (int): Number of mesh points processed at once with
+                mapping_file.
 
         Returns:
             A list of irreducible kpoints and their weights as a list of
             tuples [(ir_kpoint, weight)], with ir_kpoint given
-            in fractional coordinates
-        """
-        mapping = np.zeros(np.prod(mesh), dtype='intc')
-        mesh_points = np.zeros((np.prod(mesh), 3), dtype='intc')
+            in fractional coordinates. With return_arrays, a tuple
+            (ir_kpoints, weights, mapping) of numpy arrays, where mapping
+            gives the index in the full mesh of the irreducible kpoint
+            equivalent to each mesh point (a np.memmap with mapping_file).
+        """
+        nkpts = int(np.prod(mesh))
+        if mapping_file is None:
+            mapping = np.zeros(nkpts, dtype='intc')
+            mesh_points = np.zeros((nkpts, 3), dtype='intc')
+        else:
+            buf = np.memmap(mapping_file, dtype='intc', mode='w+',
+                            shape=(4 * nkpts,))
+            mesh_points = buf[:3 * nkpts].reshape((nkpts, 3))
+            mapping = buf[3 * nkpts:]
         spg.ir_reciprocal_mesh(
             mesh_points, mapping, np.array(mesh, dtype='intc'),
             np.array(shift, dtype='intc'), is_time_reversal * 1,
             self._transposed_latt, self._positions, self._numbers,
             self._symprec)
 
-        results = []
-        tmp_map = list(mapping)
-        for i in np.unique(mapping):
-            results.append((mesh_points[i] / mesh, tmp_map.count(i)))
-        return results
+        if mapping_file is None:
+            ir_indices, weights = np.unique(mapping, return_counts=True)
+        else:
+            # The irreducible points are mapped to themselves.
+            ir_indices = np.concatenate([
+                np.flatnonzero(mapping[i:i + chunk_size] ==
+                               np.arange(i, min(i + chunk_size, nkpts))) + i
+                for i in range(0, nkpts, chunk_size)])
+            weights = np.zeros(len(ir_indices), dtype=np.int64)
+            for i in range(0, nkpts, chunk_size):
+                inds, counts = np.unique(mapping[i:i + chunk_size],
+                                         return_counts=True)
+                weights[np.searchsorted(ir_indices, inds)] += counts
+            buf.flush()
+        ir_kpoints = mesh_points[ir_indices] / np.array(mesh, dtype=float)
+
+        if return_arrays or mapping_file is not None:
+            return ir_kpoints, weights, mapping
+        return list(zip(ir_kpoints, weights.tolist()))
 
     def get_primitive_standard_structure(self, international_monoclinic=True):
         """
@@ -780,6 +868,106 @@ class SpacegroupAnalyzer(object):
         return new_struct.get_sorted_structure()
 
 
+class SymmetryCache(object):
+    """
+    Size-bounded cache of the symmetry datasets and symmetry operations found
+    by spglib, shared by all the SpacegroupAnalyzer instances once it is
+    installed with set_symmetry_cache. Entries are keyed on the content of
+    the structure (lattice, fractional coordinates and species) and on the
+    tolerances, so that analyzers built again for the same structure (e.g.,
+    by the structure filters or the CifWriter) do not call spglib again. The
+    least recently used entries are evicted when maxsize is reached.
+
+    .. note::
+        The cached datasets are shared by the analyzers and should not be
+        modified.
+
+    Args:
+        maxsize (int): Maximum number of structures in the cache.
+    """
+
+    def __init__(self, maxsize=1000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        # SpacegroupAnalyzer.analyze_many uses threads.
+        self._lock = threading.Lock()
+
+    def get(self, key, name):
+        """
+        Returns the cached value (e.g., "dataset" or "symmetry") for key, or
+        None if it is not in the cache.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or name not in entry:
+                self.misses += 1
+                return None
+            self.hits += 1
+            # Move the entry to the end (most recently used).
+            del self._entries[key]
+            self._entries[key] = entry
+            return entry[name]
+
+    def set(self, key, name, value):
+        """
+        Stores value for key.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, {})
+            entry[name] = value
+            self._entries[key] = entry
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Removes all the entries and resets the statistics.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def stats(self):
+        """
+        Dict with the number of hits and misses and the size of the cache.
+        """
+        return {"hits": self.hits, "misses": self.misses,
+                "size": len(self), "maxsize": self.maxsize}
+
+
+_symmetry_cache = None
+
+
+def get_symmetry_cache():
+    """
+    Returns the SymmetryCache used by SpacegroupAnalyzer, or None if the
+    datasets are not cached (the default).
+    """
+    return _symmetry_cache
+
+
+def set_symmetry_cache(cache):
+    """
+    Installs the SymmetryCache shared by all the SpacegroupAnalyzer
+    instances created afterwards, e.g.,
+    set_symmetry_cache(SymmetryCache(maxsize=10000)). Use None to disable
+    the cache.
+
+    Returns:
+        The previous cache.
+    """
+    global _symmetry_cache
+    old, _symmetry_cache = _symmetry_cache, cache
+    return old
+
+
 def get_point_group(rotations):
     """
     Get point group from a set of rotations.
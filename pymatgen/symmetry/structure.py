@@ -18,6 +18,7 @@ __date__ = "Mar 9, 2012"
 
 import numpy as np
 from pymatgen.core.structure import Structure
+from pymatgen.core.operations import SymmOp
 
 
 class SymmetrizedStructure(Structure):
@@ -35,6 +36,10 @@ class SymmetrizedStructure(Structure):
     .. attribute: equivalent_indices
 
         indices of structure grouped by equivalency
+
+    .. attribute: site_orbits
+
+        index in equivalent_indices of the group of each site
     """
 
     def __init__(self, structure, spacegroup, equivalent_positions):
@@ -44,11 +49,13 @@ class SymmetrizedStructure(Structure):
         self._spacegroup = spacegroup
         u, inv = np.unique(equivalent_positions, return_inverse=True)
         self.site_labels = equivalent_positions
+        self.site_orbits = inv
         self.equivalent_indices = [[] for i in range(len(u))]
         self._equivalent_sites = [[] for i in range(len(u))]
         for i, inv in enumerate(inv):
             self.equivalent_indices[inv].append(i)
             self._equivalent_sites[inv].append(self.sites[i])
+        self._site_operations = None
 
     @property
     def spacegroup(self):
@@ -77,3 +84,87 @@ class SymmetrizedStructure(Structure):
                 return sites
 
         raise ValueError("Site not in structure")
+
+    @property
+    def site_operations(self):
+        """
+        Fractional symmetry operations of the spacegroup, one per site, that
+        map the first site of the group of equivalent sites of each site
+        (i.e., structure[equivalent_indices[site_orbits[i]][0]]) onto the
+        site itself, lattice translation included.
+        """
+        if self._site_operations is None:
+            rotations = np.array([op.rotation_matrix
+                                  for op in self._spacegroup])
+            translations = np.array([op.translation_vector
+                                     for op in self._spacegroup])
+            ops = [None] * len(self)
+            for indices in self.equivalent_indices:
+                # Images of the representative site under all the operations
+                images = np.dot(rotations, self[indices[0]].frac_coords) \
+                    + translations
+                for i in indices:
+                    d = images - self[i].frac_coords
+                    shifts = np.round(d)
+                    dist = np.sum(self.lattice.get_cartesian_coords(
+                        d - shifts) ** 2, axis=1)
+                    k = np.argmin(dist)
+                    ops[i] = SymmOp.from_rotation_and_translation(
+                        rotations[k], translations[k] - shifts[k])
+            self._site_operations = ops
+        return self._site_operations
+
+    def get_site_operation(self, i, cartesian=False):
+        """
+        Returns the symmetry operation that maps the first site of the group
+        of equivalent sites of site i onto site i.
+
+        Args:
+            i (int): Site index.
+            cartesian (bool): Whether to return a cartesian or a fractional
+                operation.
+
+        Returns:
+            (SymmOp)
+        """
+        op = self.site_operations[i]
+        if not cartesian:
+            return op
+        mat = self.lattice.matrix
+        rot = np.dot(mat.T, np.dot(op.rotation_matrix, np.linalg.inv(mat.T)))
+        trans = np.dot(op.translation_vector, mat)
+        return SymmOp.from_rotation_and_translation(rot, trans)
+
+    def map_equivalent_sites(self, func, transform=None):
+        """
+        Evaluates a per-site quantity only for the first site of each group
+        of equivalent sites, and copies the result to the other sites of the
+        group. This is valid for quantities that are invariant under the
+        symmetry operations, such as coordination numbers. Quantities that
+        depend on the orientation of the site, such as neighbor positions or
+        vectors, need a transform.
+
+        Args:
+            func: Function taking a site index and returning the quantity
+                for that site.
+            transform: Function taking the quantity of the first site of a
+                group and the cartesian SymmOp that maps this site onto
+                another site of the group (see get_site_operation), and
+                returning the quantity for the other site. Defaults to None,
+                in which case the same object is returned for all the sites
+                of a group.
+
+        Returns:
+            List of the quantities of all the sites.
+        """
+        values = [None] * len(self)
+        for indices in self.equivalent_indices:
+            value = func(indices[0])
+            values[indices[0]] = value
+            for i in indices[1:]:
+                if transform is None:
+                    values[i] = value
+                else:
+                    values[i] = transform(
+                        value, self.get_site_operation(i, cartesian=True))
+        return values
@@ -18,13 +18,15 @@ __date__ = "Mar 9, 2012"
 
 import unittest2 as unittest
 import os
+import shutil
+import tempfile
 
 import numpy as np
 
 from pymatgen.core.sites import PeriodicSite
 from pymatgen.io.vasp.inputs import Poscar
 from pymatgen.symmetry.analyzer import SpacegroupAnalyzer, \
-    PointGroupAnalyzer, cluster_sites
+    PointGroupAnalyzer, cluster_sites, SymmetryCache, set_symmetry_cache
 from pymatgen.io.cif import CifParser
 from pymatgen.util.testing import PymatgenTest
 from pymatgen.core.structure import Molecule, Structure
@@ -78,6 +80,41 @@ class SpacegroupAnalyzerTest(PymatgenTest):
         ds = self.sg.get_symmetry_dataset()
         self.assertEqual(ds['international'], 'Pnma')
 
+    def test_analyze_many(self):
+        structures = [self.structure, self.disordered_structure,
+                      self.get_structure("Si"), self.get_structure("CsCl")]
+        for nthreads in [1, 3]:
+            analyzers = SpacegroupAnalyzer.analyze_many(structures,
+                                                        symprec=0.001,
+                                                        nthreads=nthreads)
+            self.assertEqual([a.get_spacegroup_symbol() for a in analyzers],
+                             [SpacegroupAnalyzer(s, 0.001)
+                              .get_spacegroup_symbol() for s in structures])
+
+    def test_symmetry_cache(self):
+        cache = SymmetryCache(maxsize=2)
+        old = set_symmetry_cache(cache)
+        try:
+            a1 = SpacegroupAnalyzer(self.structure, 0.001)
+            a2 = SpacegroupAnalyzer(self.structure.copy(), 0.001)
+            self.assertIs(a1.get_symmetry_dataset(), a2.get_symmetry_dataset())
+            self.assertEqual(a2.get_spacegroup_symbol(),
+                             self.sg.get_spacegroup_symbol())
+            self.assertEqual(len(a1.get_symmetry_operations()),
+                             len(a2.get_symmetry_operations()))
+            self.assertEqual(cache.stats, {"hits": 2, "misses": 2, "size": 1,
+                                           "maxsize": 2})
+            # Different tolerance or structure.
+            SpacegroupAnalyzer(self.structure, 0.1)
+            SpacegroupAnalyzer(self.disordered_structure, 0.001)
+            self.assertEqual(len(cache), 2)
+            self.assertEqual(cache.misses, 4)
+            # The least recently used entry was evicted.
+            SpacegroupAnalyzer(self.structure, 0.001)
+            self.assertEqual(cache.misses, 5)
+        finally:
+            set_symmetry_cache(old)
+
     def test_get_crystal_system(self):
         crystal_system = self.sg.get_crystal_system()
         self.assertEqual('orthorhombic', crystal_system)
@@ -129,6 +166,29 @@ class SpacegroupAnalyzerTest(PymatgenTest):
         self.assertEqual(s1, s2)
         self.assertEqual(self.sg4.get_symmetrized_structure()[0].magmom, 0.1)
 
+    def test_site_operations(self):
+        symm_struct = self.disordered_sg.get_symmetrized_structure()
+        for i, site in enumerate(symm_struct):
+            indices = symm_struct.equivalent_indices[symm_struct.site_orbits[i]]
+            self.assertIn(i, indices)
+            rep = symm_struct[indices[0]]
+            op = symm_struct.site_operations[i]
+            self.assertArrayAlmostEqual(op.operate(rep.frac_coords),
+                                        site.frac_coords, 3)
+            op = symm_struct.get_site_operation(i, cartesian=True)
+            self.assertArrayAlmostEqual(op.operate(rep.coords), site.coords, 2)
+
+        calls = []
+
+        def func(i):
+            calls.append(i)
+            return symm_struct[i].coords
+
+        coords = symm_struct.map_equivalent_sites(
+            func, lambda c, op: op.operate(c))
+        self.assertEqual(len(calls), len(symm_struct.equivalent_indices))
+        self.assertArrayAlmostEqual(coords, symm_struct.cart_coords, 2)
+
     def test_find_primitive(self):
         """
         F m -3 m Li2O testing of converting to primitive cell
@@ -153,6 +213,24 @@ class SpacegroupAnalyzerTest(PymatgenTest):
         self.assertAlmostEquals(grid[1][0][2], 0.0)
         self.assertEqual(grid[1][1], 2)
 
+        kpts, weights, mapping = self.sg.get_ir_reciprocal_mesh(
+            return_arrays=True)
+        self.assertArrayAlmostEqual(kpts, [g[0] for g in grid])
+        self.assertArrayEqual(weights, [g[1] for g in grid])
+        self.assertEqual(weights.sum(), 1000)
+        self.assertEqual(mapping.shape, (1000,))
+
+        tmpdir = tempfile.mkdtemp()
+        try:
+            kpts2, weights2, mapping2 = self.sg.get_ir_reciprocal_mesh(
+                mapping_file=os.path.join(tmpdir, "mapping"), chunk_size=300)
+            self.assertArrayAlmostEqual(kpts2, kpts)
+            self.assertArrayEqual(weights2, weights)
+            self.assertArrayEqual(mapping2, mapping)
+            del mapping2
+        finally:
+            shutil.rmtree(tmpdir)
+
     def test_get_conventional_standard_structure(self):
         parser = CifParser(os.path.join(test_dir, 'bcc_1927.cif'))
         structure = parser.get_structures(False)[0]
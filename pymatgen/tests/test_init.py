@@ -0,0 +1,57 @@
+# coding: utf-8
+# Copyright (c) Pymatgen Development Team.
+# Distributed under the terms of the MIT License.
+
+from __future__ import division, unicode_literals
+
+import os
+import subprocess
+import sys
+import unittest2 as unittest
+
+import pymatgen
+
+root_dir = os.path.join(os.path.dirname(__file__), "..", "..")
+
+# Prints whether the lazy aliases and the element data have been loaded by
+# "import pymatgen" (and by accessing them if eager is True).
+import_script = """
+import sys
+import pymatgen
+if {eager}:
+    for name in pymatgen._lazy_aliases:
+        getattr(pymatgen, name)
+    [el.Z for el in pymatgen.Element]
+print("pymatgen.matproj.rest" in sys.modules)
+print("pymatgen.io.smart" in sys.modules)
+print("_data" in pymatgen.Element.Fe.__dict__)
+"""
+
+
+def run_import(eager):
+    out = subprocess.check_output(
+        [sys.executable, "-c", import_script.format(eager=eager)],
+        cwd=root_dir)
+    return [t == "True" for t in out.decode("utf-8").split()]
+
+
+class PymatgenInitTest(unittest.TestCase):
+
+    def test_lazy_aliases(self):
+        from pymatgen import MPRester, Spin, read_structure, pmg_load
+        from pymatgen.matproj.rest import MPRester as MPRester2
+        self.assertIs(MPRester, MPRester2)
+        self.assertIs(pymatgen.Spin, Spin)
+        self.assertIn("MPRester", dir(pymatgen))
+        self.assertIn("MPRester", pymatgen.__all__)
+        self.assertRaises(AttributeError, getattr, pymatgen, "NotThere")
+
+    def test_lazy_import(self):
+        # Nothing heavy is imported or parsed by a plain "import pymatgen".
+        # See dev_scripts/profile_import.py for the timings.
+        self.assertEqual(run_import(eager=False), [False, False, False])
+        self.assertEqual(run_import(eager=True), [True, True, True])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -444,6 +444,10 @@ class PartialRemoveSpecieTransformation(AbstractTransformation):
     def is_one_to_many(self):
         return True
 
+    @property
+    def use_multiprocessing(self):
+        return True
+
     def __str__(self):
         spec_str = ["Species = {}".format(self._specie),
                     "Fraction to remove = {}".format(self._frac),
@@ -645,6 +649,10 @@ class OrderDisorderedStructureTransformation(AbstractTransformation):
     def is_one_to_many(self):
         return True
 
+    @property
+    def use_multiprocessing(self):
+        return True
+
     def as_dict(self):
         return {"name": self.__class__.__name__, "version": __version__,
                 "init_args": {"algo": self._algo},
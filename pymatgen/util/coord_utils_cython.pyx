@@ -216,6 +216,67 @@ def is_coord_subset_pbc(subset, superset, atol, mask):
             break
     return bool(ok)
 
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.initializedcheck(False)
+def find_subset_translations(subset, superset, translations, atol, mask):
+    """
+    Batched version of is_coord_subset_pbc. Tests, for each translation t,
+    if all fractional coords in subset + t are contained in superset. The
+    loops run without the GIL and each translation is rejected at the first
+    site of subset that has no match, so the sites with the fewest allowed
+    matches should come first.
+
+    Args:
+        subset, superset: List of fractional coords
+        translations: List of fractional translation vectors
+        atol: Fractional tolerance in each direction
+        mask: mask[i, j] = True indicates that subset[i] cannot be matched
+            to superset[j]
+
+    Returns:
+        Array with the indices of the translations for which subset + t is
+        contained in superset, in increasing order.
+    """
+
+    cdef np.float_t[:, ::1] fc1 = np.array(subset, dtype=np.float_, copy=False, order='C')
+    cdef np.float_t[:, ::1] fc2 = np.array(superset, dtype=np.float_, copy=False, order='C')
+    cdef np.float_t[:, ::1] ts = np.array(translations, dtype=np.float_, copy=False, order='C')
+    cdef np.float_t[:] t = np.array(atol, dtype=np.float_, copy=False)
+    cdef np.int_t[:, ::1] m = np.array(mask, dtype=np.int_, copy=False, order='C')
+
+    found = np.zeros(ts.shape[0], dtype=np.int_)
+    cdef np.int_t[:] f = found
+
+    cdef int i, j, k, n, I, J, N
+    cdef np.float_t d
+    cdef bint ok
+
+    I = fc1.shape[0]
+    J = fc2.shape[0]
+    N = ts.shape[0]
+
+    with nogil:
+        for n in range(N):
+            ok = True
+            for i in range(I):
+                ok = False
+                for j in range(J):
+                    if m[i, j]:
+                        continue
+                    ok = True
+                    for k in range(3):
+                        d = fc1[i, k] + ts[n, k] - fc2[j, k]
+                        if fabs(d - round(d)) > t[k]:
+                            ok = False
+                            break
+                    if ok:
+                        break
+                if not ok:
+                    break
+            f[n] = ok
+    return np.flatnonzero(found)
+
 @cython.boundscheck(False)
 @cython.wraparound(False)
 @cython.initializedcheck(False)
@@ -163,6 +163,25 @@ class CoordUtilsTest(PymatgenTest):
         self.assertFalse(is_coord_subset_pbc([c1], [c2, c1], mask=mask3))
         self.assertTrue(is_coord_subset_pbc([c1], [c1, c2], mask=mask3))
 
+    def test_find_subset_translations(self):
+        from pymatgen.util.coord_utils_cython import find_subset_translations
+        np.random.seed(0)
+        superset = np.random.rand(10, 3)
+        subset = superset[[2, 5, 7]] + [0.1, 0.2, -1.3]
+        translations = superset[[0, 1, 2, 3]] - subset[0]
+        translations[1] = [-0.1, -0.2, 0.3]
+        atol = [1e-5] * 3
+        mask = np.zeros((3, 10), dtype=np.bool)
+        for m in [mask, mask + np.eye(3, 10, 5, dtype=np.bool)]:
+            inds = find_subset_translations(subset, superset, translations,
+                                            atol, m)
+            expected = [i for i, t in enumerate(translations)
+                        if is_coord_subset_pbc(subset + t, superset, atol, m)]
+            self.assertArrayEqual(inds, expected)
+        self.assertArrayEqual(inds, [])
+        self.assertArrayEqual(find_subset_translations(
+            subset, superset, translations, atol, mask), [1, 2])
+
 
     def test_lattice_points_in_supercell(self):
         supercell = np.array([[1, 3, 5], [-3, 2, 3], [-5, 3, 1]])